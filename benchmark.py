@@ -0,0 +1,46 @@
+import argparse
+import numpy as np
+from core.band_backends import ProcessBackend, ThreadBackend, compare_backends
+
+"""
+This file compares the serial, threaded and multiprocess ways of running the editor's filters.
+
+A random image of the given size goes through a few typical edits on each path, and the best
+time of each is printed.
+
+Example:
+    python benchmark.py --width 8000 --height 6000 --workers 8
+
+"""
+
+CASES = {
+    "brightness": [("brightness", (30,))],
+    "contrast + brightness": [("contrast", (1.2,)), ("brightness", (20,))],
+    "blur 15": [("blur", (15, "gaussian"))],
+    "blur 80 (box)": [("blur", (80, "box"))],
+    "grayscale + edge": [("grayscale", ()), ("edge", ())],
+}
+
+
+if __name__ == "__main__":
+
+    """
+    This function reads the command line, runs every case and prints a table of times.
+
+    """
+
+    parser = argparse.ArgumentParser(description="Benchmark the filter backends.")
+    parser.add_argument("--width", type=int, default=6000)
+    parser.add_argument("--height", type=int, default=4000)
+    parser.add_argument("--workers", type=int, default=None, help="threads and processes, one per CPU by default")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    image = np.random.default_rng(0).integers(0, 256, (args.height, args.width, 3), np.uint8)
+    with ThreadBackend(args.workers) as threads, ProcessBackend(args.workers) as processes:
+        print(f"{args.width}x{args.height}, {threads.workers} workers, best of {args.repeat} (ms)")
+        print(f"{'case':<24}{'serial':>10}{'threads':>10}{'processes':>11}")
+        for name, steps in CASES.items():
+            times = compare_backends(image, steps, {"threads": threads, "processes": processes}, args.repeat)
+            print(f"{name:<24}" + "".join(f"{times[label] * 1000:>10.1f}" for label in ("serial", "threads"))
+                  + f"{times['processes'] * 1000:>11.1f}")
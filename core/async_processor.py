@@ -0,0 +1,323 @@
+import asyncio
+import os
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import partial
+from core.batch_processor import _first_duplicate
+from core.image_processor import ImageProcessor
+from utils.models import EncoderOptions, FileResult
+
+
+def _read_file(path: str) -> bytes:
+    """
+    This function reads a whole file.
+
+    Parameters:
+        path (str): File to read.
+
+    Returns:
+        bytes: Its contents.
+
+    Raises:
+        ValueError: If the file can't be read.
+    """
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except OSError as e:
+        raise ValueError(f"Failed to read {path}: {e.strerror}.") from None
+
+
+def _write_file(path: str, data: bytes):
+    """
+    This function writes a file through a temporary name, so a cancelled or failed write leaves no partial file.
+
+    Parameters:
+        path (str): File to write.
+        data (bytes): Its contents.
+
+    Raises:
+        ValueError: If the file can't be written.
+    """
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except OSError as e:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise ValueError(f"Failed to save {path}: {e.strerror}.") from None
+
+
+class AsyncRunner:
+    """
+    This class offloads image work from an asyncio event loop to executors.
+
+    Decoding, filters and encoding run on the compute executor, and file
+    reads and writes on a separate I/O executor, so one file's I/O overlaps
+    with another's compute. A semaphore bounds how many images are being
+    worked on at once, which bounds memory as well.
+    """
+
+    def __init__(self, workers: int | None = None, io_workers: int | None = None, limit: int | None = None,
+                 compute: Executor | None = None, io: Executor | None = None):
+        """
+        This function creates the executors, unless they are given.
+
+        Parameters:
+            workers (int | None): Compute threads, one per CPU by default.
+            io_workers (int | None): File I/O threads, four per compute thread by default.
+            limit (int | None): Images worked on at once, twice the compute threads by default.
+            compute (Executor | None): Executor for decoding, filters and encoding.
+                Threads suit OpenCV, which releases the GIL.
+            io (Executor | None): Executor for file reads and writes.
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.limit = limit or self.workers * 2
+        self._owns = (compute is None, io is None)
+        self._compute = compute or ThreadPoolExecutor(self.workers, thread_name_prefix="image-compute")
+        self._io = io or ThreadPoolExecutor(io_workers or self.workers * 4, thread_name_prefix="image-io")
+        self.semaphore = asyncio.Semaphore(self.limit)
+
+    def __repr__(self) -> str:
+        """
+        This function return a readable summary of the runner.
+
+        Returns:
+            str: A string showing the compute threads and the concurrency limit.
+        """
+        return f"AsyncRunner(workers={self.workers}, limit={self.limit})"
+
+    async def __aenter__(self) -> "AsyncRunner":
+        """
+        This function gives the runner to an async with block, which closes it at the end.
+
+        Returns:
+            AsyncRunner: This runner.
+        """
+        return self
+
+    async def __aexit__(self, *exc):
+        """
+        This function closes the runner at the end of an async with block.
+        """
+        self.close()
+
+    async def compute(self, func, *args, **kwargs):
+        """
+        This function runs CPU work on the compute executor.
+
+        Cancelling the caller cancels work that has not started; work that
+        already started runs to the end and its result is dropped.
+
+        Parameters:
+            func (callable): Function to run.
+            *args, **kwargs: Its arguments.
+
+        Returns:
+            object: What func returns.
+        """
+        return await asyncio.get_running_loop().run_in_executor(self._compute, partial(func, *args, **kwargs))
+
+    async def io(self, func, *args, **kwargs):
+        """
+        This function runs blocking file work on the I/O executor.
+
+        Parameters:
+            func (callable): Function to run.
+            *args, **kwargs: Its arguments.
+
+        Returns:
+            object: What func returns.
+        """
+        return await asyncio.get_running_loop().run_in_executor(self._io, partial(func, *args, **kwargs))
+
+    async def open(self, path: str) -> "AsyncImageProcessor":
+        """
+        This function loads an image without blocking the event loop.
+
+        Parameters:
+            path (str): Image file.
+
+        Returns:
+            AsyncImageProcessor: The loaded image.
+
+        Raises:
+            ValueError: If the file can't be read or decoded.
+        """
+        image = AsyncImageProcessor(self)
+        await image.load(path)
+        return image
+
+    async def process_file(self, source: str, steps: list[tuple], target: str,
+                           options: EncoderOptions | None = None) -> FileResult:
+        """
+        This function loads a file, applies edits and saves the result, holding one slot of the limit.
+
+        Parameters:
+            source (str): Image file to read.
+            steps (list[tuple]): (name, args) pairs.
+            target (str): File to write; its extension picks the format.
+            options (EncoderOptions | None): Encoder settings, defaults if None.
+
+        Returns:
+            FileResult: The target, or the error that stopped this file.
+        """
+        async with self.semaphore:
+            try:
+                image = await self.open(source)
+                await image.apply_filters(steps)
+                await image.save(target, options)
+            except Exception as e:
+                # One bad file is reported without stopping the rest of the batch
+                return FileResult(source, error=e)
+        return FileResult(source, target)
+
+    async def process_files(self, paths: list[str], steps: list[tuple], folder: str, ext: str = ".png",
+                            options: EncoderOptions | None = None):
+        """
+        This function edits many files concurrently and yields each result as it finishes.
+
+        At most limit files are in memory at once, however many paths are
+        given. A file that fails is reported and the others go on. Closing
+        the iterator early (e.g. through contextlib.aclosing), or cancelling
+        the task iterating it, cancels the files still pending.
+
+        Parameters:
+            paths (list[str]): Image files.
+            steps (list[tuple]): (name, args) pairs applied to every file.
+            folder (str): Output folder; files keep their base names.
+            ext (str): Output format, e.g. ".png".
+            options (EncoderOptions | None): Encoder settings, defaults if None.
+
+        Yields:
+            FileResult: One per path, in the order they finish.
+
+        Raises:
+            ValueError: If an edit is unknown or invalid, or two paths have
+                        the same base name, before any file is read.
+        """
+        for name, args in steps:
+            spec = ImageProcessor.filters.get(name)
+            spec.check(*spec.complete(args))
+        targets = [os.path.join(folder, os.path.splitext(os.path.basename(path))[0] + ext) for path in paths]
+        duplicate = _first_duplicate(targets)
+        if duplicate is not None:
+            raise ValueError(f"Several images would be saved as {duplicate}.")
+        os.makedirs(folder, exist_ok=True)
+        tasks = [asyncio.ensure_future(self.process_file(path, steps, target, options))
+                 for path, target in zip(paths, targets)]
+        try:
+            for task in asyncio.as_completed(tasks):
+                yield await task
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def close(self):
+        """
+        This function shuts down the executors this runner created.
+        """
+        if self._owns[0]:
+            self._compute.shutdown(wait=False, cancel_futures=True)
+        if self._owns[1]:
+            self._io.shutdown(wait=False, cancel_futures=True)
+
+
+class AsyncImageProcessor:
+    """
+    This class lets an ImageProcessor be used from asyncio code without blocking the event loop.
+
+    Every call is awaited. Edits run on a snapshot of the image and only
+    replace it when they finish, so a cancelled edit leaves the image as it
+    was. Calls on the same image run one at a time, in the order they were made.
+    """
+
+    def __init__(self, runner: AsyncRunner, processor: ImageProcessor | None = None):
+        """
+        This function wraps a processor.
+
+        Parameters:
+            runner (AsyncRunner): Executors to run the work on.
+            processor (ImageProcessor | None): Processor to wrap, a new empty one if None.
+        """
+        self.runner = runner
+        self._processor = processor or ImageProcessor()
+        self._lock = asyncio.Lock()
+
+    def __repr__(self) -> str:
+        """
+        This function return a readable summary of the image.
+
+        Returns:
+            str: A string showing the wrapped processor.
+        """
+        return f"AsyncImageProcessor({self._processor!r})"
+
+    @property
+    def processor(self) -> ImageProcessor:
+        """
+        This function gets the wrapped processor, e.g. to read its image after the edits.
+        """
+        return self._processor
+
+    async def load(self, path: str):
+        """
+        This function reads a file on the I/O executor and decodes it on the compute executor.
+
+        Parameters:
+            path (str): Image file.
+
+        Raises:
+            ValueError: If the file can't be read or decoded.
+        """
+        async with self._lock:
+            data = await self.runner.io(_read_file, path)
+            processor = ImageProcessor(self._processor.store)
+            await self.runner.compute(processor.decode, data, path)
+            self._processor = processor
+
+    async def apply_filter(self, name: str, *args):
+        """
+        This function runs a registered filter.
+
+        Parameters:
+            name (str): Filter name, e.g. "blur".
+            *args: Arguments for the filter.
+
+        Raises:
+            ValueError: If no image is loaded, the filter is unknown or its arguments are invalid.
+        """
+        await self.apply_filters([(name, args)])
+
+    async def apply_filters(self, steps: list[tuple]):
+        """
+        This function runs several registered filters, fused like ImageProcessor.apply_filters().
+
+        Parameters:
+            steps (list[tuple]): (name, args) pairs, in order.
+
+        Raises:
+            ValueError: If no image is loaded, a filter is unknown or its arguments are invalid.
+        """
+        async with self._lock:
+            edited = self._processor.snapshot()
+            await self.runner.compute(edited.apply_filters, steps)
+            self._processor = edited
+
+    async def save(self, path: str, options: EncoderOptions | None = None):
+        """
+        This function encodes on the compute executor and writes the file on the I/O executor.
+
+        Parameters:
+            path (str): Output file; its extension picks the format.
+            options (EncoderOptions | None): Encoder settings, defaults if None.
+
+        Raises:
+            ValueError: If no image is loaded, or encoding or writing fails.
+        """
+        async with self._lock:
+            processor = self._processor.snapshot()
+            data = await self.runner.compute(processor.encode, os.path.splitext(path)[1].lower(), options)
+            await self.runner.io(_write_file, path, data)
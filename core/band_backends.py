@@ -0,0 +1,397 @@
+import multiprocessing
+import os
+import threading
+import time
+import weakref
+from concurrent.futures import FIRST_EXCEPTION, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from multiprocessing import shared_memory
+import cv2
+import numpy as np
+from core.buffer_pool import BufferPool
+from core.filters import FILTERS, run_chain
+
+_pool = None
+
+
+def run_band(group: list[tuple], image: np.ndarray, out: np.ndarray, y0: int, y1: int,
+             halo: int, pool: BufferPool):
+    """
+    This function runs a fused edit on rows y0 to y1 of an image and writes them into out.
+
+    The rows are read with halo extra rows above and below. Without a halo
+    the edit writes straight into its rows of out.
+
+    Parameters:
+        group (list[tuple]): (Filter, args) pairs.
+        image (np.ndarray): Whole input image.
+        out (np.ndarray): Whole output image, may be image itself for point ops.
+        y0 (int): First output row.
+        y1 (int): Row after the last output row.
+        halo (int): Rows of context the edit needs.
+        pool (BufferPool): Scratch arrays for the kernels.
+    """
+    if halo == 0:
+        band = run_chain(group, image[y0:y1], out[y0:y1], pool)
+        if not np.may_share_memory(band, out):
+            out[y0:y1] = band
+        return
+    top = max(0, y0 - halo)
+    band = run_chain(group, image[top:min(image.shape[0], y1 + halo)], None, pool)
+    out[y0:y1] = band[y0 - top:y1 - top]
+
+
+def _init_worker():
+    """
+    This function prepares a worker process, so the first edit does not pay for it.
+    """
+    global _pool
+    _pool = BufferPool()
+    # Bands already run in parallel across processes, so OpenCV's own threads would compete
+    cv2.setNumThreads(1)
+
+
+def _ready() -> int:
+    """
+    This function lets the backend wait until a worker has started.
+
+    Returns:
+        int: The worker's process id.
+    """
+    return os.getpid()
+
+
+def _process_band(source: tuple, target: tuple, steps: list[tuple], y0: int, y1: int, halo: int):
+    """
+    This function runs one band inside a worker process.
+
+    Both images live in shared memory blocks, so only their names, shapes
+    and the list of edits cross the process pipe.
+
+    Parameters:
+        source (tuple): (block name, shape, dtype) of the input image.
+        target (tuple): (block name, shape, dtype) of the output image.
+        steps (list[tuple]): (name, args) pairs, already checked.
+        y0 (int): First output row.
+        y1 (int): Row after the last output row.
+        halo (int): Rows of context the edit needs.
+    """
+    group = [(FILTERS.get(name), args) for name, args in steps]
+    blocks = []
+    try:
+        arrays = []
+        for name, shape, dtype in (source, target):
+            block = shared_memory.SharedMemory(name)
+            blocks.append(block)
+            arrays.append(np.ndarray(shape, dtype, block.buf))
+        run_band(group, arrays[0], arrays[1], y0, y1, halo, _pool)
+        del arrays
+    finally:
+        for block in blocks:
+            try:
+                block.close()
+            except BufferError:
+                # An error's traceback still holds arrays over the block; it closes when that is freed
+                pass
+
+
+class ThreadBackend:
+    """
+    This class runs tileable edits in bands of rows on a pool of threads.
+
+    OpenCV releases the GIL inside its calls, so the bands of OpenCV kernels
+    run in parallel; NumPy work in a kernel still takes turns.
+    """
+
+    def __init__(self, workers: int | None = None, min_bytes: int = 4 * 1024 * 1024):
+        """
+        This function starts the threads.
+
+        Parameters:
+            workers (int | None): Threads, one per CPU by default.
+            min_bytes (int): Smaller images run on the calling thread, where
+                             splitting them costs more than it saves.
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.min_bytes = min_bytes
+        self._pool = BufferPool()
+        self._executor = ThreadPoolExecutor(self.workers)
+
+    def __repr__(self) -> str:
+        """
+        This function return a readable summary of the backend.
+
+        Returns:
+            str: A string showing the number of workers.
+        """
+        return f"{type(self).__name__}(workers={self.workers})"
+
+    def __enter__(self):
+        """
+        This function gives the backend to a with block, which closes it at the end.
+        """
+        return self
+
+    def __exit__(self, *exc):
+        """
+        This function closes the backend at the end of a with block.
+        """
+        self.close()
+
+    def wants(self, image: np.ndarray) -> bool:
+        """
+        This function checks if an image is large enough to be split.
+
+        Parameters:
+            image (np.ndarray): Image to check.
+
+        Returns:
+            bool: True if the image should run on this backend.
+        """
+        return image.nbytes >= self.min_bytes and image.shape[0] >= 2 * self.workers
+
+    def _bands(self, h: int) -> list[tuple]:
+        """
+        This function cuts the rows into two bands per worker, so a slow band doesn't hold the others up.
+
+        Parameters:
+            h (int): Image height.
+
+        Returns:
+            list[tuple]: (first row, row after the last) pairs.
+        """
+        count = min(h, self.workers * 2)
+        edges = [h * i // count for i in range(count + 1)]
+        return list(zip(edges[:-1], edges[1:]))
+
+    def _output_format(self, image: np.ndarray, group: list[tuple]) -> tuple:
+        """
+        This function finds the shape and type of the result by running the edit on one row.
+
+        Parameters:
+            image (np.ndarray): Input image.
+            group (list[tuple]): (Filter, args) pairs.
+
+        Returns:
+            tuple: (shape, dtype) of the whole result.
+        """
+        row = run_chain(group, image[:1], None, self._pool)
+        return (image.shape[0],) + row.shape[1:], row.dtype
+
+    @staticmethod
+    def _wait(futures: list):
+        """
+        This function waits for every band and raises the first error.
+
+        Every band is waited for even after an error, so none is still
+        writing into the output when it is given up.
+
+        Parameters:
+            futures (list): Futures of the bands.
+        """
+        wait(futures, return_when=FIRST_EXCEPTION)
+        for future in futures:
+            future.cancel()
+        wait(futures)
+        for future in futures:
+            if not future.cancelled() and future.exception() is not None:
+                raise future.exception()
+
+    def run(self, image: np.ndarray, group: list[tuple], halo: int,
+            in_place: bool = False, owned: bool = False) -> np.ndarray:
+        """
+        This function runs a fused edit on an image, band by band in parallel.
+
+        Parameters:
+            image (np.ndarray): Input image, never written unless owned.
+            group (list[tuple]): (Filter, args) pairs.
+            halo (int): Rows of context the edit needs.
+            in_place (bool): Every filter in the group is a point op that keeps the format.
+            owned (bool): Nothing else refers to image, so in-place edits may write into it.
+
+        Returns:
+            np.ndarray: The edited image.
+        """
+        if in_place and owned:
+            out = image
+        else:
+            out = np.empty(*self._output_format(image, group))
+        self._wait([self._executor.submit(run_band, group, image, out, y0, y1, halo, self._pool)
+                    for y0, y1 in self._bands(image.shape[0])])
+        return out
+
+    def close(self):
+        """
+        This function stops the threads.
+        """
+        self._executor.shutdown()
+
+
+class ProcessBackend(ThreadBackend):
+    """
+    This class runs tileable edits in bands of rows on a pool of worker processes.
+
+    Work in a kernel that holds the GIL, like NumPy arithmetic, runs in
+    parallel here too. Images are placed in shared memory blocks and the
+    workers read and write their bands there, so pixels are never pickled.
+    Results stay in shared memory, so the next edit on them needs no copy,
+    and a block is freed when the last array over it is gone. The worker
+    processes are started once and reused for every edit.
+    """
+
+    def __init__(self, workers: int | None = None, min_bytes: int = 16 * 1024 * 1024):
+        """
+        This function starts the worker processes.
+
+        Parameters:
+            workers (int | None): Processes, one per CPU by default.
+            min_bytes (int): Smaller images run on the calling thread, where
+                             the hand-off costs more than it saves.
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.min_bytes = min_bytes
+        self._pool = BufferPool()
+        self._blocks = {}
+        self._lock = threading.Lock()
+        # Spawned workers don't inherit the editor's threads or locks
+        self._executor = ProcessPoolExecutor(self.workers, multiprocessing.get_context("spawn"), _init_worker)
+        for future in [self._executor.submit(_ready) for _ in range(self.workers)]:
+            future.result()
+
+    def allocate(self, shape: tuple, dtype) -> np.ndarray:
+        """
+        This function gives a new array in a shared memory block the workers can open.
+
+        Parameters:
+            shape (tuple): Array shape.
+            dtype: Array data type.
+
+        Returns:
+            np.ndarray: Uninitialised array; its block is freed when it and every view of it are gone.
+        """
+        size = max(1, int(np.prod(shape)) * np.dtype(dtype).itemsize)
+        block = shared_memory.SharedMemory(create=True, size=size)
+        array = np.ndarray(shape, dtype, block.buf)
+        with self._lock:
+            self._blocks[id(array)] = (weakref.ref(array), block.name)
+        weakref.finalize(array, self._release, id(array), block)
+        return array
+
+    def _release(self, key: int, block: shared_memory.SharedMemory):
+        """
+        This function frees the block of an array that is gone.
+
+        Parameters:
+            key (int): id() the array had.
+            block (SharedMemory): Its block.
+        """
+        with self._lock:
+            entry = self._blocks.get(key)
+            if entry is not None and entry[0]() is None:
+                del self._blocks[key]
+        block.close()
+        block.unlink()
+
+    def _describe(self, image: np.ndarray) -> tuple | None:
+        """
+        This function gives how a worker finds an array, if it lives in one of this backend's blocks.
+
+        Parameters:
+            image (np.ndarray): Array to look up.
+
+        Returns:
+            tuple | None: (block name, shape, dtype), or None for other arrays.
+        """
+        with self._lock:
+            entry = self._blocks.get(id(image))
+        if entry is None or entry[0]() is not image:
+            return None
+        return entry[1], image.shape, image.dtype.str
+
+    def share(self, image: np.ndarray) -> np.ndarray:
+        """
+        This function gives the image in shared memory, copying it there unless it already is.
+
+        Parameters:
+            image (np.ndarray): Image to share.
+
+        Returns:
+            np.ndarray: The image itself, or a shared copy.
+        """
+        if self._describe(image) is not None:
+            return image
+        shared = self.allocate(image.shape, image.dtype)
+        np.copyto(shared, image)
+        return shared
+
+    def run(self, image: np.ndarray, group: list[tuple], halo: int,
+            in_place: bool = False, owned: bool = False) -> np.ndarray:
+        """
+        This function runs a fused edit on an image, band by band in the worker processes.
+
+        Parameters:
+            image (np.ndarray): Input image, never written unless owned.
+            group (list[tuple]): (Filter, args) pairs.
+            halo (int): Rows of context the edit needs.
+            in_place (bool): Every filter in the group is a point op that keeps the format.
+            owned (bool): Nothing else refers to image, so in-place edits may write into it.
+
+        Returns:
+            np.ndarray: The edited image, in shared memory.
+        """
+        source = self.share(image)
+        if in_place and (owned or source is not image):
+            # A fresh shared copy belongs to this edit, so point ops can write into it too
+            out = source
+        else:
+            out = self.allocate(*self._output_format(image, group))
+        steps = [(spec.name, args) for spec, args in group]
+        self._wait([self._executor.submit(_process_band, self._describe(source), self._describe(out),
+                                          steps, y0, y1, halo)
+                    for y0, y1 in self._bands(image.shape[0])])
+        return out
+
+    def close(self):
+        """
+        This function shuts the worker processes down; shared results stay valid.
+        """
+        self._executor.shutdown(cancel_futures=True)
+
+
+def compare_backends(image: np.ndarray, steps: list[tuple], backends: dict, repeat: int = 5) -> dict:
+    """
+    This function times the same edits on the calling thread and on each backend.
+
+    Every run starts from the same image, and the best time of each is kept
+    so a one-off stall doesn't decide the result. Backends are asked to run
+    the edits whatever the size of the image, and get their size threshold
+    back afterwards. The process times include
+    copying the image into shared memory, as the first edit on it would.
+
+    Parameters:
+        image (np.ndarray): Test image.
+        steps (list[tuple]): (name, args) pairs, e.g. [("brightness", (30,))].
+        backends (dict): Label to ThreadBackend or ProcessBackend.
+        repeat (int): Runs per path.
+
+    Returns:
+        dict: Label ("serial" for the calling thread) to best time in seconds.
+    """
+    from core.image_processor import ImageProcessor
+    results = {}
+    for label, backend in [("serial", None)] + list(backends.items()):
+        min_bytes = backend.min_bytes if backend is not None else None
+        if backend is not None:
+            backend.min_bytes = 0
+        try:
+            processor = ImageProcessor(backend=backend)
+            best = float("inf")
+            for _ in range(repeat):
+                start = time.perf_counter()
+                processor.apply_chain_to(image, steps)
+                best = min(best, time.perf_counter() - start)
+        finally:
+            # The backends may be the editor's own, so their threshold is put back
+            if backend is not None:
+                backend.min_bytes = min_bytes
+        results[label] = best
+    return results
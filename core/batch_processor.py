@@ -0,0 +1,282 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+import cv2
+import numpy as np
+from core.buffer_pool import BufferPool
+from core.image_processor import ImageProcessor
+from utils.models import EncoderOptions
+from utils.orientation import Orientation
+
+
+def _first_duplicate(paths: list[str]) -> str | None:
+    """
+    This function finds an output path that more than one input would be written to.
+
+    Paths are compared the way the file system would, ignoring case on Windows.
+
+    Parameters:
+        paths (list[str]): Output paths.
+
+    Returns:
+        str | None: The first repeated path, or None if all differ.
+    """
+    seen = set()
+    for path in paths:
+        key = os.path.normcase(os.path.abspath(path))
+        if key in seen:
+            return path
+        seen.add(key)
+    return None
+
+
+class BatchProcessor:
+    """
+    This class applies the same edits to many images, stacking same-size images into one array.
+
+    Images of the same shape form an N x H x W x C stack. Point edits run as
+    one OpenCV call over the whole stack (seen as one tall image), and
+    rotations and flips are kept as one pending orientation that is applied
+    to the whole stack as a single array copy when the results are written.
+    Filters that look at neighbouring pixels, like blur and edge, still run
+    per image.
+    """
+
+    def __init__(self, workers: int | None = None):
+        """
+        This function creates an empty batch.
+
+        Parameters:
+            workers (int | None): Threads used to decode and encode files.
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self._groups = []
+        self._pool = BufferPool()
+
+    def __len__(self) -> int:
+        """
+        This function gives the number of images in the batch.
+
+        Returns:
+            int: How many images are loaded.
+        """
+        return sum(len(paths) for paths, _, _ in self._groups)
+
+    def __repr__(self) -> str:
+        """
+        This function return a readable summary of the batch.
+
+        Returns:
+            str: A string showing the image and stack counts.
+        """
+        return f"BatchProcessor(images={len(self)}, stacks={len(self._groups)})"
+
+    def load(self, paths: list[str]):
+        """
+        This function decodes the files in parallel and stacks images of the same shape.
+
+        Parameters:
+            paths (list[str]): Image files.
+
+        Raises:
+            ValueError: If any file can't be read.
+        """
+        with ThreadPoolExecutor(self.workers) as pool:
+            images = list(pool.map(cv2.imread, paths))
+        groups = {}
+        for path, image in zip(paths, images):
+            if image is None:
+                raise ValueError(f"Unsupported or corrupted image file: {path}")
+            groups.setdefault((image.shape, image.dtype.str), []).append((path, image))
+        images.clear()
+        self._groups = [([p for p, _ in items], np.stack([img for _, img in items]), Orientation())
+                        for items in groups.values()]
+
+    def _map_pixels(self, func, in_place: bool = False):
+        """
+        This function runs a per-pixel edit once per stack, viewing the stack as one tall image.
+
+        Parameters:
+            func (callable): Takes an OpenCV image and a destination (or None), returns the edited image.
+            in_place (bool): The stacks belong to the batch only, so edits that keep
+                             the pixel format may write their results straight into them.
+        """
+        result = []
+        for paths, stack, orientation in self._groups:
+            n, h = stack.shape[:2]
+            tall = stack.reshape((n * h,) + stack.shape[2:])
+            tall = func(tall, tall if in_place else None)
+            result.append((paths, tall.reshape((n, h) + tall.shape[1:]), orientation))
+        self._groups = result
+
+    def _map_images(self, func, bake: bool = False):
+        """
+        This function runs a neighbourhood edit on every image of every stack.
+
+        Parameters:
+            func (callable): Takes and returns an OpenCV image.
+            bake (bool): Apply the pending orientation first, for edits that do not commute with it.
+        """
+        result = []
+        for paths, stack, orientation in self._groups:
+            if bake:
+                stack, orientation = self._orient(stack, orientation), Orientation()
+            result.append((paths, np.stack([func(image) for image in stack]), orientation))
+        self._groups = result
+
+    def apply_filter(self, name: str, *args):
+        """
+        This function runs a registered filter on every image, picking the path from its traits.
+
+        Orientation filters only change the pending orientation, point ops run
+        once per stack (in place when they keep the pixel format), and other
+        filters run per image, after the orientation is applied if they do
+        not commute with it.
+
+        Parameters:
+            name (str): Filter name, e.g. "brightness".
+            *args: Arguments for the filter.
+
+        Raises:
+            ValueError: If the filter is unknown or its arguments are invalid.
+        """
+        spec = ImageProcessor.filters.get(name)
+        args = spec.complete(args)
+        spec.check(*args)
+        if spec.kernel is None:
+            self._groups = [(p, s, spec.orient(o, *args)) for p, s, o in self._groups]
+        elif spec.point_op:
+            self._map_pixels(lambda img, dst: spec.kernel(img, dst, self._pool, *args), in_place=spec.in_place)
+        else:
+            self._map_images(lambda img: spec.kernel(img, None, self._pool, *args),
+                             bake=not spec.orientation_commutative)
+
+    def grayscale(self):
+        """
+        This function converts every image to single-channel grayscale.
+        """
+        self.apply_filter("grayscale")
+
+    def brightness(self, value: int):
+        """
+        This function make every image brighter or darker.
+
+        Parameters:
+            value (int): Positive to brighten, negative to darken.
+
+        Raises:
+            ValueError: If value is not an integer.
+        """
+        self.apply_filter("brightness", value)
+
+    def contrast(self, alpha: float):
+        """
+        This function change the contrast of every image.
+
+        Parameters:
+            alpha (float): Contrast factor.
+
+        Raises:
+            ValueError: If alpha is invalid.
+        """
+        self.apply_filter("contrast", alpha)
+
+    def blur(self, intensity: int, mode: str = ImageProcessor.DEFAULT_BLUR_MODE):
+        """
+        This function apply Gaussian blur to every image.
+
+        Parameters:
+            intensity (int): Blur strength (0 means almost no blur).
+            mode (str): "gaussian", "box" or "auto", as for ImageProcessor.blur().
+
+        Raises:
+            ValueError: If intensity or mode is invalid.
+        """
+        self.apply_filter("blur", intensity, mode)
+
+    def edge(self):
+        """
+        This function detect edges in every image using Canny.
+        """
+        self.apply_filter("edge")
+
+    def rotate(self, angle: int):
+        """
+        This function rotates every image; pixels move once, when the results are written.
+
+        Parameters:
+            angle (int): Must be one of 90, 180, or 270.
+
+        Raises:
+            ValueError: If the angle is not supported.
+        """
+        self.apply_filter("rotate", angle)
+
+    def flip(self, mode: str):
+        """
+        This function flip every image; pixels move once, when the results are written.
+
+        Parameters:
+            mode (str): "horizontal" or "vertical".
+
+        Raises:
+            ValueError: If mode is invalid.
+        """
+        self.apply_filter("flip", mode)
+
+    @staticmethod
+    def _orient(stack: np.ndarray, orientation: Orientation) -> np.ndarray:
+        """
+        This function applies an orientation to a whole stack with one array copy.
+
+        Parameters:
+            stack (np.ndarray): N x H x W (x C) images.
+            orientation (Orientation): Orientation to apply.
+
+        Returns:
+            np.ndarray: The oriented stack.
+        """
+        if orientation.is_identity:
+            return stack
+        view = stack[:, :, ::-1] if orientation.mirrored else stack
+        view = np.rot90(view, -orientation.turns, axes=(1, 2))
+        return np.ascontiguousarray(view)
+
+    def results(self):
+        """
+        This function yields every edited image with the path it came from.
+
+        Returns:
+            generator: (path, np.ndarray) pairs.
+        """
+        for paths, stack, orientation in self._groups:
+            yield from zip(paths, self._orient(stack, orientation))
+
+    def save(self, folder: str, ext: str = ".png", options: EncoderOptions | None = None) -> list[str]:
+        """
+        This function writes every result to a folder, encoding files in parallel.
+
+        Parameters:
+            folder (str): Output folder, created if needed.
+            ext (str): Output file extension, which picks the format.
+            options (EncoderOptions | None): Encoder settings, defaults if None.
+
+        Returns:
+            list[str]: The written file paths.
+
+        Raises:
+            ValueError: If two inputs have the same base name, or any file fails to save.
+        """
+        targets = [os.path.join(folder, os.path.splitext(os.path.basename(path))[0] + ext)
+                   for paths, _, _ in self._groups for path in paths]
+        duplicate = _first_duplicate(targets)
+        if duplicate is not None:
+            raise ValueError(f"Several images would be saved as {duplicate}.")
+        os.makedirs(folder, exist_ok=True)
+        params = ImageProcessor._encode_params("out" + ext, options or EncoderOptions())
+        jobs = [(os.path.join(folder, os.path.splitext(os.path.basename(path))[0] + ext), image)
+                for path, image in self.results()]
+        with ThreadPoolExecutor(self.workers) as pool:
+            written = list(pool.map(lambda job: cv2.imwrite(job[0], job[1], params), jobs))
+        if not all(written):
+            raise ValueError("Failed to save image.")
+        return [target for target, _ in jobs]
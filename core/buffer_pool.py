@@ -0,0 +1,87 @@
+import threading
+import numpy as np
+
+
+class BufferPool:
+    """
+    This class keeps scratch arrays between edits so same-shaped temporaries are reused.
+
+    Edits take a scratch array for their intermediate results and give it
+    back when they are done. Scratch arrays never leave an edit, so arrays
+    that the history or the canvas refer to are never handed out. The pool
+    is shared with background work, so taking and giving hold a lock.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024):
+        """
+        This function creates an empty pool.
+
+        Parameters:
+            max_bytes (int): Most bytes of idle scratch arrays kept; extra arrays are let go.
+        """
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._free = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """
+        This function gives the number of idle scratch arrays.
+
+        Returns:
+            int: How many arrays are waiting to be reused.
+        """
+        return sum(len(arrays) for arrays in self._free.values())
+
+    def __repr__(self) -> str:
+        """
+        This function return a readable summary of the pool.
+
+        Returns:
+            str: A string showing the idle arrays and their memory.
+        """
+        return f"BufferPool(arrays={len(self)}, {self.nbytes // (1024 * 1024)}/{self.max_bytes // (1024 * 1024)} MB)"
+
+    def take(self, shape: tuple, dtype=np.uint8) -> np.ndarray:
+        """
+        This function gives a scratch array, reusing an idle one of the same shape if there is one.
+
+        The contents are whatever the last user left in it.
+
+        Parameters:
+            shape (tuple): Array shape.
+            dtype: Array data type.
+
+        Returns:
+            np.ndarray: A C-contiguous array the caller owns until it gives it back.
+        """
+        key = (tuple(shape), np.dtype(dtype).str)
+        with self._lock:
+            arrays = self._free.get(key)
+            if arrays:
+                array = arrays.pop()
+                self.nbytes -= array.nbytes
+                return array
+        return np.empty(shape, dtype)
+
+    def give(self, *arrays):
+        """
+        This function hands scratch arrays back for later edits.
+
+        Parameters:
+            *arrays (np.ndarray | None): Arrays from take(); None is ignored.
+        """
+        with self._lock:
+            for array in arrays:
+                if array is None or self.nbytes + array.nbytes > self.max_bytes:
+                    continue
+                self._free.setdefault((array.shape, array.dtype.str), []).append(array)
+                self.nbytes += array.nbytes
+
+    def clear(self):
+        """
+        This function lets go of every idle scratch array.
+        """
+        with self._lock:
+            self._free.clear()
+            self.nbytes = 0
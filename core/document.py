@@ -0,0 +1,339 @@
+import os
+import cv2
+import numpy as np
+from core.history_manager import HistoryManager
+from core.image_processor import ImageProcessor
+from utils.models import ImageState, RegionPatch
+
+
+class EncodedState:
+    """
+    This class is a history state whose pixels are kept as a lossless PNG in memory.
+    """
+
+    def __init__(self, data: np.ndarray, orientation):
+        """
+        This function wraps already encoded pixels.
+
+        Parameters:
+            data (np.ndarray): PNG bytes from cv2.imencode.
+            orientation (Orientation): Pending orientation of the state.
+        """
+        self._data = data
+        self._pixels = None
+        self.orientation = orientation
+
+    def __repr__(self) -> str:
+        """
+        This function return a readable summary of the encoded state.
+
+        Returns:
+            str: A string showing the encoded size and whether it was decoded.
+        """
+        return f"EncodedState(bytes={self._data.nbytes}, decoded={self._pixels is not None})"
+
+    @classmethod
+    def encode(cls, pixels: np.ndarray, orientation):
+        """
+        This function compresses pixels with fast, lossless PNG settings.
+
+        Memory-mapped pixels already live on disk, so they are kept as they are.
+
+        Parameters:
+            pixels (np.ndarray): Pixels to compress.
+            orientation (Orientation): Pending orientation of the state.
+
+        Returns:
+            EncodedState | ImageState: The compressed state, or a plain state for mapped pixels.
+
+        Raises:
+            ValueError: If OpenCV cannot encode the pixels.
+        """
+        if isinstance(pixels, np.memmap):
+            return ImageState(pixels, orientation)
+        ok, data = cv2.imencode(".png", pixels, [cv2.IMWRITE_PNG_COMPRESSION, 1])
+        if not ok:
+            raise ValueError("Failed to compress image.")
+        return cls(data, orientation)
+
+    @property
+    def pixels(self) -> np.ndarray:
+        """
+        This function decodes the pixels on first use and keeps them.
+
+        Returns:
+            np.ndarray: The pixels.
+        """
+        if self._pixels is None:
+            self._pixels = cv2.imdecode(self._data, cv2.IMREAD_UNCHANGED)
+        return self._pixels
+
+    @property
+    def encoded(self) -> np.ndarray:
+        """
+        This function gives the encoded PNG bytes, which states made by with_orientation() share.
+
+        Returns:
+            np.ndarray: The encoded pixels.
+        """
+        return self._data
+
+    def read(self) -> np.ndarray:
+        """
+        This function gives the pixels without keeping a decoded copy.
+
+        Returns:
+            np.ndarray: The pixels.
+        """
+        if self._pixels is not None:
+            return self._pixels
+        return cv2.imdecode(self._data, cv2.IMREAD_UNCHANGED)
+
+    @property
+    def nbytes(self) -> int:
+        """
+        This function gives the memory used by the state.
+
+        Returns:
+            int: Encoded size plus decoded size if decoded.
+        """
+        return self._data.nbytes + (self._pixels.nbytes if self._pixels is not None else 0)
+
+    def release(self):
+        """
+        This function drops the decoded pixels and keeps only the encoded ones.
+        """
+        self._pixels = None
+
+    def shares_pixels(self, other) -> bool:
+        """
+        This function checks if another state uses the same encoded pixels.
+
+        Parameters:
+            other: Any history state.
+
+        Returns:
+            bool: True if both states hold the same encoded data.
+        """
+        return isinstance(other, EncodedState) and other._data is self._data
+
+    def with_orientation(self, orientation) -> "EncodedState":
+        """
+        This function makes a state that shares the encoded pixels with another orientation.
+
+        Parameters:
+            orientation (Orientation): Orientation of the new state.
+
+        Returns:
+            EncodedState: The new state.
+        """
+        return EncodedState(self._data, orientation)
+
+    def copy(self) -> "EncodedState":
+        """
+        This function returns the state itself, since it is never changed.
+
+        Returns:
+            EncodedState: This state.
+        """
+        return self
+
+
+class Document:
+    """
+    This class is one open image with its own processor, history and zoom.
+
+    While a document is inactive its original, current image and history
+    are kept only as encoded pixels.
+    """
+
+    def __init__(self, processor: ImageProcessor, history: HistoryManager | None = None,
+                 zoom: int = 100, name: str = "Untitled"):
+        """
+        This function creates a document for an already loaded processor.
+
+        Parameters:
+            processor (ImageProcessor): The image of the document.
+            history (HistoryManager | None): Its history, a new one if None.
+            zoom (int): Zoom percentage.
+            name (str): Name shown in the document tabs.
+        """
+        self.processor = processor
+        self.history = history or HistoryManager()
+        self.zoom = zoom
+        self.name = name
+        self.last_used = 0
+        self._parked = None
+
+    def __repr__(self) -> str:
+        """
+        This function return a readable summary of the document.
+
+        Returns:
+            str: A string showing the name and whether it is suspended.
+        """
+        return f"Document({self.name!r}, suspended={self.is_suspended})"
+
+    @classmethod
+    def from_file(cls, path: str, store=None) -> "Document":
+        """
+        This function loads an image file into a new document.
+
+        Parameters:
+            path (str): Path to the image file.
+            store (MappedStore | None): Scratch store for large images.
+
+        Returns:
+            Document: The new document.
+
+        Raises:
+            ValueError: If the path is invalid or the image can't be read.
+        """
+        processor = ImageProcessor(store)
+        processor.load(path)
+        return cls(processor, name=os.path.basename(path))
+
+    @property
+    def is_suspended(self) -> bool:
+        """
+        This function checks if the document only holds encoded pixels.
+
+        Returns:
+            bool: True while suspended.
+        """
+        return self._parked is not None
+
+    def nbytes(self) -> int:
+        """
+        This function estimates the memory the document holds.
+
+        Arrays shared by several states are counted once and memory-mapped
+        arrays are not counted, since the OS pages them.
+
+        Returns:
+            int: Resident bytes.
+        """
+        seen = {}
+        if self._parked is not None:
+            states = list(self._parked[:2])
+        else:
+            # pixels, not state: taking a state would stop in-place region edits
+            states = [ImageState(self.processor.original, None), ImageState(self.processor.pixels, None)]
+        undo, redo = self.history.entries()
+        states += [state for state, _ in undo + redo]
+        total = 0
+        for state in states:
+            if isinstance(state, EncodedState):
+                total += state.nbytes
+            elif isinstance(state, RegionPatch):
+                total += state.pixels.nbytes
+            elif isinstance(state, ImageState) and not isinstance(state.pixels, np.memmap):
+                seen[id(state.pixels)] = state.pixels.nbytes
+        return total + sum(seen.values())
+
+    def compress_history(self, keep: int = 0):
+        """
+        This function encodes the pixels of history states, oldest first.
+
+        Parameters:
+            keep (int): Number of newest undo states left untouched.
+        """
+        encoded = {}
+
+        def compress(entries):
+            result = []
+            for state, scale in entries:
+                if isinstance(state, EncodedState):
+                    state.release()
+                elif isinstance(state, ImageState) and not isinstance(state.pixels, np.memmap):
+                    key = id(state.pixels)
+                    if key in encoded:
+                        state = encoded[key].with_orientation(state.orientation)
+                    else:
+                        state = encoded[key] = EncodedState.encode(state.pixels, state.orientation)
+                result.append((state, scale))
+            return result
+
+        undo, redo = self.history.entries()
+        split = max(0, len(undo) - keep)
+        self.history.replace(compress(undo[:split]) + undo[split:], compress(redo))
+
+    def jump(self, position: int, scale: int) -> tuple | None:
+        """
+        This function makes a state of the history timeline current in one step.
+
+        Whole states passed on the way are only moved between the undo and
+        redo lists, and one is restored only when a region patch has to be
+        swapped into it or it is the target. Region patches are swapped in on
+        the way, which only touches their rectangles.
+
+        Parameters:
+            position (int): Timeline position to move to.
+            scale (int): The current zoom.
+
+        Returns:
+            tuple | None: (scale, rects) with the zoom of the target and the
+            changed rectangles, or None instead of rects if a whole state was
+            restored. None if the position is the current one or out of range.
+        """
+        processor = self.processor
+        pending = None
+        rects = []
+        whole = False
+
+        def step_away(entry):
+            nonlocal pending, whole
+            state, _ = entry
+            if isinstance(state, RegionPatch):
+                # A patch applies to the pixels of the state next to it, so that one has to be current
+                if pending is not None:
+                    processor.restore(pending)
+                    pending = None
+                    whole = True
+                rects.append(state.rect)
+                return processor.swap_region(state)
+            kept = pending if pending is not None else processor.state
+            pending = state
+            return kept
+
+        entry = self.history.jump(position, scale, step_away)
+        if entry is None:
+            return None
+        if pending is not None:
+            processor.restore(pending)
+            whole = True
+        return entry[1], None if whole else rects
+
+    def suspend(self):
+        """
+        This function encodes everything so only compressed pixels stay in memory.
+        """
+        if self._parked is not None:
+            return
+        self.compress_history()
+        processor = self.processor
+        original = EncodedState.encode(processor.original, None)
+        state = processor.state
+        if state.pixels is processor.original:
+            current = original.with_orientation(state.orientation) \
+                if isinstance(original, EncodedState) else state
+        else:
+            current = EncodedState.encode(state.pixels, state.orientation)
+        self._parked = (original, current, processor.source_path, processor.store)
+        self.processor = None
+
+    def activate(self):
+        """
+        This function decodes a suspended document so it can be edited again.
+        """
+        if self._parked is None:
+            return
+        original, current, source_path, store = self._parked
+        pixels = original.pixels
+        # Keep the original shared with the current image so unchanged JPEGs still save losslessly
+        if isinstance(original, EncodedState) and original.shares_pixels(current):
+            state = ImageState(pixels, current.orientation)
+        else:
+            state = ImageState(current.pixels, current.orientation)
+        self.processor = ImageProcessor.from_state(pixels, state, source_path, store)
+        self._parked = None
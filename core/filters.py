@@ -0,0 +1,518 @@
+from dataclasses import dataclass
+from typing import Callable
+import cv2
+import numpy as np
+from core.buffer_pool import BufferPool
+
+BLUR_MODES = {"gaussian", "box", "auto"}
+# Exact Gaussian up to GAUSSIAN_BLUR_LIMIT, box passes above it
+DEFAULT_BLUR_MODE = "auto"
+GAUSSIAN_BLUR_LIMIT = 20
+EDGE_HALO = 8
+SUPPORTED_ROTATIONS = {90, 180, 270}
+
+
+@dataclass(frozen=True)
+class FilterParam:
+    """
+    This class describes one argument of a filter, with what the UI needs to ask for it.
+    """
+    name: str
+    label: str
+    kind: type = int
+    low: float | None = None
+    high: float | None = None
+    default: object = None
+
+
+@dataclass(frozen=True)
+class Filter:
+    """
+    This class describes one filter: how to run it, how to show it and how it may be scheduled.
+
+    A filter either has a pixel kernel, called as kernel(image, dst, pool, *args)
+    and returning the result (written into dst when OpenCV can use it), or an
+    orient function that only changes the pending orientation.
+
+    The traits tell the execution layer which fast paths are safe:
+        point_op: each output pixel depends only on the same input pixel.
+        separable: the filter is a row pass and a column pass.
+        tileable: the image can be cut into tiles or bands, each read with halo
+            extra pixels, and the result is the same as for the whole image.
+        approx_regional: not tileable, but a selected region read with halo
+            extra pixels is close enough for a region edit.
+        orientation_commutative: rotating before or after the filter gives the same result.
+        invertible: the filter can be undone exactly without keeping pixels.
+        keeps_format: the result has the same shape and type as the input.
+
+    Point ops may also give lut(*args), the 256-entry table they apply to
+    pixel values, so histograms can follow them without looking at pixels.
+    """
+    name: str
+    label: str
+    section: str
+    description: str
+    kernel: Callable | None = None
+    orient: Callable | None = None
+    validate: Callable | None = None
+    params: tuple = ()
+    presets: tuple = ()
+    slider: tuple | None = None
+    point_op: bool = False
+    separable: bool = False
+    tileable: bool = True
+    approx_regional: bool = False
+    halo: Callable | int = 0
+    orientation_commutative: bool = True
+    invertible: bool = False
+    keeps_format: bool = True
+    lut: Callable | None = None
+
+    @property
+    def in_place(self) -> bool:
+        """
+        This function checks if the filter may write its result over its input.
+
+        Returns:
+            bool: True for point ops that keep the pixel format.
+        """
+        return self.point_op and self.keeps_format
+
+    @property
+    def regional(self) -> bool:
+        """
+        This function checks if the filter can run on a selected region only.
+
+        Returns:
+            bool: True for tileable pixel filters and those whose region edits are close enough.
+        """
+        return self.kernel is not None and (self.tileable or self.approx_regional)
+
+    def complete(self, args: tuple) -> tuple:
+        """
+        This function fills missing trailing arguments with their defaults.
+
+        Parameters:
+            args (tuple): Arguments given by the caller.
+
+        Returns:
+            tuple: The full argument list.
+        """
+        return tuple(args) + tuple(p.default for p in self.params[len(args):] if p.default is not None)
+
+    def check(self, *args):
+        """
+        This function validates arguments before the filter runs.
+
+        Raises:
+            ValueError: If an argument is invalid.
+        """
+        if self.validate is not None:
+            self.validate(*args)
+
+    def halo_for(self, *args) -> int:
+        """
+        This function gives how many pixels of context the filter needs around each output pixel.
+
+        Returns:
+            int: Extra pixels on each side.
+        """
+        return self.halo(*args) if callable(self.halo) else self.halo
+
+
+class FilterRegistry:
+    """
+    This class holds every filter the editor knows, in the order they were registered.
+
+    The control panel builds its buttons and sliders from it, and the
+    processors use the traits of each filter to pick how to run it.
+    """
+
+    def __init__(self):
+        """
+        This function creates an empty registry.
+        """
+        self._filters = {}
+
+    def __len__(self) -> int:
+        """
+        This function gives the number of registered filters.
+
+        Returns:
+            int: How many filters are registered.
+        """
+        return len(self._filters)
+
+    def __iter__(self):
+        """
+        This function goes through the filters in registration order.
+
+        Returns:
+            iterator: The Filter objects.
+        """
+        return iter(list(self._filters.values()))
+
+    def __contains__(self, name: str) -> bool:
+        """
+        This function checks if a filter name is registered.
+
+        Parameters:
+            name (str): Filter name.
+
+        Returns:
+            bool: True if the filter exists.
+        """
+        return name in self._filters
+
+    def __repr__(self) -> str:
+        """
+        This function return a readable summary of the registry.
+
+        Returns:
+            str: A string listing the filter names.
+        """
+        return f"FilterRegistry({', '.join(self._filters)})"
+
+    def register(self, spec: Filter) -> Filter:
+        """
+        This function adds a filter.
+
+        Parameters:
+            spec (Filter): The filter to add.
+
+        Returns:
+            Filter: The same filter.
+
+        Raises:
+            ValueError: If the filter has no kernel nor orient function, has a
+                        slider but does not commute with rotation (sliders run
+                        on the stored pixels), has a lookup table but is not
+                        a point op, or the name is taken.
+        """
+        if (spec.kernel is None) == (spec.orient is None):
+            raise ValueError(f"Filter {spec.name} needs exactly one of kernel or orient.")
+        if spec.slider is not None and not (spec.kernel is not None and spec.orientation_commutative and spec.params):
+            raise ValueError(f"Filter {spec.name} can't have a slider.")
+        if spec.lut is not None and not spec.point_op:
+            raise ValueError(f"Filter {spec.name} can't have a lookup table, it is not a point op.")
+        if spec.name in self._filters:
+            raise ValueError(f"Filter {spec.name} is already registered.")
+        self._filters[spec.name] = spec
+        return spec
+
+    def get(self, name: str) -> Filter:
+        """
+        This function looks up a filter by name.
+
+        Parameters:
+            name (str): Filter name.
+
+        Returns:
+            Filter: The filter.
+
+        Raises:
+            ValueError: If no filter has that name.
+        """
+        if name not in self._filters:
+            raise ValueError(f"Unsupported operation: {name}.")
+        return self._filters[name]
+
+    def sections(self) -> dict[str, list[Filter]]:
+        """
+        This function groups the filters by the UI section they belong to.
+
+        Returns:
+            dict[str, list[Filter]]: Section title to filters, in registration order.
+        """
+        groups = {}
+        for spec in self._filters.values():
+            groups.setdefault(spec.section, []).append(spec)
+        return groups
+
+
+def run_chain(group: list[tuple], image: np.ndarray, dst: np.ndarray | None, pool: BufferPool) -> np.ndarray:
+    """
+    This function runs pixel filters one after the other on an image, as one fused edit.
+
+    Parameters:
+        group (list[tuple]): (Filter, args) pairs, all with a kernel.
+        image (np.ndarray): Input pixels, never written unless it is dst.
+        dst (np.ndarray | None): Where the last filter should write, if OpenCV can use it.
+        pool (BufferPool): Scratch arrays for the kernels.
+
+    Returns:
+        np.ndarray: The result, dst when the last kernel wrote into it.
+    """
+    source = image
+    for i, (spec, args) in enumerate(group):
+        if i == len(group) - 1:
+            out = dst
+        elif i > 0 and spec.in_place and image is not source:
+            # Intermediate results belong to this edit, so point ops overwrite them
+            out = image
+        else:
+            out = None
+        image = spec.kernel(image, out, pool, *args)
+    return image
+
+
+# ---- built-in kernels ----
+
+def _grayscale(image: np.ndarray, dst, pool, *args) -> np.ndarray:
+    """
+    This function converts an image to single-channel gray, gray images are returned as they are.
+    """
+    if image.ndim == 2 or image.shape[2] == 1:
+        return image
+    return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY, dst=dst)
+
+
+def _box_sizes(sigma: float, passes: int) -> list[int]:
+    """
+    This function picks odd box widths whose repeated use matches a Gaussian.
+
+    Parameters:
+        sigma (float): Standard deviation of the Gaussian to imitate.
+        passes (int): Number of box filter passes.
+
+    Returns:
+        list[int]: One odd box width per pass.
+    """
+    ideal = np.sqrt(12 * sigma * sigma / passes + 1)
+    lower = int(np.floor(ideal))
+    if lower % 2 == 0:
+        lower -= 1
+    lower = max(lower, 1)
+    upper = lower + 2
+    m = (12 * sigma * sigma - passes * lower * lower - 4 * passes * lower - 3 * passes) / (-4 * lower - 4)
+    m = round(m)
+    return [lower if i < m else upper for i in range(passes)]
+
+
+def _blur_plan(intensity: int, mode: str = DEFAULT_BLUR_MODE):
+    """
+    This function resolves the blur mode and gives the kernel size and box widths.
+
+    Returns:
+        tuple: (mode, k, box widths or None).
+    """
+    if mode == "auto":
+        # Large radii switch to the box approximation, whose cost does not grow with radius
+        mode = "gaussian" if intensity <= GAUSSIAN_BLUR_LIMIT else "box"
+    k = intensity * 2 + 1
+    if mode == "gaussian":
+        return mode, k, None
+    # Same sigma OpenCV derives for a (k, k) kernel with sigma=0
+    sigma = 0.3 * ((k - 1) * 0.5 - 1) + 0.8
+    return mode, k, _box_sizes(sigma, 3)
+
+
+def _box_blur(image: np.ndarray, sizes: list[int], dst: np.ndarray | None = None,
+             pool: BufferPool | None = None) -> np.ndarray:
+    """
+    This function runs one box filter pass per given width.
+
+    Passes alternate between two scratch arrays and the last one writes into dst.
+
+    Parameters:
+        image (np.ndarray): Image to blur.
+        sizes (list[int]): Box widths.
+        dst (np.ndarray | None): Destination for the result.
+        pool (BufferPool | None): Where the scratch arrays come from.
+
+    Returns:
+        np.ndarray: The blurred image.
+    """
+    scratch = [pool.take(image.shape, image.dtype) for _ in range(min(2, len(sizes) - 1))] \
+        if pool is not None else []
+    for i, size in enumerate(sizes):
+        out = dst if i == len(sizes) - 1 else (scratch[i % 2] if scratch else None)
+        image = cv2.blur(image, (size, size), dst=out, borderType=cv2.BORDER_REFLECT_101)
+    if pool is not None:
+        pool.give(*scratch)
+    return image
+
+
+def _blur(image: np.ndarray, dst, pool, intensity: int, mode: str = DEFAULT_BLUR_MODE) -> np.ndarray:
+    """
+    This function blurs with the exact Gaussian or its three-pass box approximation.
+    """
+    mode, k, sizes = _blur_plan(intensity, mode)
+    if sizes is None:
+        return cv2.GaussianBlur(image, (k, k), 0, dst=dst)
+    return _box_blur(image, sizes, dst, pool)
+
+
+def _blur_halo(intensity: int, mode: str = DEFAULT_BLUR_MODE) -> int:
+    """
+    This function gives the reach of a blur in pixels.
+    """
+    mode, k, sizes = _blur_plan(intensity, mode)
+    return k // 2 if sizes is None else sum(size // 2 for size in sizes)
+
+
+def _check_blur(intensity, mode=DEFAULT_BLUR_MODE):
+    """
+    This function validates blur arguments.
+    """
+    if not isinstance(intensity, int) or intensity < 0:
+        raise ValueError("Blur intensity must be a non-negative integer.")
+    if mode not in BLUR_MODES:
+        raise ValueError("Blur mode must be 'gaussian', 'box' or 'auto'.")
+
+
+def _edge(image: np.ndarray, dst, pool, *args) -> np.ndarray:
+    """
+    This function detects edges with Canny.
+    """
+    return cv2.Canny(image, 100, 200, edges=dst)
+
+
+def brightness(image: np.ndarray, value: int, dst: np.ndarray | None = None,
+               pool: BufferPool | None = None) -> np.ndarray:
+    """
+    This function shifts the HSV value channel of an image.
+
+    The shift is a 256-entry lookup table applied to the value channel in
+    place, so the only intermediates are one HSV frame and one plane.
+
+    Parameters:
+        image (np.ndarray): BGR or single-channel image.
+        value (int): Amount to add to the value channel.
+        dst (np.ndarray | None): Destination for the result, may be image itself.
+        pool (BufferPool | None): Where the HSV frame and plane come from.
+
+    Returns:
+        np.ndarray: The adjusted image.
+    """
+    lut = brightness_lut(value)
+    if image.ndim == 2 or image.shape[2] == 1:
+        # For gray pixels the HSV value channel is the pixel itself
+        return cv2.LUT(image, lut, dst=dst)
+    hsv = pool.take(image.shape, np.uint8) if pool is not None else None
+    plane = pool.take(image.shape[:2], np.uint8) if pool is not None else None
+    hsv = cv2.cvtColor(image, cv2.COLOR_BGR2HSV, dst=hsv)
+    plane = cv2.extractChannel(hsv, 2, dst=plane)
+    cv2.LUT(plane, lut, dst=plane)
+    cv2.insertChannel(plane, hsv, 2)
+    result = cv2.cvtColor(hsv, cv2.COLOR_HSV2BGR, dst=dst)
+    if pool is not None:
+        pool.give(hsv, plane)
+    return result
+
+
+def brightness_lut(value: int) -> np.ndarray:
+    """
+    This function gives the table brightness applies to the HSV value channel.
+
+    The value channel is the largest of B, G and R, so the table maps the
+    value histogram exactly; for the single channels it is an approximation.
+
+    Parameters:
+        value (int): Amount to add.
+
+    Returns:
+        np.ndarray: 256 uint8 entries.
+    """
+    return np.clip(np.arange(256) + value, 0, 255).astype(np.uint8)
+
+
+def _check_brightness(value):
+    """
+    This function validates the brightness argument.
+    """
+    if not isinstance(value, int):
+        raise ValueError("Brightness value must be an integer.")
+
+
+def _contrast(image: np.ndarray, dst, pool, alpha: float) -> np.ndarray:
+    """
+    This function scales pixel values by alpha.
+    """
+    return cv2.convertScaleAbs(image, dst=dst, alpha=alpha, beta=0)
+
+
+def _contrast_lut(alpha: float) -> np.ndarray:
+    """
+    This function gives the table contrast applies to every channel, rounded like convertScaleAbs.
+    """
+    return np.clip(np.rint(np.arange(256) * alpha), 0, 255).astype(np.uint8)
+
+
+def _check_contrast(alpha):
+    """
+    This function validates the contrast argument.
+    """
+    if not isinstance(alpha, (int, float)) or alpha <= 0:
+        raise ValueError("Contrast alpha must be > 0.")
+
+
+def _check_rotation(angle):
+    """
+    This function validates the rotation angle.
+    """
+    if angle not in SUPPORTED_ROTATIONS:
+        raise ValueError("Rotation angle must be 90, 180, or 270.")
+
+
+def _check_flip(mode):
+    """
+    This function validates the flip mode.
+    """
+    if mode not in ("horizontal", "vertical"):
+        raise ValueError("Flip mode must be 'horizontal' or 'vertical'.")
+
+
+FILTERS = FilterRegistry()
+
+FILTERS.register(Filter(
+    "grayscale", "Grayscale", "Basic Filters", "Converts image to black and white.",
+    kernel=_grayscale, presets=(("Grayscale", (), "Converts image to black and white."),),
+    point_op=True, keeps_format=False))
+
+FILTERS.register(Filter(
+    "blur", "Blur", "Basic Filters", "Smooths the image to reduce noise.",
+    kernel=_blur, validate=_check_blur,
+    params=(FilterParam("intensity", "Intensity", int, 1, 200),
+            FilterParam("mode", "Mode", str, default=DEFAULT_BLUR_MODE)),
+    presets=(("Blur", None, "Smooths the image to reduce noise."),),
+    separable=True, halo=_blur_halo))
+
+FILTERS.register(Filter(
+    "edge", "Edge", "Basic Filters", "Detects edges in the image.",
+    kernel=_edge, presets=(("Edge", (), "Detects edges in the image."),),
+    # Hysteresis follows edges across the whole image, so bands could differ at their seams;
+    # a region edit with some context is close enough
+    tileable=False, approx_regional=True, halo=EDGE_HALO, orientation_commutative=False, keeps_format=False))
+
+FILTERS.register(Filter(
+    "brightness", "Brightness", "Adjustments", "Changes brightness.",
+    kernel=lambda image, dst, pool, value: brightness(image, value, dst, pool),
+    validate=_check_brightness,
+    params=(FilterParam("value", "Value", int, -100, 100),),
+    presets=(("Bright -", (-30,), "Decreases brightness."), ("Bright +", (30,), "Increases brightness.")),
+    slider=(-100, 100, 1, 0), point_op=True, lut=brightness_lut))
+
+FILTERS.register(Filter(
+    "contrast", "Contrast", "Adjustments", "Changes contrast.",
+    kernel=_contrast, validate=_check_contrast,
+    params=(FilterParam("alpha", "Alpha", float, 0.2, 3.0),),
+    presets=(("Contrast -", (0.8,), "Reduces contrast."), ("Contrast +", (1.2,), "Increases contrast.")),
+    slider=(0.2, 3.0, 0.05, 1.0), point_op=True, lut=_contrast_lut))
+
+FILTERS.register(Filter(
+    "rotate", "Rotate", "Transform", "Rotates the image.",
+    orient=lambda orientation, angle: orientation.rotated(angle), validate=_check_rotation,
+    params=(FilterParam("angle", "Angle", int, 90, 270),),
+    presets=(("Rotate 90", (90,), "Rotates image 90 degrees."),
+             ("Rotate 180", (180,), "Rotates image upside down."),
+             ("Rotate 270", (270,), "Rotates image 270 degrees.")),
+    tileable=False, invertible=True))
+
+FILTERS.register(Filter(
+    "flip", "Flip", "Transform", "Flips the image.",
+    orient=lambda orientation, mode: orientation.flipped(mode), validate=_check_flip,
+    params=(FilterParam("mode", "Mode", str),),
+    presets=(("Flip H", ("horizontal",), "Flips image horizontally."),
+             ("Flip V", ("vertical",), "Flips image vertically.")),
+    tileable=False, invertible=True))
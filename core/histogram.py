@@ -0,0 +1,176 @@
+import threading
+import weakref
+from collections import OrderedDict
+import numpy as np
+from utils.models import ImageStats
+
+SAMPLE_PIXELS = 256 * 256
+
+
+class Histogram:
+    """
+    This class holds 256-bin histograms of an image, counted on an even sample of its pixels.
+
+    There is one histogram per channel and one of the HSV value, the largest
+    of the channels, which is what brightness changes. A point op with a
+    lookup table maps the counts to those of its result, so adjustments can
+    be followed without looking at the pixels again.
+    """
+
+    def __init__(self, channels: np.ndarray, value: np.ndarray):
+        """
+        This function keeps counts that were already made.
+
+        Parameters:
+            channels (np.ndarray): (channels, 256) counts, B, G, R order for color.
+            value (np.ndarray): 256 counts of the largest channel.
+        """
+        self.channels = channels
+        self.value = value
+
+    def __repr__(self) -> str:
+        """
+        This function return a readable summary of the histogram.
+
+        Returns:
+            str: A string showing the channel and sample counts.
+        """
+        return f"Histogram(channels={len(self.channels)}, pixels={int(self.value.sum())})"
+
+    @classmethod
+    def of(cls, image: np.ndarray, max_pixels: int = SAMPLE_PIXELS) -> "Histogram":
+        """
+        This function counts the pixels of an evenly strided sample of an image.
+
+        Striding keeps single pixel values, unlike a downscale, which would
+        average them and narrow the histogram. Only the sampled rows are read.
+
+        Parameters:
+            image (np.ndarray): BGR or single-channel image.
+            max_pixels (int): Most pixels counted.
+
+        Returns:
+            Histogram: The counts.
+        """
+        h, w = image.shape[:2]
+        step = max(1, int(np.ceil(np.sqrt(h * w / max_pixels))))
+        sample = image[::step, ::step]
+        if sample.ndim == 2:
+            sample = sample[..., None]
+        channels = np.stack([np.bincount(sample[..., c].ravel(), minlength=256)
+                             for c in range(sample.shape[2])]).astype(np.float64)
+        if sample.shape[2] == 1:
+            value = channels[0]
+        else:
+            value = np.bincount(sample.max(axis=2).ravel(), minlength=256).astype(np.float64)
+        return cls(channels, value)
+
+    def mapped(self, lut: np.ndarray) -> "Histogram":
+        """
+        This function gives the histogram of the image after a point op, from its lookup table.
+
+        The value histogram maps exactly for tables applied per channel or to
+        the value channel. Channel histograms map exactly only for tables
+        applied per channel, which is close enough for a live preview.
+
+        Parameters:
+            lut (np.ndarray): 256-entry table of the op.
+
+        Returns:
+            Histogram: The new counts.
+        """
+        index = lut.astype(np.intp)
+        return Histogram(np.stack([np.bincount(index, weights=c, minlength=256) for c in self.channels]),
+                         np.bincount(index, weights=self.value, minlength=256))
+
+    @property
+    def stats(self) -> ImageStats:
+        """
+        This function gives the mean and spread of each channel and how much is clipped.
+
+        Returns:
+            ImageStats: Mean and standard deviation per channel, and the
+                        fractions of pixels whose value is 0 or 255.
+        """
+        levels = np.arange(256)
+        total = max(1.0, float(self.value.sum()))
+        means = [float(levels @ c) / total for c in self.channels]
+        stds = [float(np.sqrt(((levels - m) ** 2) @ c / total)) for c, m in zip(self.channels, means)]
+        return ImageStats(tuple(means), tuple(stds), float(self.value[0]) / total, float(self.value[255]) / total)
+
+
+class HistogramCache:
+    """
+    This class keeps the histograms of the last few images, so undo, redo and switching tabs don't recount.
+
+    Entries are keyed by the image array itself and dropped when it is
+    freed. Arrays edited in place, e.g. by a region edit, must be forgotten.
+    """
+
+    def __init__(self, size: int = 16, max_pixels: int = SAMPLE_PIXELS):
+        """
+        This function creates an empty cache.
+
+        Parameters:
+            size (int): Most histograms kept.
+            max_pixels (int): Pixels sampled per image.
+        """
+        self.size = size
+        self.max_pixels = max_pixels
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """
+        This function gives the number of cached histograms.
+
+        Returns:
+            int: How many images have a histogram kept.
+        """
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        """
+        This function return a readable summary of the cache.
+
+        Returns:
+            str: A string showing how many histograms are kept.
+        """
+        return f"HistogramCache({len(self)}/{self.size})"
+
+    def get(self, image: np.ndarray) -> Histogram:
+        """
+        This function gives the histogram of an image, counting it only the first time.
+
+        Parameters:
+            image (np.ndarray): The image.
+
+        Returns:
+            Histogram: Its counts.
+        """
+        key = id(image)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0]() is image:
+                self._entries.move_to_end(key)
+                return entry[1]
+        histogram = Histogram.of(image, self.max_pixels)
+        with self._lock:
+            self._entries[key] = (weakref.ref(image), histogram)
+            self._entries.move_to_end(key)
+            # Freed images can't be asked for again, so their entries go first
+            for stale in [k for k, (ref, _) in self._entries.items() if ref() is None]:
+                del self._entries[stale]
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+        return histogram
+
+    def forget(self, image: np.ndarray):
+        """
+        This function drops the histogram of an image that was changed in place.
+
+        Parameters:
+            image (np.ndarray): The changed image.
+        """
+        with self._lock:
+            self._entries.pop(id(image), None)
@@ -1,6 +1,10 @@
 class HistoryManager:
     """
     This class keeps an undo or redo history for image modification.
+
+    Together with the current image the entries form a timeline of states,
+    numbered from the oldest undo state; the current state is at len(self).
+    A small thumbnail can be kept for each position of the timeline.
     """
     def __init__(self):
         """
@@ -8,6 +12,7 @@ class HistoryManager:
         """
         self._undo = []
         self._redo = []
+        self._thumbnails = {}
 
     def __len__(self) -> int:
         """
@@ -32,11 +37,13 @@ class HistoryManager:
         this function saves the current state into history.
 
         Parameters:
-            image: Current image to store.
+            image: Current image or image state to store (anything with a copy() method).
             scale (int): Current scale or zoom level for the image.
         """
         self._undo.append((image.copy(), scale))
         self._redo.clear()
+        # The redo states are gone, so their positions will hold new states
+        self._thumbnails = {p: t for p, t in self._thumbnails.items() if p < len(self._undo)}
 
     def undo(self, current_image, current_scale: int):
         """
@@ -72,9 +79,116 @@ class HistoryManager:
         self._undo.append((current_image.copy(), current_scale))
         return self._redo.pop()
 
+    def jump(self, position: int, current_scale: int, step_away):
+        """
+        This function moves to any state of the timeline at once.
+
+        The entries passed over go to the other list as they are, nothing is
+        copied. step_away is called with each of them, nearest first, and
+        gives what to keep of the state being left, like the current_image
+        of undo() and redo().
+
+        Parameters:
+            position (int): Timeline position to move to.
+            current_scale (int): The current scale/zoom level.
+            step_away (callable): Takes the (state, scale) entry being stepped to
+                and returns the state to keep for the one being left.
+
+        Returns:
+            tuple | None: The (state, scale) entry of the target position,
+            or None if it is the current one or out of range.
+        """
+        current = len(self._undo)
+        if position == current or not 0 <= position <= current + len(self._redo):
+            return None
+        source, target = (self._undo, self._redo) if position < current else (self._redo, self._undo)
+        scale, entry = current_scale, None
+        for _ in range(abs(position - current)):
+            entry = source[-1]
+            target.append((step_away(entry).copy(), scale))
+            source.pop()
+            scale = entry[1]
+        return entry
+
+    def timeline(self) -> tuple[int, list]:
+        """
+        This function gives the current position and the thumbnail of every state.
+
+        Returns:
+            tuple[int, list]: The current position, and one thumbnail per
+            position, oldest first, None where none was kept.
+        """
+        count = len(self._undo) + len(self._redo) + 1
+        return len(self._undo), [self._thumbnails.get(p) for p in range(count)]
+
+    def thumbnail(self, position: int | None = None):
+        """
+        This function gives the thumbnail kept for a state.
+
+        Parameters:
+            position (int | None): Timeline position, the current state if None.
+
+        Returns:
+            np.ndarray | None: The thumbnail, or None if none was kept.
+        """
+        return self._thumbnails.get(len(self._undo) if position is None else position)
+
+    def set_thumbnail(self, thumbnail):
+        """
+        This function keeps a thumbnail of the current state.
+
+        Parameters:
+            thumbnail (np.ndarray): Small image of the current state.
+        """
+        self._thumbnails[len(self._undo)] = thumbnail
+
+    def peek_undo(self):
+        """
+        This function looks at the entry the next undo will return without changing anything.
+
+        Returns:
+            tuple | None: The (state, scale) entry, or None if there is nothing to undo.
+        """
+        return self._undo[-1] if self._undo else None
+
+    def peek_redo(self):
+        """
+        This function looks at the entry the next redo will return without changing anything.
+
+        Returns:
+            tuple | None: The (state, scale) entry, or None if there is nothing to redo.
+        """
+        return self._redo[-1] if self._redo else None
+
     def clear(self):
         """
         This function clear all undo and redo history.
         """
         self._undo.clear()
         self._redo.clear()
+        self._thumbnails.clear()
+
+    def entries(self) -> tuple[list, list]:
+        """
+        This function gives copies of the undo and redo lists.
+
+        Returns:
+            tuple[list, list]: The (state, scale) entries, oldest first.
+        """
+        return list(self._undo), list(self._redo)
+
+    def replace(self, undo: list, redo: list):
+        """
+        This function replaces the whole history, for example from a project file.
+
+        Thumbnails are kept when the timeline keeps its shape, as when the
+        same states are swapped for compressed ones.
+
+        Parameters:
+            undo (list): Undo entries as (state, scale), oldest first.
+            redo (list): Redo entries as (state, scale), in stack order.
+        """
+        if len(undo) != len(self._undo) or len(redo) != len(self._redo):
+            self._thumbnails = {}
+        self._undo = list(undo)
+        self._redo = list(redo)
@@ -1,6 +1,14 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
 import cv2
 import numpy as np
-from utils.models import Size
+from utils.models import EncoderOptions, ExportTarget, ImageState, Rect, RegionPatch, Size
+from core.buffer_pool import BufferPool
+from core.filters import BLUR_MODES, DEFAULT_BLUR_MODE, EDGE_HALO, FILTERS, GAUSSIAN_BLUR_LIMIT, SUPPORTED_ROTATIONS, run_chain
+from core.mapped_store import MappedStore
+from utils.exif_orientation import ExifOrientation
+from utils.orientation import Orientation
 
 
 class ImageProcessor:
@@ -8,14 +16,34 @@ class ImageProcessor:
     This is a helper class for doing common image edits with OpenCV.
     """
 
-    SUPPORTED_ROTATIONS = {90, 180, 270}
+    SUPPORTED_ROTATIONS = SUPPORTED_ROTATIONS
+    EDGE_HALO = EDGE_HALO
+    JPEG_EXTENSIONS = {".jpg", ".jpeg"}
+    BLUR_MODES = BLUR_MODES
+    DEFAULT_BLUR_MODE = DEFAULT_BLUR_MODE
+    GAUSSIAN_BLUR_LIMIT = GAUSSIAN_BLUR_LIMIT
+    # Every filter the processor can run, with the traits that pick how it runs
+    filters = FILTERS
 
-    def __init__(self):
+    def __init__(self, store: MappedStore | None = None, pool: BufferPool | None = None, backend=None):
         """
         This function creates a new ImageProcessor instance with no image loaded yet.
-        """
+
+        Parameters:
+            store (MappedStore | None): Optional scratch store for images larger than memory.
+            pool (BufferPool | None): Scratch arrays for intermediate results, a new pool if None.
+            backend (ThreadBackend | ProcessBackend | None): Runs tileable filters in parallel
+                bands, see core.band_backends; None runs them on the calling thread.
+        """
+        self._store = store
+        self._pool = pool or BufferPool()
+        self.backend = backend
         self._original: np.ndarray | None = None
         self._current: np.ndarray | None = None
+        self._orientation = Orientation()
+        self._source_path: str | None = None
+        # The working array when nothing else refers to it, so region edits may write into it
+        self._owned: np.ndarray | None = None
 
     def __repr__(self) -> str:
         """
@@ -31,17 +59,169 @@ class ImageProcessor:
     @property
     def image(self) -> np.ndarray:
         """
-        This function gets the current image.
+        This function gets the current image with any pending rotation or flip applied.
+
+        Reading it doesn't change the processor: the orientation stays
+        pending, so a later JPEG save can still rewrite only the EXIF tag.
+        With a pending orientation each read makes a new oriented copy.
 
         Returns:
             np.ndarray: The current edited image.
 
+        Raises:
+            ValueError: If no image has been loaded yet.
+        """
+        self._ensure_loaded()
+        return self._oriented()
+
+    @property
+    def pixels(self) -> np.ndarray:
+        """
+        This function gets the stored pixels without applying the pending orientation.
+
+        Returns:
+            np.ndarray: The stored pixels.
+
         Raises:
             ValueError: If no image has been loaded yet.
         """
         self._ensure_loaded()
         return self._current
 
+    @property
+    def orientation(self) -> Orientation:
+        """
+        This function gets the rotation and flip still waiting to be applied.
+
+        Returns:
+            Orientation: The pending orientation.
+        """
+        return self._orientation
+
+    @property
+    def size(self) -> Size:
+        """
+        This function gets the size of the current image as it will be shown.
+
+        Returns:
+            Size: Width and height with the orientation applied.
+
+        Raises:
+            ValueError: If no image has been loaded yet.
+        """
+        self._ensure_loaded()
+        h, w = self._current.shape[:2]
+        return Size(*self._orientation.shape(w, h))
+
+    @property
+    def state(self) -> ImageState:
+        """
+        This function gets the current state for the history.
+
+        Returns:
+            ImageState: Stored pixels and pending orientation.
+
+        Raises:
+            ValueError: If no image has been loaded yet.
+        """
+        self._ensure_loaded()
+        self._owned = None
+        return ImageState(self._current, self._orientation)
+
+    def restore(self, state: ImageState):
+        """
+        This function goes back to a state taken from the history.
+
+        Parameters:
+            state (ImageState): The state to restore.
+
+        Returns:
+            None
+        """
+        self._current = state.pixels
+        self._orientation = state.orientation
+
+    def _bake_orientation(self):
+        """
+        This function applies the pending orientation to the stored pixels.
+
+        Edits that do not commute with rotation and flipping call this first.
+        """
+        if self._orientation.is_identity:
+            return
+        self._current = self._owned = self._oriented()
+        self._orientation = Orientation()
+
+    def _oriented(self) -> np.ndarray:
+        """
+        This function gives the stored pixels with the pending orientation applied, without keeping them.
+
+        Large images get their oriented copy from the mapped store.
+
+        Returns:
+            np.ndarray: The oriented pixels, the stored array itself for the identity.
+        """
+        if self._orientation.is_identity:
+            return self._current
+        dst = None
+        if self._store is not None and self._store.wants(self._current):
+            h, w = self._current.shape[:2]
+            ow, oh = self._orientation.shape(w, h)
+            dst = self._store.allocate((oh, ow) + self._current.shape[2:], self._current.dtype)
+        return self._orientation.apply(self._current, dst)
+
+    def _run(self, func, halo: int | None = 0, in_place: bool = False) -> np.ndarray:
+        """
+        This function runs a row-local edit on the current image.
+
+        Images handled by the mapped store are processed in bands of rows,
+        each read with halo extra rows above and below, and written into a
+        new mapped array, so only a few bands are resident at a time.
+
+        The edit writes into the destination it is given when OpenCV can use
+        it. Point edits (in_place) write straight into the working array when
+        nothing else refers to it; otherwise results are new arrays, because
+        history states share the arrays they were taken from.
+
+        Parameters:
+            func (callable): Takes an image and a destination (or None) and returns the edited image with the same rows.
+            halo (int | None): Rows of context the edit needs around each output row,
+                               None if the edit can't be split into bands.
+            in_place (bool): The edit reads each pixel only to write the same pixel.
+
+        Returns:
+            np.ndarray: The edited image.
+        """
+        image = self._current
+        owned = in_place and image is self._owned and image.flags.writeable
+        if halo is None or self._store is None or not self._store.wants(image):
+            result = func(image, image if owned else None)
+            if result is not image:
+                # Results are new arrays that only this processor refers to
+                self._owned = result
+            return result
+        h = image.shape[0]
+        rows = self._store.band_rows(image)
+        out = image if owned else None
+        scratch = None
+        for y0 in range(0, h, rows):
+            y1 = min(h, y0 + rows)
+            top = max(0, y0 - halo)
+            if out is not None and halo == 0:
+                # Row bands of the output are contiguous, so the edit can write into them directly
+                band = func(image[y0:y1], out[y0:y1])
+                if not np.may_share_memory(band, out):
+                    out[y0:y1] = band
+                continue
+            # The band result is scratch; the next band of the same size reuses it
+            scratch = func(image[top:min(h, y1 + halo)], scratch)
+            band = scratch[y0 - top:y1 - top]
+            if out is None:
+                out = self._store.allocate((h,) + band.shape[1:], band.dtype)
+            out[y0:y1] = band
+        self._owned = out
+        return out
+
     @classmethod
     def from_file(cls, path: str) -> "ImageProcessor":
         """
@@ -60,6 +240,62 @@ class ImageProcessor:
         obj.load(path)
         return obj
 
+    @classmethod
+    def from_state(cls, original: np.ndarray, state: ImageState,
+                   source_path: str | None = None,
+                   store: MappedStore | None = None) -> "ImageProcessor":
+        """
+        This function create an ImageProcessor from saved parts, e.g. a project file.
+
+        Parameters:
+            original (np.ndarray): The original image.
+            state (ImageState): The current pixels and orientation.
+            source_path (str | None): File the original was loaded from.
+            store (MappedStore | None): Optional scratch store for large images.
+
+        Returns:
+            ImageProcessor: A ready-to-use instance.
+        """
+        obj = cls(store)
+        obj._original = original
+        obj.restore(state)
+        obj._source_path = source_path
+        return obj
+
+    @property
+    def original(self) -> np.ndarray:
+        """
+        This function gets the original image as it was loaded.
+
+        Returns:
+            np.ndarray: The original image.
+
+        Raises:
+            ValueError: If no image has been loaded yet.
+        """
+        self._ensure_loaded()
+        return self._original
+
+    @property
+    def store(self) -> MappedStore | None:
+        """
+        This function gets the scratch store used for large images.
+
+        Returns:
+            MappedStore | None: The store, or None if everything stays in memory.
+        """
+        return self._store
+
+    @property
+    def source_path(self) -> str | None:
+        """
+        This function gets the path the image was loaded from.
+
+        Returns:
+            str | None: The source path, or None if unknown.
+        """
+        return self._source_path
+
     def _ensure_loaded(self):
         """
         This function make sure an image is loaded before doing any edits.
@@ -70,6 +306,19 @@ class ImageProcessor:
         if self._current is None:
             raise ValueError("No image loaded.")
 
+    @staticmethod
+    def _is_single_channel(image: np.ndarray) -> bool:
+        """
+        This function checks if an image is stored as one gray channel.
+
+        Parameter:
+            image (np.ndarray): Image to check.
+
+        Returns:
+            bool: True for a 2D (or one-channel) image.
+        """
+        return image.ndim == 2 or image.shape[2] == 1
+
     def _ensure_valid_path(self, path: str):
         """
         This function make sure the given file path looks valid.
@@ -97,18 +346,89 @@ class ImageProcessor:
             ValueError: If the path is invalid or the file can't be read.
         """
         self._ensure_valid_path(path)
-        image = cv2.imread(path)
+        if self._store is not None and path.lower().endswith(".npy"):
+            # Raw arrays are mapped straight from disk and never fully read
+            image = np.load(path, mmap_mode="r")
+            if image.dtype != np.uint8 or image.ndim not in (2, 3):
+                raise ValueError("Unsupported or corrupted image file.")
+        else:
+            image = cv2.imread(path)
+            if image is None:
+                raise ValueError("Unsupported or corrupted image file.")
+            if self._store is not None:
+                image = self._store.adopt(image)
+        self._set_loaded(image, path)
+
+    def decode(self, data: bytes, source_path: str | None = None):
+        """
+        This function loads an image from the bytes of an image file.
+
+        It lets the caller read the file itself, e.g. without blocking an event loop.
+
+        Parameters:
+            data (bytes): Encoded image, e.g. the contents of a PNG or JPEG file.
+            source_path (str | None): File the bytes were read from, if any.
+
+        Returns:
+            None
+
+        Raises:
+            ValueError: If the bytes are not a readable image.
+        """
+        image = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR)
         if image is None:
             raise ValueError("Unsupported or corrupted image file.")
+        if self._store is not None:
+            image = self._store.adopt(image)
+        self._set_loaded(image, source_path)
+
+    def _set_loaded(self, image: np.ndarray, path: str | None):
+        """
+        This function makes a freshly loaded image both the original and the working image.
+
+        Parameters:
+            image (np.ndarray): The loaded pixels.
+            path (str | None): Where they came from.
+        """
+        # Edits never write into arrays, so the working image can share the original
         self._original = image
-        self._current = image.copy()
+        self._current = image
+        self._orientation = Orientation()
+        self._source_path = path
+
+    def snapshot(self) -> "ImageProcessor":
+        """
+        This function makes a processor that keeps the current state for saving elsewhere.
+
+        Nothing is copied, because edits never write into existing arrays.
+        Later edits on this processor do not change the snapshot.
+
+        Returns:
+            ImageProcessor: A detached processor with the same image.
+
+        Raises:
+            ValueError: If no image is loaded.
+        """
+        self._ensure_loaded()
+        self._owned = None
+        other = ImageProcessor(self._store, self._pool, self.backend)
+        other._original = self._original
+        other._current = self._current
+        other._orientation = self._orientation
+        other._source_path = self._source_path
+        return other
 
-    def save(self, path: str):
+    def save(self, path: str, options: EncoderOptions | None = None):
         """
         This function saves the current working image to disk.
 
+        When a JPEG was only rotated or flipped and is saved as JPEG, the
+        source file is copied with a new EXIF orientation instead of being
+        decoded and encoded again, which is lossless and fast.
+
         Parameters:
             path (str): Output file path (including filename and extension).
+            options (EncoderOptions | None): Encoder settings, defaults if None.
 
         Returns:
             None
@@ -119,9 +439,169 @@ class ImageProcessor:
         """
         self._ensure_loaded()
         self._ensure_valid_path(path)
-        if not cv2.imwrite(path, self._current):
+        if self._save_jpeg_orientation(path):
+            return
+        params = self._encode_params(path, options or EncoderOptions())
+        if not cv2.imwrite(path, self.image, params):
             raise ValueError("Failed to save image.")
 
+    def encode(self, ext: str, options: EncoderOptions | None = None) -> bytes:
+        """
+        This function encodes the current image into the bytes of an image file.
+
+        Like save(), a JPEG that was only rotated or flipped keeps its
+        compressed data and only gets a new EXIF orientation.
+
+        Parameters:
+            ext (str): File extension picking the format, e.g. ".png".
+            options (EncoderOptions | None): Encoder settings, defaults if None.
+
+        Returns:
+            bytes: The encoded file.
+
+        Raises:
+            ValueError: If no image is loaded or OpenCV fails to encode it.
+        """
+        self._ensure_loaded()
+        data = self._reoriented_jpeg("out" + ext)
+        if data is not None:
+            return data
+        ok, encoded = cv2.imencode(ext, self.image, self._encode_params("out" + ext, options or EncoderOptions()))
+        if not ok:
+            raise ValueError("Failed to encode image.")
+        return encoded.tobytes()
+
+    def export_set(self, targets: list[ExportTarget], base: str, options: EncoderOptions | None = None,
+                   workers: int | None = None) -> list[str]:
+        """
+        This function writes the current image, with its edits, at several widths and formats in one pass.
+
+        Widths are made largest first and each is downscaled from the one
+        before, so the full image is resampled only once. Every width is
+        handed to a thread pool for encoding as soon as it is made, while the
+        next one is being resized. Targets wider than the image get its width
+        and are named by it.
+
+        Parameters:
+            targets (list[ExportTarget]): Widths, formats and qualities to write.
+            base (str): Path without extension; each file is named by ExportTarget.path().
+            options (EncoderOptions | None): Encoder settings for targets without a quality, defaults if None.
+            workers (int | None): Encoding threads, one per target up to the CPU count by default.
+
+        Returns:
+            list[str]: The written files, in the order of targets.
+
+        Raises:
+            ValueError: If no image is loaded, there are no targets, two targets
+                        would write the same file, or OpenCV fails to write one.
+        """
+        self._ensure_loaded()
+        self._ensure_valid_path(base)
+        if not targets:
+            raise ValueError("No export targets given.")
+        w, h = self.size
+        targets = [replace(target, width=min(target.width, w)) for target in targets]
+        paths = [target.path(base) for target in targets]
+        if len(set(paths)) != len(paths):
+            raise ValueError("Export targets must differ in width or format.")
+        options = options or EncoderOptions()
+
+        level = self.image
+        futures = [None] * len(targets)
+        with ThreadPoolExecutor(workers or min(len(targets), os.cpu_count() or 1)) as pool:
+            try:
+                for width in sorted({target.width for target in targets}, reverse=True):
+                    if width != level.shape[1]:
+                        level = cv2.resize(level, (width, max(1, round(h * width / w))),
+                                           interpolation=cv2.INTER_AREA)
+                    for i, target in enumerate(targets):
+                        if target.width == width:
+                            # OpenCV releases the GIL while encoding, so the files are written in parallel
+                            params = self._encode_params(paths[i], target.encoder_options(options))
+                            futures[i] = pool.submit(cv2.imwrite, paths[i], level, params)
+                for future in futures:
+                    if not future.result():
+                        raise ValueError("Failed to save image.")
+            except BaseException:
+                # Leaving the with block waits for every queued encode, so they are dropped first
+                pool.shutdown(wait=False, cancel_futures=True)
+                raise
+        return paths
+
+    @staticmethod
+    def _encode_params(path: str, options: EncoderOptions) -> list[int]:
+        """
+        This function turns encoder settings into OpenCV imwrite flags for a file type.
+
+        Parameters:
+            path (str): Output file path, its extension picks the format.
+            options (EncoderOptions): Encoder settings.
+
+        Returns:
+            list[int]: Flag and value pairs for cv2.imwrite.
+        """
+        ext = os.path.splitext(path)[1].lower()
+        if ext == ".png":
+            return [cv2.IMWRITE_PNG_COMPRESSION, options.png_compression]
+        if ext in ImageProcessor.JPEG_EXTENSIONS:
+            return [cv2.IMWRITE_JPEG_QUALITY, options.jpeg_quality,
+                    cv2.IMWRITE_JPEG_PROGRESSIVE, int(options.jpeg_progressive)]
+        if ext == ".webp":
+            return [cv2.IMWRITE_WEBP_QUALITY, options.webp_quality]
+        return []
+
+    def _save_jpeg_orientation(self, path: str) -> bool:
+        """
+        This function tries the lossless save for JPEGs that were only rotated or flipped.
+
+        Parameters:
+            path (str): Output file path.
+
+        Returns:
+            bool: True if the file was written, False if a normal save is needed.
+        """
+        data = self._reoriented_jpeg(path)
+        if data is None:
+            return False
+        with open(path, "wb") as f:
+            f.write(data)
+        return True
+
+    def _reoriented_jpeg(self, path: str) -> bytes | None:
+        """
+        This function gives the source JPEG with a new EXIF orientation, if that is all that changed.
+
+        Parameters:
+            path (str): Output file path, only its extension is used.
+
+        Returns:
+            bytes | None: The rewritten file, or None if a normal encode is needed.
+        """
+        if self._source_path is None or self._current is not self._original:
+            return None
+        if not (self._is_jpeg(self._source_path) and self._is_jpeg(path)):
+            return None
+        try:
+            with open(self._source_path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        # cv2.imread already applied the file's own orientation, so ours comes after it
+        source = Orientation.from_exif(ExifOrientation.read(data))
+        return ExifOrientation.rewrite(data, source.then(self._orientation).to_exif())
+
+    def _is_jpeg(self, path: str) -> bool:
+        """
+        This function checks if a path has a JPEG file extension.
+
+        Parameter:
+            path (str): File path to check.
+
+        Returns:
+            bool: True for .jpg and .jpeg files.
+        """
+        return os.path.splitext(path)[1].lower() in self.JPEG_EXTENSIONS
+
     def reset(self):
         """
         This function reset the working image back to the original.
@@ -133,44 +613,144 @@ class ImageProcessor:
             ValueError: If no image is loaded.
         """
         self._ensure_loaded()
-        self._current = self._original.copy()
+        self._current = self._original
+        self._orientation = Orientation()
+
+    def apply_filter(self, name: str, *args, backend=None):
+        """
+        This function runs a registered filter on the current image.
+
+        The traits of the filter pick how it runs: filters that only change
+        the orientation just update it, filters that do not commute with
+        rotation bake the orientation first, tileable filters run in bands
+        on mapped images or on a parallel backend, and point ops may write in place.
+
+        Parameters:
+            name (str): Filter name, e.g. "blur".
+            *args: Arguments for the filter; missing trailing ones get their defaults.
+            backend (ThreadBackend | ProcessBackend | None): Backend for this edit only,
+                the processor's backend if None.
+
+        Returns:
+            None
+
+        Raises:
+            ValueError: If no image is loaded, the filter is unknown or its arguments are invalid.
+        """
+        self.apply_filters([(name, args)], backend)
+
+    def apply_filters(self, steps: list[tuple], backend=None):
+        """
+        This function runs several registered filters on the current image.
+
+        Neighbouring tileable filters are fused: they run one after the other
+        on each band, so a mapped image is read and written once for the
+        whole group instead of once per filter.
+
+        Parameters:
+            steps (list[tuple]): (name, args) pairs, in order.
+            backend (ThreadBackend | ProcessBackend | None): Backend for these edits only,
+                the processor's backend if None.
+
+        Returns:
+            None
+
+        Raises:
+            ValueError: If no image is loaded, a filter is unknown or its arguments are invalid.
+        """
+        self._ensure_loaded()
+        plan = []
+        for name, args in steps:
+            spec = self.filters.get(name)
+            args = spec.complete(args)
+            spec.check(*args)
+            plan.append((spec, args))
+
+        group = []
+        for spec, args in plan:
+            if spec.kernel is None:
+                # Pixel filters in the group commute with it, so the order is kept
+                if group and not all(s.orientation_commutative for s, _ in group):
+                    self._run_group(group, backend)
+                    group = []
+                self._orientation = spec.orient(self._orientation, *args)
+                continue
+            if not spec.orientation_commutative or not spec.tileable:
+                self._run_group(group, backend)
+                group = []
+                if not spec.orientation_commutative:
+                    self._bake_orientation()
+            group.append((spec, args))
+            if not spec.tileable:
+                self._run_group(group, backend)
+                group = []
+        self._run_group(group, backend)
+
+    def _run_group(self, group: list[tuple], backend=None):
+        """
+        This function runs a group of pixel filters as one fused edit.
+
+        Parameters:
+            group (list[tuple]): (Filter, args) pairs.
+            backend (ThreadBackend | ProcessBackend | None): Parallel backend, the processor's if None.
+        """
+        if not group:
+            return
+        tileable = all(spec.tileable for spec, _ in group)
+        halo = sum(spec.halo_for(*args) for spec, args in group) if tileable else None
+        in_place = all(spec.in_place for spec, _ in group)
+
+        image = self._current
+        backend = backend or self.backend
+        mapped = self._store is not None and self._store.wants(image)
+        if backend is not None and tileable and not mapped and backend.wants(image):
+            owned = in_place and image is self._owned and image.flags.writeable
+            self._current = self._owned = backend.run(image, group, halo, in_place, owned)
+            return
+        self._current = self._run(lambda img, dst: run_chain(group, img, dst, self._pool), halo, in_place)
 
     def grayscale(self):
         """
         This function converts the current image to grayscale.
 
+        The result is kept as a single-channel image, so later edits, history
+        copies and rendering work on a third of the data.
+
         Returns:
             None
 
         Raises:
             ValueError: If no image is loaded.
         """
-        self._ensure_loaded()
-        gray = cv2.cvtColor(self._current, cv2.COLOR_BGR2GRAY)
-        self._current = cv2.cvtColor(gray, cv2.COLOR_GRAY2BGR)
+        self.apply_filter("grayscale")
 
-    def blur(self, intensity: int):
+    def blur(self, intensity: int, mode: str = DEFAULT_BLUR_MODE):
         """
         This function apply Gaussian blur to the current image.
 
+        The "box" mode approximates the same Gaussian with three box filter
+        passes. Box filters use running sums, so its cost per pixel does not
+        grow with intensity. Above GAUSSIAN_BLUR_LIMIT a hard 0 to 255 edge
+        blurred with it stays within 4 grey levels of the Gaussian result,
+        though single kernel weights differ by up to 15% of the peak; at small
+        intensities the boxes are too coarse. The default, "auto", uses the
+        exact kernel up to GAUSSIAN_BLUR_LIMIT and the boxes above it.
+
         Parameters:
             intensity (int): Blur strength (0 means almost no blur).
+            mode (str): "gaussian" for the exact kernel, "box" for the fast one or "auto" (default).
 
         Returns:
             None
 
         Raises:
-            ValueError: If no image is loaded or intensity is invalid.
+            ValueError: If no image is loaded, intensity or mode is invalid.
         """
-        self._ensure_loaded()
-        if not isinstance(intensity, int) or intensity < 0:
-            raise ValueError("Blur intensity must be a non-negative integer.")
-        k = intensity * 2 + 1
-        self._current = cv2.GaussianBlur(self._current, (k, k), 0)
+        self.apply_filter("blur", intensity, mode)
 
     def edge(self):
         """
-        This function detect edges using Canny and show them as a BGR image.
+        This function detect edges using Canny and keep them as a single-channel image.
 
         Returns:
             None
@@ -178,9 +758,7 @@ class ImageProcessor:
         Raises:
             ValueError: If no image is loaded.
         """
-        self._ensure_loaded()
-        edges = cv2.Canny(self._current, 100, 200)
-        self._current = cv2.cvtColor(edges, cv2.COLOR_GRAY2BGR)
+        self.apply_filter("edge")
 
     def brightness(self, value: int):
         """
@@ -195,13 +773,7 @@ class ImageProcessor:
         Raises:
             ValueError: If no image is loaded or value is not an integer.
         """
-        self._ensure_loaded()
-        if not isinstance(value, int):
-            raise ValueError("Brightness value must be an integer.")
-        hsv = cv2.cvtColor(self._current, cv2.COLOR_BGR2HSV)
-        h, s, v = cv2.split(hsv)
-        v = np.clip(v.astype(np.int16) + value, 0, 255).astype(np.uint8)
-        self._current = cv2.cvtColor(cv2.merge((h, s, v)), cv2.COLOR_HSV2BGR)
+        self.apply_filter("brightness", value)
 
     def contrast(self, alpha: float):
         """
@@ -216,15 +788,15 @@ class ImageProcessor:
         Raises:
             ValueError: If no image is loaded or alpha is invalid.
         """
-        self._ensure_loaded()
-        if not isinstance(alpha, (int, float)) or alpha <= 0:
-            raise ValueError("Contrast alpha must be > 0.")
-        self._current = cv2.convertScaleAbs(self._current, alpha=alpha, beta=0)
+        self.apply_filter("contrast", alpha)
 
     def rotate(self, angle: int):
         """
         This function rotates the image by a supported angle.
 
+        Only the pending orientation changes; pixels move once, when the
+        image is shown, saved or edited by a non-commuting filter.
+
         Parameters:
             angle (int): Must be one of 90, 180, or 270.
 
@@ -234,20 +806,14 @@ class ImageProcessor:
         Raises:
             ValueError: If no image is loaded or the angle is not supported.
         """
-        self._ensure_loaded()
-        if angle not in self.SUPPORTED_ROTATIONS:
-            raise ValueError("Rotation angle must be 90, 180, or 270.")
-        if angle == 90:
-            self._current = cv2.rotate(self._current, cv2.ROTATE_90_CLOCKWISE)
-        elif angle == 180:
-            self._current = cv2.rotate(self._current, cv2.ROTATE_180)
-        else:
-            self._current = cv2.rotate(self._current, cv2.ROTATE_90_COUNTERCLOCKWISE)
+        self.apply_filter("rotate", angle)
 
     def flip(self, mode: str):
         """
         This function flip the image horizontally or vertically.
 
+        Like rotate(), this only changes the pending orientation.
+
         Parameters:
             mode (str): "horizontal" or "vertical".
 
@@ -257,13 +823,7 @@ class ImageProcessor:
         Raises:
             ValueError: If no image is loaded or mode is invalid.
         """
-        self._ensure_loaded()
-        if mode == "horizontal":
-            self._current = cv2.flip(self._current, 1)
-        elif mode == "vertical":
-            self._current = cv2.flip(self._current, 0)
-        else:
-            raise ValueError("Flip mode must be 'horizontal' or 'vertical'.")
+        self.apply_filter("flip", mode)
 
     def resize_from_original(self, percent: int):
         """
@@ -288,8 +848,161 @@ class ImageProcessor:
         factor = percent / 100.0
         new_w, new_h = (base * factor)
 
-        self._current = cv2.resize(orig, (new_w, new_h), interpolation=cv2.INTER_AREA)
-        
+        dst = None
+        if self._store is not None and orig.nbytes * factor * factor >= self._store.min_bytes:
+            dst = self._store.allocate((new_h, new_w) + orig.shape[2:], orig.dtype)
+        self._current = self._owned = cv2.resize(orig, (new_w, new_h), dst=dst, interpolation=cv2.INTER_AREA)
+        self._orientation = Orientation()
+
+    def edit_region(self, rect: Rect, op: str, *args) -> RegionPatch:
+        """
+        This function applies an edit to a rectangle of the current image only.
+
+        The rectangle is cut out with the halo the filter declares, edited and
+        written into the working array. Filters that do not commute with
+        rotation see the cut-out oriented like the image. The cost follows the size of the rectangle,
+        except for the first region edit after a full-image edit, which makes
+        one private copy of the working array.
+
+        Parameters:
+            rect (Rect): Rectangle on the image as shown (orientation applied).
+            op (str): Name of a filter that can run on regions, e.g. "blur".
+            *args: Arguments for the filter.
+
+        Returns:
+            RegionPatch: The replaced pixels, for the history.
+
+        Raises:
+            ValueError: If no image is loaded, the edit is not supported on
+                        regions, or the rectangle is outside the image.
+        """
+        self._ensure_loaded()
+        spec = self.filters.get(op)
+        if not spec.regional:
+            raise ValueError(f"Unsupported region operation: {op}.")
+        args = spec.complete(args)
+        spec.check(*args)
+        h, w = self._current.shape[:2]
+        inner = self._orientation.source_rect(rect, w, h).clipped(w, h)
+        if inner is None:
+            raise ValueError("Selection is outside the image.")
+        outer = inner.expanded(spec.halo_for(*args)).clipped(w, h)
+
+        patch = self._current[outer.slices]
+        if spec.orientation_commutative:
+            patch = self.apply_to(patch, op, *args)
+        else:
+            patch = self._orientation.apply(patch)
+            patch = self._orientation.inverse().apply(self.apply_to(patch, op, *args))
+        rows, cols = Rect(inner.x - outer.x, inner.y - outer.y, inner.w, inner.h).slices
+        patch = patch[rows, cols]
+        if patch.ndim < self._current.ndim:
+            # Gray results go back into a color image as gray BGR pixels
+            patch = cv2.cvtColor(patch, cv2.COLOR_GRAY2BGR)
+        return self._write_region(inner, patch)
+
+    def swap_region(self, patch: RegionPatch) -> RegionPatch:
+        """
+        This function puts a patch from the history back and returns the pixels it replaced.
+
+        Parameters:
+            patch (RegionPatch): Patch from an undo or redo step.
+
+        Returns:
+            RegionPatch: The replaced pixels, for the opposite history stack.
+        """
+        self._ensure_loaded()
+        return self._write_region(patch.rect, patch.pixels)
+
+    def _write_region(self, rect: Rect, pixels: np.ndarray) -> RegionPatch:
+        """
+        This function writes pixels into a rectangle of the working array.
+
+        Parameters:
+            rect (Rect): Rectangle in stored pixel coordinates.
+            pixels (np.ndarray): New pixels for the rectangle.
+
+        Returns:
+            RegionPatch: The pixels that were there before.
+        """
+        if self._current is not self._owned:
+            # Other states share this array, so write into a private copy
+            if self._store is not None and self._store.wants(self._current):
+                self._owned = self._store.copy(self._current)
+            else:
+                self._owned = self._current.copy()
+            self._current = self._owned
+        before = self._current[rect.slices].copy()
+        self._current[rect.slices] = pixels
+        return RegionPatch(rect, before)
+
+    def preview_buffer(self, size: Size) -> np.ndarray:
+        """
+        This function makes a small copy of the current image for live previews.
+
+        The pending orientation is applied after downscaling, on the small copy.
+
+        Parameters:
+            size (Size): Target size, usually the size the canvas shows.
+
+        Returns:
+            np.ndarray: The downscaled image (or a copy if it is already small enough).
+
+        Raises:
+            ValueError: If no image is loaded.
+        """
+        self._ensure_loaded()
+        h, w = self._current.shape[:2]
+        target = self._orientation.shape(*size)
+        if target[0] >= w or target[1] >= h:
+            small = self._current.copy()
+        else:
+            small = cv2.resize(self._current, target, interpolation=cv2.INTER_AREA)
+        return self._orientation.apply(small)
+
+    def apply_to(self, image: np.ndarray, op: str, *args) -> np.ndarray:
+        """
+        This function runs an edit on a given image without touching the working image.
+
+        It is used for previews and for background work, so it never changes
+        the state of this processor.
+
+        Parameters:
+            image (np.ndarray): Image to edit.
+            op (str): Name of a registered filter, e.g. "brightness".
+            *args: Arguments for the filter.
+
+        Returns:
+            np.ndarray: The edited image.
+
+        Raises:
+            ValueError: If the filter is unknown or its arguments are invalid.
+        """
+        return self.apply_chain_to(image, [(op, args)])
+
+    def apply_chain_to(self, image: np.ndarray, steps: list[tuple], owned: bool = False) -> np.ndarray:
+        """
+        This function runs several filters on a given image, fusing them like apply_filters().
+
+        Parameters:
+            image (np.ndarray): Image to edit.
+            steps (list[tuple]): (name, args) pairs, in order.
+            owned (bool): Nothing else refers to image, so point ops may write into it.
+
+        Returns:
+            np.ndarray: The edited image.
+
+        Raises:
+            ValueError: If a filter is unknown or its arguments are invalid.
+        """
+        worker = ImageProcessor(self._store, self._pool, self.backend)
+        worker._original = image
+        worker._current = image
+        if owned:
+            worker._owned = image
+        worker.apply_filters(steps)
+        return worker.image
+
     def reset(self):
         """
         This function reset the working image back to the original.
@@ -301,4 +1014,5 @@ class ImageProcessor:
             ValueError: If no image is loaded.
         """
         self._ensure_loaded()
-        self._current = self._original.copy()
+        self._current = self._original
+        self._orientation = Orientation()
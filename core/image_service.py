@@ -0,0 +1,538 @@
+import ipaddress
+import json
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from multiprocessing import shared_memory
+from urllib.parse import parse_qs, urlsplit
+import cv2
+import numpy as np
+from core.image_processor import ImageProcessor
+from utils.models import EncoderOptions
+
+CONTENT_TYPES = {".png": "image/png", ".jpg": "image/jpeg", ".jpeg": "image/jpeg",
+                 ".webp": "image/webp", ".bmp": "image/bmp"}
+
+_processor = None
+
+
+def _init_worker():
+    """
+    This function prepares a worker process, so the first request does not pay for it.
+    """
+    global _processor
+    _processor = ImageProcessor()
+    # Requests already run in parallel across processes, so OpenCV's own threads would compete
+    cv2.setNumThreads(1)
+
+
+def _ready() -> int:
+    """
+    This function lets the server wait until a worker has started.
+
+    Returns:
+        int: The worker's process id.
+    """
+    return os.getpid()
+
+
+def _process_job(name: str, size: int, ops: list[tuple], ext: str, options: EncoderOptions) -> tuple:
+    """
+    This function runs one request inside a worker process.
+
+    The encoded image is read from the shared memory block the server wrote
+    it into, and the encoded result is written to a new block that the
+    server reads and unlinks. Only the block names cross the process pipe.
+
+    Parameters:
+        name (str): Shared memory block holding the encoded input.
+        size (int): Bytes of encoded input in the block.
+        ops (list[tuple]): (name, args) pairs.
+        ext (str): Output format, e.g. ".png".
+        options (EncoderOptions): Encoder settings.
+
+    Returns:
+        tuple: (result block name, result bytes, seconds spent in the worker).
+
+    Raises:
+        ValueError: If the image can't be decoded or encoded, or an edit is invalid.
+    """
+    start = time.perf_counter()
+    block = shared_memory.SharedMemory(name)
+    try:
+        # The array over the block is a temporary, so nothing points into the block when it closes
+        image = cv2.imdecode(np.ndarray((size,), np.uint8, block.buf), cv2.IMREAD_COLOR)
+    finally:
+        block.close()
+    if image is None:
+        raise ValueError("Unsupported or corrupted image.")
+
+    # The decoded image belongs to this request, so point ops write straight into it
+    image = _processor.apply_chain_to(image, ops, owned=True)
+    ok, encoded = cv2.imencode(ext, image, ImageProcessor._encode_params("out" + ext, options))
+    if not ok:
+        raise ValueError("Failed to encode image.")
+
+    out = shared_memory.SharedMemory(create=True, size=encoded.nbytes)
+    try:
+        out.buf[:encoded.nbytes] = encoded.reshape(-1)
+    except BaseException:
+        out.unlink()
+        raise
+    finally:
+        out.close()
+    return out.name, encoded.nbytes, time.perf_counter() - start
+
+
+class ServiceMetrics:
+    """
+    This class counts the requests of an ImageService and how long they take.
+
+    Latencies are kept for the most recent requests only, and throughput is
+    measured over a sliding window, so the numbers follow the current load
+    instead of the whole uptime. Request threads update it concurrently, so
+    every access holds a lock.
+    """
+
+    def __init__(self, workers: int, window: float = 60.0, samples: int = 1024):
+        """
+        This function starts counting.
+
+        Parameters:
+            workers (int): Worker processes serving the requests.
+            window (float): Seconds covered by the throughput figure.
+            samples (int): Recent requests kept for the latency percentiles.
+        """
+        self.workers = workers
+        self.window = window
+        self.start = time.perf_counter()
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self._latencies = deque(maxlen=samples)
+        self._work = deque(maxlen=samples)
+        self._finished = deque()
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        """
+        This function return a readable summary of the counters.
+
+        Returns:
+            str: A string showing the request counts.
+        """
+        return (f"ServiceMetrics(in_flight={self.in_flight}, completed={self.completed}, "
+                f"failed={self.failed}, rejected={self.rejected})")
+
+    @property
+    def queue_depth(self) -> int:
+        """
+        This function gives the number of accepted requests waiting for a free worker.
+        """
+        return max(0, self.in_flight - self.workers)
+
+    def admit(self, limit: int) -> bool:
+        """
+        This function accepts a request unless too many are already waiting.
+
+        Parameters:
+            limit (int): Most requests that may wait for a worker.
+
+        Returns:
+            bool: True if the request was accepted; finish() must follow.
+        """
+        with self._lock:
+            if self.in_flight - self.workers >= limit:
+                self.rejected += 1
+                return False
+            self.in_flight += 1
+            return True
+
+    def finish(self, seconds: float, ok: bool, bytes_in: int = 0, bytes_out: int = 0, work: float | None = None):
+        """
+        This function records the end of an accepted request.
+
+        Parameters:
+            seconds (float): Time from accepting the request to having the result.
+            ok (bool): False if the request failed.
+            bytes_in (int): Size of the uploaded image.
+            bytes_out (int): Size of the returned image.
+            work (float | None): Time spent inside the worker, None if it never ran.
+        """
+        now = time.perf_counter()
+        with self._lock:
+            self.in_flight -= 1
+            if not ok:
+                self.failed += 1
+                return
+            self.completed += 1
+            self.bytes_in += bytes_in
+            self.bytes_out += bytes_out
+            self._latencies.append(seconds)
+            if work is not None:
+                self._work.append(work)
+            self._finished.append(now)
+            self._trim(now)
+
+    def _trim(self, now: float):
+        """
+        This function forgets finish times that fell out of the throughput window.
+
+        Parameters:
+            now (float): Current time.
+        """
+        while self._finished and self._finished[0] < now - self.window:
+            self._finished.popleft()
+
+    @staticmethod
+    def _percentiles(values: list[float]) -> dict:
+        """
+        This function summarises durations in milliseconds.
+
+        Parameters:
+            values (list[float]): Durations in seconds.
+
+        Returns:
+            dict: p50, p95, p99 and max, all 0 when there are no values.
+        """
+        if not values:
+            return {"p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+        values = sorted(values)
+
+        def at(q):
+            return round(values[min(len(values) - 1, int(q * len(values)))] * 1000, 2)
+        return {"p50": at(0.50), "p95": at(0.95), "p99": at(0.99), "max": round(values[-1] * 1000, 2)}
+
+    def snapshot(self) -> dict:
+        """
+        This function gives every figure at once, ready to be sent as JSON.
+
+        Returns:
+            dict: Counters, queue depth, latency and throughput.
+        """
+        now = time.perf_counter()
+        with self._lock:
+            self._trim(now)
+            uptime = now - self.start
+            span = min(self.window, uptime)
+            return {
+                "workers": self.workers,
+                "in_flight": self.in_flight,
+                "queue_depth": self.queue_depth,
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "bytes_in": self.bytes_in,
+                "bytes_out": self.bytes_out,
+                "uptime_s": round(uptime, 3),
+                "throughput_rps": round(len(self._finished) / span, 3) if span > 0 else 0.0,
+                "latency_ms": self._percentiles(list(self._latencies)),
+                "worker_ms": self._percentiles(list(self._work)),
+            }
+
+
+class ImageService:
+    """
+    This class serves the editor's filters over HTTP on localhost, backed by worker processes.
+
+    Request threads hand each job to a pool of worker processes, so filters
+    run in parallel without the GIL. The uploaded image and the result move
+    between the server and the workers through shared memory blocks; the
+    process pipe only carries block names and the list of edits.
+
+    Endpoints:
+        POST /process?ops=[["blur",3],["grayscale"]]&format=.png
+            Body is an encoded image; the reply is the edited image.
+        GET /metrics    Queue depth, latency percentiles and throughput as JSON.
+        GET /filters    The filters and their arguments as JSON.
+        GET /health     Liveness check.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, workers: int | None = None,
+                 max_queue: int | None = None, max_bytes: int = 256 * 1024 * 1024):
+        """
+        This function starts the worker processes and binds the server.
+
+        Parameters:
+            host (str): Loopback address to listen on.
+            port (int): Port, 0 picks a free one (see url).
+            workers (int | None): Worker processes, one per CPU by default.
+            max_queue (int | None): Requests that may wait for a worker before
+                new ones are turned away with 503, four per worker by default.
+            max_bytes (int): Largest accepted upload.
+
+        Raises:
+            ValueError: If host is not a loopback address.
+        """
+        if host != "localhost" and not ipaddress.ip_address(host).is_loopback:
+            raise ValueError("The image service only listens on localhost.")
+        self.workers = workers or os.cpu_count() or 1
+        self.max_queue = self.workers * 4 if max_queue is None else max_queue
+        self.max_bytes = max_bytes
+        self.metrics = ServiceMetrics(self.workers)
+        # Spawned workers don't inherit the server's threads or locks
+        self._pool = ProcessPoolExecutor(self.workers, multiprocessing.get_context("spawn"), _init_worker)
+        for future in [self._pool.submit(_ready) for _ in range(self.workers)]:
+            future.result()
+        self._server = ThreadingHTTPServer((host, port), _ServiceHandler)
+        self._server.daemon_threads = True
+        self._server.service = self
+        self._thread = None
+
+    def __repr__(self) -> str:
+        """
+        This function return a readable summary of the service.
+
+        Returns:
+            str: A string showing the address and the number of workers.
+        """
+        return f"ImageService(url={self.url!r}, workers={self.workers})"
+
+    def __enter__(self) -> "ImageService":
+        """
+        This function serves in a background thread for the length of a with block.
+
+        Returns:
+            ImageService: This service.
+        """
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        """
+        This function stops the service at the end of a with block.
+        """
+        self.close()
+
+    @property
+    def url(self) -> str:
+        """
+        This function gives the base URL of the service.
+        """
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """
+        This function serves requests on a background thread and returns at once.
+        """
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+            self._thread.start()
+
+    def serve_forever(self):
+        """
+        This function serves requests on the calling thread until close() is called.
+        """
+        self._server.serve_forever()
+
+    def close(self):
+        """
+        This function stops serving and shuts the worker processes down.
+        """
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+        self._pool.shutdown(cancel_futures=True)
+
+    @staticmethod
+    def parse_ops(text: str) -> list[tuple]:
+        """
+        This function reads and checks a JSON list of edits.
+
+        Parameters:
+            text (str): JSON like [["blur", 3], ["grayscale"]].
+
+        Returns:
+            list[tuple]: (name, args) pairs with missing arguments filled in.
+
+        Raises:
+            ValueError: If the JSON is malformed or an edit is unknown or invalid.
+        """
+        try:
+            ops = json.loads(text)
+        except json.JSONDecodeError:
+            raise ValueError("Edits must be a JSON list.") from None
+        if not isinstance(ops, list):
+            raise ValueError("Edits must be a JSON list.")
+        steps = []
+        for op in ops:
+            if isinstance(op, str):
+                op = [op]
+            if not isinstance(op, list) or not op or not isinstance(op[0], str):
+                raise ValueError("Each edit must be a name followed by its arguments.")
+            spec = ImageProcessor.filters.get(op[0])
+            args = spec.complete(tuple(op[1:]))
+            spec.check(*args)
+            steps.append((spec.name, args))
+        return steps
+
+    def submit(self, block: shared_memory.SharedMemory, size: int, ops: list[tuple],
+               ext: str = ".png", options: EncoderOptions | None = None) -> tuple:
+        """
+        This function runs one job on a worker and waits for it.
+
+        Parameters:
+            block (SharedMemory): Block holding the encoded input.
+            size (int): Bytes of input in the block.
+            ops (list[tuple]): (name, args) pairs.
+            ext (str): Output format.
+            options (EncoderOptions | None): Encoder settings, defaults if None.
+
+        Returns:
+            tuple: (result block, result bytes, seconds spent in the worker).
+                   The caller closes and unlinks the result block.
+
+        Raises:
+            ValueError: If the worker could not process the image.
+        """
+        future = self._pool.submit(_process_job, block.name, size, ops, ext, options or EncoderOptions())
+        name, nbytes, work = future.result()
+        return shared_memory.SharedMemory(name), nbytes, work
+
+
+class _ServiceHandler(BaseHTTPRequestHandler):
+    """
+    This class answers the HTTP requests of an ImageService.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        """
+        This function keeps request logging quiet; the metrics endpoint reports the load.
+        """
+
+    def _send_json(self, status: int, body, headers: dict | None = None):
+        """
+        This function sends a JSON reply.
+
+        Parameters:
+            status (int): HTTP status code.
+            body: Object to send as JSON.
+            headers (dict | None): Extra headers.
+        """
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_error(self, status: int, message: str, headers: dict | None = None):
+        """
+        This function sends an error reply as JSON.
+
+        Parameters:
+            status (int): HTTP status code.
+            message (str): What went wrong.
+            headers (dict | None): Extra headers.
+        """
+        self._send_json(status, {"error": message}, headers)
+
+    def do_GET(self):
+        """
+        This function answers the read-only endpoints.
+        """
+        service = self.server.service
+        path = urlsplit(self.path).path
+        if path == "/metrics":
+            self._send_json(200, service.metrics.snapshot())
+        elif path == "/health":
+            self._send_json(200, {"status": "ok", "workers": service.workers})
+        elif path == "/filters":
+            self._send_json(200, [{
+                "name": spec.name,
+                "description": spec.description,
+                "params": [{"name": p.name, "kind": p.kind.__name__, "low": p.low,
+                            "high": p.high, "default": p.default} for p in spec.params],
+            } for spec in ImageProcessor.filters])
+        else:
+            self._send_error(404, "Not found.")
+
+    def do_POST(self):
+        """
+        This function runs the edits of a /process request on a worker.
+        """
+        service = self.server.service
+        url = urlsplit(self.path)
+        if url.path != "/process":
+            self._send_error(404, "Not found.")
+            return
+        try:
+            size = int(self.headers.get("Content-Length", ""))
+        except ValueError:
+            self._send_error(411, "Content-Length is required.")
+            return
+        if size > service.max_bytes:
+            self.close_connection = True
+            self._send_error(413, "Image is too large.")
+            return
+
+        query = parse_qs(url.query)
+        try:
+            ops = service.parse_ops(query.get("ops", ["[]"])[0])
+            ext = query.get("format", [".png"])[0].lower()
+            ext = ext if ext.startswith(".") else "." + ext
+            if ext not in CONTENT_TYPES:
+                raise ValueError(f"Unsupported output format: {ext}.")
+            if size <= 0:
+                raise ValueError("The request body must be an encoded image.")
+        except ValueError as e:
+            self.close_connection = True
+            self._send_error(400, str(e))
+            return
+
+        if not service.metrics.admit(service.max_queue):
+            self.close_connection = True
+            self._send_error(503, "Too many requests are waiting.", {"Retry-After": "1"})
+            return
+
+        start = time.perf_counter()
+        block = shared_memory.SharedMemory(create=True, size=size)
+        try:
+            # The upload goes straight from the socket into the shared block
+            read = 0
+            while read < size:
+                n = self.rfile.readinto(block.buf[read:size])
+                if not n:
+                    raise ConnectionError("The request body ended early.")
+                read += n
+            result, nbytes, work = service.submit(block, size, ops, ext)
+        except ValueError as e:
+            service.metrics.finish(time.perf_counter() - start, False)
+            self._send_error(400, str(e))
+            return
+        except ConnectionError:
+            service.metrics.finish(time.perf_counter() - start, False)
+            self.close_connection = True
+            return
+        except Exception as e:
+            service.metrics.finish(time.perf_counter() - start, False)
+            self._send_error(500, f"Processing failed: {e}")
+            return
+        finally:
+            block.close()
+            block.unlink()
+
+        try:
+            service.metrics.finish(time.perf_counter() - start, True, size, nbytes, work)
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPES[ext])
+            self.send_header("Content-Length", str(nbytes))
+            self.end_headers()
+            self.wfile.write(result.buf[:nbytes])
+        finally:
+            result.close()
+            result.unlink()
@@ -0,0 +1,102 @@
+import tempfile
+import numpy as np
+
+
+class MappedStore:
+    """
+    This class keeps large images in memory-mapped scratch files so the OS can page them.
+
+    Every array lives in an anonymous temporary file, which the OS deletes
+    as soon as the last array using it is gone.
+    """
+
+    BAND_BYTES = 64 * 1024 * 1024
+
+    def __init__(self, directory: str | None = None, min_bytes: int = 512 * 1024 * 1024):
+        """
+        This function creates a store that maps images of at least min_bytes.
+
+        Parameters:
+            directory (str | None): Scratch directory, the system temp dir if None.
+            min_bytes (int): Smaller images stay in normal memory.
+        """
+        self.directory = directory
+        self.min_bytes = min_bytes
+
+    def __repr__(self) -> str:
+        """
+        This function return a readable summary of the store settings.
+
+        Returns:
+            str: A string showing the scratch directory and the size threshold.
+        """
+        return f"MappedStore(directory={self.directory!r}, min_bytes={self.min_bytes})"
+
+    def wants(self, image: np.ndarray) -> bool:
+        """
+        This function checks if an image is big enough to be worked on through the store.
+
+        Parameters:
+            image (np.ndarray): Image to check.
+
+        Returns:
+            bool: True if the image should be mapped and processed in bands.
+        """
+        return image.nbytes >= self.min_bytes
+
+    def allocate(self, shape: tuple, dtype) -> np.ndarray:
+        """
+        This function creates an empty memory-mapped array.
+
+        Parameters:
+            shape (tuple): Array shape.
+            dtype: Array data type.
+
+        Returns:
+            np.memmap: The new array, backed by a scratch file.
+        """
+        scratch = tempfile.TemporaryFile(dir=self.directory)
+        return np.memmap(scratch, dtype=dtype, mode="w+", shape=shape)
+
+    def adopt(self, image: np.ndarray) -> np.ndarray:
+        """
+        This function moves an image into a scratch file if it is large enough.
+
+        Parameters:
+            image (np.ndarray): Image in normal memory.
+
+        Returns:
+            np.ndarray: The mapped copy, or the image itself if it is small.
+        """
+        if not self.wants(image) or isinstance(image, np.memmap):
+            return image
+        return self.copy(image)
+
+    def copy(self, image: np.ndarray) -> np.ndarray:
+        """
+        This function copies an image into a new scratch file, one band at a time.
+
+        Parameters:
+            image (np.ndarray): Image in memory or mapped.
+
+        Returns:
+            np.memmap: The mapped copy.
+        """
+        mapped = self.allocate(image.shape, image.dtype)
+        rows = self.band_rows(image)
+        for y in range(0, image.shape[0], rows):
+            mapped[y:y + rows] = image[y:y + rows]
+        return mapped
+
+    def band_rows(self, image: np.ndarray) -> int:
+        """
+        This function picks how many rows one band of work should hold.
+
+        Parameters:
+            image (np.ndarray): Image that will be processed in bands.
+
+        Returns:
+            int: Number of rows per band.
+        """
+        row_bytes = max(1, image.nbytes // max(1, image.shape[0]))
+        return max(1, self.BAND_BYTES // row_bytes)
@@ -0,0 +1,52 @@
+class MemoryBudget:
+    """
+    This class keeps the memory of all open documents under one shared limit.
+    """
+
+    def __init__(self, limit_bytes: int):
+        """
+        This function creates a budget with the given limit.
+
+        Parameters:
+            limit_bytes (int): Maximum resident bytes for all documents together.
+        """
+        self.limit_bytes = limit_bytes
+
+    def __repr__(self) -> str:
+        """
+        This function return a readable summary of the budget.
+
+        Returns:
+            str: A string showing the limit in megabytes.
+        """
+        return f"MemoryBudget(limit={self.limit_bytes // (1024 * 1024)} MB)"
+
+    def enforce(self, documents: list, active) -> int:
+        """
+        This function frees memory until the documents fit the budget.
+
+        Inactive documents are handled first, least recently used first:
+        their history is compressed, then they are suspended. Only after
+        that is the history of the active document compressed, keeping the
+        newest undo step decoded so a single undo stays instant.
+
+        Parameters:
+            documents (list[Document]): All open documents.
+            active (Document | None): The document being edited.
+
+        Returns:
+            int: Resident bytes after enforcing the budget.
+        """
+        total = sum(doc.nbytes() for doc in documents)
+        inactive = sorted((doc for doc in documents if doc is not active), key=lambda d: d.last_used)
+        steps = [(doc, doc.compress_history) for doc in inactive] + \
+                [(doc, doc.suspend) for doc in inactive]
+        if active is not None:
+            steps.append((active, lambda: active.compress_history(keep=1)))
+        for doc, step in steps:
+            if total <= self.limit_bytes:
+                break
+            before = doc.nbytes()
+            step()
+            total -= before - doc.nbytes()
+        return total
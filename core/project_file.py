@@ -0,0 +1,261 @@
+import json
+import os
+import threading
+import zipfile
+import numpy as np
+from core.document import EncodedState
+from core.history_manager import HistoryManager
+from core.image_processor import ImageProcessor
+from core.mapped_store import MappedStore
+from utils.models import ImageState, Rect, RegionPatch
+from utils.orientation import Orientation
+
+
+class StoredState:
+    """
+    This class is a history state whose pixels stay in a project file until they are needed.
+    """
+
+    # Guards reads against a project file being replaced by a save
+    _lock = threading.Lock()
+
+    def __init__(self, path: str, name: str, orientation: Orientation):
+        """
+        This function remembers where the pixels of the state are stored.
+
+        Parameters:
+            path (str): Project file path.
+            name (str): Name of the array entry inside the project file.
+            orientation (Orientation): Pending orientation of the state.
+        """
+        self._path = path
+        self._name = name
+        self._pixels = None
+        self.orientation = orientation
+
+    def __repr__(self) -> str:
+        """
+        This function return a readable summary of the stored state.
+
+        Returns:
+            str: A string showing the entry name and whether it was loaded.
+        """
+        return f"StoredState({self._name!r}, loaded={self._pixels is not None})"
+
+    @property
+    def pixels(self) -> np.ndarray:
+        """
+        This function loads the pixels on first use and keeps them.
+
+        Returns:
+            np.ndarray: The stored pixels.
+        """
+        if self._pixels is None:
+            self._pixels = self.read()
+        return self._pixels
+
+    @property
+    def is_loaded(self) -> bool:
+        """
+        This function checks if the pixels are already in memory.
+
+        Returns:
+            bool: True after the first access to pixels.
+        """
+        return self._pixels is not None
+
+    @property
+    def location(self) -> tuple[str, str]:
+        """
+        This function gives the project file and entry the pixels come from.
+
+        Returns:
+            tuple[str, str]: (path, name).
+        """
+        return self._path, self._name
+
+    def read(self) -> np.ndarray:
+        """
+        This function reads the pixels without keeping them in memory.
+
+        Returns:
+            np.ndarray: The stored pixels.
+        """
+        if self._pixels is not None:
+            return self._pixels
+        with self._lock, zipfile.ZipFile(self._path) as zf, zf.open(self._name) as f:
+            return np.load(f)
+
+    def relocate(self, path: str, name: str):
+        """
+        This function points the state at a new project file.
+
+        Parameters:
+            path (str): New project file path.
+            name (str): Entry name inside the new file.
+        """
+        self._path = path
+        self._name = name
+
+    def copy(self) -> "StoredState":
+        """
+        This function returns the state itself, since it is never changed.
+
+        Returns:
+            StoredState: This state.
+        """
+        return self
+
+
+class ProjectFile:
+    """
+    This class saves and opens editor sessions: original, current state, history and zoom.
+
+    A project is a zip container with a JSON manifest and one compressed
+    .npy entry per distinct pixel array. History states share arrays, so
+    each array is written once. On open only the original, the current
+    pixels and the small region patches are read; other history entries
+    are read when undo or redo reaches them.
+    """
+
+    VERSION = 1
+    MANIFEST = "project.json"
+
+    @classmethod
+    def save(cls, path: str, processor: ImageProcessor, history: tuple[list, list], zoom: int):
+        """
+        This function writes a project file.
+
+        The file is written next to the target and moved in place at the end,
+        so a crash never leaves a half-written project behind.
+
+        Parameters:
+            path (str): Output project path.
+            processor (ImageProcessor): Processor (or snapshot) with the image.
+            history (tuple[list, list]): Undo and redo entries from HistoryManager.entries().
+            zoom (int): Current zoom percentage.
+
+        Raises:
+            ValueError: If no image is loaded or the path is invalid.
+        """
+        if not path or not isinstance(path, str):
+            raise ValueError("Invalid file path.")
+        undo, redo = history
+        names = {}
+        lazy = []
+        tmp = path + ".tmp"
+
+        def put(zf, pixels):
+            # Arrays are shared between states, so write each one once
+            if isinstance(pixels, StoredState):
+                key = pixels.location
+            elif isinstance(pixels, EncodedState):
+                key = id(pixels.encoded)
+            else:
+                key = id(pixels)
+            if key not in names:
+                names[key] = f"arrays/{len(names)}.npy"
+                # Lazy and compressed states are read into a temporary, so saving doesn't keep their pixels
+                data = pixels.read() if isinstance(pixels, (StoredState, EncodedState)) else pixels
+                with zf.open(names[key], "w", force_zip64=True) as f:
+                    np.save(f, data)
+            return names[key]
+
+        def entry(zf, state, scale=None):
+            if isinstance(state, RegionPatch):
+                rect = state.rect
+                return {"pixels": put(zf, state.pixels), "rect": [rect.x, rect.y, rect.w, rect.h],
+                        "scale": scale}
+            if isinstance(state, StoredState) and not state.is_loaded:
+                lazy.append(state)
+                name = put(zf, state)
+            elif isinstance(state, EncodedState):
+                name = put(zf, state)
+            else:
+                name = put(zf, state.pixels)
+            item = {"pixels": name,
+                    "orientation": [state.orientation.turns, state.orientation.mirrored]}
+            if scale is not None:
+                item["scale"] = scale
+            return item
+
+        with zipfile.ZipFile(tmp, "w", zipfile.ZIP_DEFLATED, compresslevel=1) as zf:
+            manifest = {
+                "version": cls.VERSION,
+                "zoom": zoom,
+                "source_path": processor.source_path,
+                "original": put(zf, processor.original),
+                "current": entry(zf, processor.state),
+                "undo": [entry(zf, state, scale) for state, scale in undo],
+                "redo": [entry(zf, state, scale) for state, scale in redo],
+            }
+            zf.writestr(cls.MANIFEST, json.dumps(manifest))
+
+        moves = [(state, names[state.location]) for state in lazy]
+        with StoredState._lock:
+            os.replace(tmp, path)
+            for state, name in moves:
+                state.relocate(path, name)
+
+    @classmethod
+    def load(cls, path: str, store: MappedStore | None = None) -> tuple[ImageProcessor, HistoryManager, int]:
+        """
+        This function opens a project file.
+
+        Parameters:
+            path (str): Project file path.
+            store (MappedStore | None): Scratch store for the new processor.
+
+        Returns:
+            tuple: (ImageProcessor, HistoryManager, zoom percentage).
+
+        Raises:
+            ValueError: If the file is not a readable project.
+        """
+        try:
+            with zipfile.ZipFile(path) as zf:
+                manifest = json.loads(zf.read(cls.MANIFEST))
+                if not isinstance(manifest, dict) or manifest.get("version") != cls.VERSION:
+                    raise ValueError("Unsupported project version.")
+                original = cls._read(zf, manifest["original"])
+                current = manifest["current"]
+                pixels = original if current["pixels"] == manifest["original"] \
+                    else cls._read(zf, current["pixels"])
+                # Region patches are small, so they are read now
+                patches = {item["pixels"]: cls._read(zf, item["pixels"])
+                           for item in manifest["undo"] + manifest["redo"] if "rect" in item}
+
+            state = ImageState(pixels, Orientation(*current["orientation"]))
+            processor = ImageProcessor.from_state(original, state, manifest.get("source_path"), store)
+
+            loaded = {manifest["original"]: original, current["pixels"]: pixels}
+
+            def restore(item):
+                if "rect" in item:
+                    return RegionPatch(Rect(*item["rect"]), patches[item["pixels"]]), item["scale"]
+                orientation = Orientation(*item["orientation"])
+                if item["pixels"] in loaded:
+                    return ImageState(loaded[item["pixels"]], orientation), item["scale"]
+                return StoredState(path, item["pixels"], orientation), item["scale"]
+
+            history = HistoryManager()
+            history.replace([restore(i) for i in manifest["undo"]],
+                            [restore(i) for i in manifest["redo"]])
+            return processor, history, manifest["zoom"]
+        except (OSError, KeyError, TypeError, zipfile.BadZipFile, json.JSONDecodeError) as e:
+            raise ValueError(f"Unsupported or corrupted project file: {e}")
+
+    @staticmethod
+    def _read(zf: zipfile.ZipFile, name: str) -> np.ndarray:
+        """
+        This function reads one array entry.
+
+        Parameters:
+            zf (zipfile.ZipFile): The open project file.
+            name (str): Entry name.
+
+        Returns:
+            np.ndarray: The array.
+        """
+        with zf.open(name) as f:
+            return np.load(f)
@@ -0,0 +1,116 @@
+import hashlib
+import os
+import cv2
+import numpy as np
+
+
+class ThumbnailCache:
+    """
+    This class keeps small previews of image files on disk, keyed by path, size and modification time.
+
+    A changed file gets a new key, so stale thumbnails are never shown.
+    """
+
+    EXTENSIONS = {".png", ".jpg", ".jpeg", ".bmp", ".webp"}
+
+    def __init__(self, directory: str, size: int = 128):
+        """
+        This function creates a cache in the given directory.
+
+        Parameters:
+            directory (str): Where thumbnails are stored.
+            size (int): Longest side of a thumbnail in pixels.
+        """
+        self.directory = directory
+        self.size = size
+        os.makedirs(directory, exist_ok=True)
+
+    def __repr__(self) -> str:
+        """
+        This function return a readable summary of the cache.
+
+        Returns:
+            str: A string showing the directory and thumbnail size.
+        """
+        return f"ThumbnailCache({self.directory!r}, size={self.size})"
+
+    @classmethod
+    def list_images(cls, folder: str) -> list[str]:
+        """
+        This function lists the supported image files of a folder, sorted by name.
+
+        Parameters:
+            folder (str): Folder to scan.
+
+        Returns:
+            list[str]: Full paths of the images.
+        """
+        names = sorted(os.listdir(folder), key=str.lower)
+        return [os.path.join(folder, n) for n in names
+                if os.path.splitext(n)[1].lower() in cls.EXTENSIONS]
+
+    def cache_path(self, path: str) -> str:
+        """
+        This function gives the cache file for the current version of an image file.
+
+        Parameters:
+            path (str): Image file path.
+
+        Returns:
+            str: Path of the thumbnail file in the cache.
+        """
+        st = os.stat(path)
+        key = f"{os.path.abspath(path)}|{st.st_size}|{st.st_mtime_ns}|{self.size}"
+        return os.path.join(self.directory, hashlib.sha1(key.encode()).hexdigest() + ".png")
+
+    def load(self, path: str) -> np.ndarray | None:
+        """
+        This function reads a cached thumbnail if there is one.
+
+        Parameters:
+            path (str): Image file path.
+
+        Returns:
+            np.ndarray | None: The thumbnail, or None if it was not generated yet.
+        """
+        target = self.cache_path(path)
+        if not os.path.exists(target):
+            return None
+        return cv2.imread(target, cv2.IMREAD_UNCHANGED)
+
+    @staticmethod
+    def generate(path: str, target: str, size: int) -> str | None:
+        """
+        This function makes one thumbnail and writes it to the cache.
+
+        It runs in worker processes. JPEG and WebP files are first decoded
+        at 1/8 resolution, which skips most of the decoding work; the full
+        decode is only used when that is smaller than the thumbnail.
+
+        Parameters:
+            path (str): Image file path.
+            target (str): Cache file to write.
+            size (int): Longest side of the thumbnail.
+
+        Returns:
+            str | None: The cache file, or None if the image can't be read.
+        """
+        image = None
+        for flag in (cv2.IMREAD_REDUCED_COLOR_8, cv2.IMREAD_REDUCED_COLOR_4,
+                     cv2.IMREAD_REDUCED_COLOR_2, cv2.IMREAD_COLOR):
+            image = cv2.imread(path, flag)
+            if image is None or max(image.shape[:2]) >= size:
+                break
+        if image is None:
+            return None
+        h, w = image.shape[:2]
+        scale = size / max(h, w)
+        if scale < 1:
+            image = cv2.resize(image, (max(1, int(w * scale)), max(1, int(h * scale))),
+                               interpolation=cv2.INTER_AREA)
+        # Write then rename, so a reader never sees half a file
+        tmp = f"{os.path.splitext(target)[0]}.{os.getpid()}.tmp.png"
+        if not cv2.imwrite(tmp, image, [cv2.IMWRITE_PNG_COMPRESSION, 1]):
+            return None
+        os.replace(tmp, target)
+        return target
@@ -0,0 +1,113 @@
+import threading
+from collections import OrderedDict
+
+
+class TileCache:
+    """
+    This class keeps rendered display tiles, dropping the least recently used ones past a byte limit.
+
+    Tiles are keyed by (image version, display width, display height,
+    column, row), so a zoom level keeps its own tiles. The cache is shared
+    with a background thread that renders tiles ahead, so every access
+    holds a lock.
+    """
+
+    def __init__(self, max_bytes: int):
+        """
+        This function creates an empty cache.
+
+        Parameters:
+            max_bytes (int): Maximum bytes of tile pixels kept.
+        """
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._tiles = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """
+        This function gives the number of cached tiles.
+
+        Returns:
+            int: How many tiles are kept.
+        """
+        return len(self._tiles)
+
+    def __contains__(self, key) -> bool:
+        """
+        This function checks if a tile is cached, without marking it as used.
+
+        Parameters:
+            key (tuple): Tile key.
+
+        Returns:
+            bool: True if the tile is cached.
+        """
+        return key in self._tiles
+
+    def __repr__(self) -> str:
+        """
+        This function return a readable summary of the cache.
+
+        Returns:
+            str: A string showing the tile count and the memory used.
+        """
+        return f"TileCache(tiles={len(self)}, {self.nbytes // (1024 * 1024)}/{self.max_bytes // (1024 * 1024)} MB)"
+
+    def get(self, key):
+        """
+        This function gives a cached tile and marks it as recently used.
+
+        Parameters:
+            key (tuple): Tile key.
+
+        Returns:
+            np.ndarray | None: The tile, or None if it is not cached.
+        """
+        with self._lock:
+            tile = self._tiles.get(key)
+            if tile is not None:
+                self._tiles.move_to_end(key)
+            return tile
+
+    def put(self, key, tile, check=None):
+        """
+        This function stores a tile and drops the oldest tiles past the byte limit.
+
+        Parameters:
+            key (tuple): Tile key.
+            tile (np.ndarray): Rendered tile pixels.
+            check (callable | None): Called under the lock; the tile is only
+                stored if it returns True, so a stale tile from a background
+                render can be turned away.
+        """
+        with self._lock:
+            if check is not None and not check():
+                return
+            old = self._tiles.pop(key, None)
+            if old is not None:
+                self.nbytes -= old.nbytes
+            self._tiles[key] = tile
+            self.nbytes += tile.nbytes
+            while self.nbytes > self.max_bytes and len(self._tiles) > 1:
+                _, dropped = self._tiles.popitem(last=False)
+                self.nbytes -= dropped.nbytes
+
+    def discard(self, predicate):
+        """
+        This function drops every tile whose key matches a condition.
+
+        Parameters:
+            predicate (callable): Takes a key, returns True to drop the tile.
+        """
+        with self._lock:
+            for key in [k for k in self._tiles if predicate(k)]:
+                self.nbytes -= self._tiles.pop(key).nbytes
+
+    def clear(self):
+        """
+        This function drops every tile.
+        """
+        with self._lock:
+            self._tiles.clear()
+            self.nbytes = 0
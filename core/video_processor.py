@@ -0,0 +1,127 @@
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import cv2
+from core.image_processor import ImageProcessor
+from utils.models import ProcessingStats
+
+
+class VideoProcessor:
+    """
+    This class streams video files or numbered frame sequences through the editor's filters.
+
+    Frames are read, processed on a thread pool and written in their
+    original order. At most max_in_flight frames are held at any time, so
+    memory does not grow with the length of the clip.
+    """
+
+    def __init__(self, ops: list[tuple], workers: int | None = None, max_in_flight: int | None = None):
+        """
+        This function creates a processor for a list of edits.
+
+        Parameters:
+            ops (list[tuple]): Edits as (name, *args), e.g. [("grayscale",), ("blur", 3)].
+            workers (int | None): Threads that process frames.
+            max_in_flight (int | None): Frames read but not yet written, twice the workers by default.
+
+        Raises:
+            ValueError: If an edit is unknown.
+        """
+        for op in ops:
+            ImageProcessor.filters.get(op[0])
+        self.ops = [(op[0], tuple(op[1:])) for op in ops]
+        self.workers = workers or os.cpu_count() or 1
+        self.max_in_flight = max_in_flight or self.workers * 2
+        self._processor = ImageProcessor()
+
+    def __repr__(self) -> str:
+        """
+        This function return a readable summary of the processor.
+
+        Returns:
+            str: A string showing the edits and the number of workers.
+        """
+        names = ", ".join(name for name, _ in self.ops)
+        return f"VideoProcessor(ops=[{names}], workers={self.workers})"
+
+    def process_frame(self, frame, owned: bool = False):
+        """
+        This function applies every edit to one frame.
+
+        Neighbouring edits are fused, and point edits write straight into
+        frames that nothing else refers to.
+
+        Parameters:
+            frame (np.ndarray): Frame in BGR.
+            owned (bool): The frame may be overwritten, e.g. a freshly decoded one.
+
+        Returns:
+            np.ndarray: The edited frame.
+        """
+        return self._processor.apply_chain_to(frame, self.ops, owned)
+
+    def run(self, source: str, target: str, fourcc: str = "mp4v", on_progress=None) -> ProcessingStats:
+        """
+        This function processes a whole clip.
+
+        Parameters:
+            source (str): Video file, or a numbered sequence pattern like "frames/%04d.png".
+            target (str): Output video file, or a sequence pattern containing "%".
+            fourcc (str): Codec for video output.
+            on_progress (callable | None): Called with the running ProcessingStats after each written frame.
+
+        Returns:
+            ProcessingStats: Frames written and elapsed time.
+
+        Raises:
+            ValueError: If the source can't be opened or a frame can't be written.
+        """
+        capture = cv2.VideoCapture(source)
+        if not capture.isOpened():
+            raise ValueError("Unsupported or corrupted video source.")
+        fps = capture.get(cv2.CAP_PROP_FPS) or 25.0
+        writer = None
+        written = 0
+        start = time.perf_counter()
+
+        def write(frame):
+            nonlocal writer, written
+            if "%" in target:
+                if not cv2.imwrite(target % written, frame):
+                    raise ValueError("Failed to write frame.")
+            else:
+                if writer is None:
+                    # Size and color come from the first processed frame (rotate and grayscale change them)
+                    h, w = frame.shape[:2]
+                    writer = cv2.VideoWriter(target, cv2.VideoWriter_fourcc(*fourcc), fps, (w, h),
+                                             isColor=frame.ndim == 3)
+                    if not writer.isOpened():
+                        raise ValueError("Failed to open video output.")
+                writer.write(frame)
+            written += 1
+            if on_progress:
+                on_progress(ProcessingStats(written, time.perf_counter() - start))
+
+        pending = deque()
+        try:
+            with ThreadPoolExecutor(self.workers) as pool:
+                try:
+                    while True:
+                        ok, frame = capture.read()
+                        if not ok:
+                            break
+                        pending.append(pool.submit(self.process_frame, frame, True))
+                        if len(pending) >= self.max_in_flight:
+                            write(pending.popleft().result())
+                    while pending:
+                        write(pending.popleft().result())
+                except BaseException:
+                    # Leaving the with block waits for every queued frame, so they are dropped first
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    raise
+        finally:
+            capture.release()
+            if writer is not None:
+                writer.release()
+        return ProcessingStats(written, time.perf_counter() - start)
@@ -1,4 +1,5 @@
-from tkinter import Frame, Button, Label, LabelFrame, messagebox
+from tkinter import Frame, Button, Label, LabelFrame, Scale, HORIZONTAL, messagebox
+from core.filters import FILTERS
 from utils.base_component import BaseComponent, ClickableMixin
 from utils.constants import (
     BORDER_COLOR,
@@ -39,34 +40,22 @@ class ControlPanel(ClickableMixin, BaseComponent):
         frame.pack(side="right", fill="y", padx=10)
         frame.pack_propagate(False)
 
-        # ===== Create sections =====
-        basic_box = self._make_section(frame, "Basic Filters")
-        adjust_box = self._make_section(frame, "Adjustments")
-        transform_box = self._make_section(frame, "Transform")
-
-        # ===== BASIC FILTERS =====
-        self._fill_section(basic_box, [
-            ("Grayscale", controller.grayscale, "Converts image to black and white."),
-            ("Blur", controller.blur, "Smooths the image to reduce noise."),
-            ("Edge", controller.edge, "Detects edges in the image."),
-        ])
-
-        # ===== ADJUSTMENTS =====
-        self._fill_section(adjust_box, [
-            ("Bright -", lambda: controller.brightness(-30), "Decreases brightness."),
-            ("Bright +", lambda: controller.brightness(30), "Increases brightness."),
-            ("Contrast -", lambda: controller.contrast(0.8), "Reduces contrast."),
-            ("Contrast +", lambda: controller.contrast(1.2), "Increases contrast."),
-        ])
-
-        # ===== TRANSFORM =====
-        self._fill_section(transform_box, [
-            ("Rotate 90", lambda: controller.rotate(90), "Rotates image 90 degrees."),
-            ("Rotate 180", lambda: controller.rotate(180), "Rotates image upside down."),
-            ("Rotate 270", lambda: controller.rotate(270), "Rotates image 270 degrees."),
-            ("Flip H", lambda: controller.flip("horizontal"), "Flips image horizontally."),
-            ("Flip V", lambda: controller.flip("vertical"), "Flips image vertically."),
-        ])
+        # ===== Sections, buttons and sliders come from the filter registry =====
+        self.sliders = {}
+        self._kinds = {}
+        for title, specs in FILTERS.sections().items():
+            box = self._make_section(frame, title)
+            actions = []
+            for spec in specs:
+                # Presets without arguments ask for them when clicked
+                for label, args, description in spec.presets:
+                    actions.append((label, lambda n=spec.name, a=args or (): controller.run_filter(n, *a),
+                                    description))
+            self._fill_section(box, actions)
+            for spec in specs:
+                if spec.slider is not None:
+                    self._kinds[spec.name] = spec.params[0].kind
+                    self._add_slider(box, spec.label, spec.name, *spec.slider)
 
         # Reset button
         Button(frame, text="Reset",
@@ -120,3 +109,55 @@ class ControlPanel(ClickableMixin, BaseComponent):
                 command=lambda d=desc, t=text: messagebox.showinfo(t, d)
             )
             info_btn.pack(side="left")
+
+    # ===== Live preview slider =====
+    def _add_slider(self, box, text, op, low, high, step, neutral):
+        
+        """
+        This function adds a slider that previews an adjustment while dragging and commits it on release.
+
+        Parameters: box (tkinter.LabelFrame), text (str), op (str), low (float), high (float), step (float), neutral (float)
+        Returns: None
+        """
+        Label(box, text=text, bg=box["bg"]).pack(anchor="w", padx=4)
+        slider = Scale(box, from_=low, to=high, resolution=step, orient=HORIZONTAL,
+                       length=200, bg=box["bg"], highlightthickness=0,
+                       command=lambda v, o=op: self.controller.preview_adjustment(o, self._slider_value(o, v)))
+        slider.set(neutral)
+        slider.pack(fill="x", padx=4)
+        slider.bind("<ButtonRelease-1>",
+                    lambda e, o=op: self.controller.commit_adjustment(o, self._slider_value(o, self.sliders[o][0].get())))
+        self.sliders[op] = (slider, neutral)
+
+    def _slider_value(self, op, value):
+        
+        """
+        This function turns a raw slider value into the argument the adjustment expects.
+
+        Parameters: op (str), value (str | float)
+        Returns: int | float
+        """
+        if self._kinds[op] is int:
+            return int(float(value))
+        return round(float(value), 2)
+
+    def reset_sliders(self):
+        
+        """
+        This function moves every adjustment slider back to its neutral value.
+
+        Parameters: None
+        Returns: None
+        """
+        for slider, neutral in self.sliders.values():
+            slider.set(neutral)
+
+    def is_neutral(self, op, value):
+        
+        """
+        This function checks if an adjustment value leaves the image unchanged.
+
+        Parameters: op (str), value (int | float)
+        Returns: bool
+        """
+        return value == self.sliders[op][1]
@@ -0,0 +1,52 @@
+from tkinter import Frame, Button
+from utils.base_component import BaseComponent
+from utils.constants import BORDER_COLOR, BTN_BG, BTN_HOVER, PRIMARY_COLOR, TOOL_BAR_BG
+
+
+class DocumentTabs(BaseComponent):
+
+    """
+    This class is a strip of tabs for switching between open documents.
+
+    """
+
+    def __init__(self, parent, controller):
+
+        """
+        This function creates the empty tab strip.
+
+        Parameters: parent (tkinter.Widget), controller (object)
+        Returns: None
+
+        """
+        super().__init__(controller)
+        self.frame = Frame(parent, bg=TOOL_BAR_BG,
+                           highlightbackground=BORDER_COLOR, highlightthickness=1)
+        self.frame.pack(side="top", fill="x")
+
+    def refresh(self, names, active):
+
+        """
+        This function redraws one tab per document and highlights the active one.
+
+        Parameters: names (list[str]), active (int | None)
+        Returns: None
+
+        """
+        for child in self.frame.winfo_children():
+            child.destroy()
+
+        for i, name in enumerate(names):
+            tab = Frame(self.frame, bg=TOOL_BAR_BG)
+            tab.pack(side="left", padx=2, pady=2)
+
+            selected = i == active
+            Button(tab, text=name, relief="flat",
+                   bg=PRIMARY_COLOR if selected else BTN_BG,
+                   fg="white" if selected else "black",
+                   activebackground=BTN_HOVER, cursor="hand2",
+                   command=lambda i=i: self.controller.switch_document(i))\
+                .pack(side="left")
+            Button(tab, text="×", width=2, relief="flat", bg=BTN_BG, cursor="hand2",
+                   command=lambda i=i: self.controller.close_document(i))\
+                .pack(side="left")
@@ -1,11 +1,26 @@
+import os
 from tkinter import Frame, filedialog, messagebox, simpledialog
 from core.image_processor import ImageProcessor
-from core.history_manager import HistoryManager
+from core.document import Document
+from core.mapped_store import MappedStore
+from core.memory_budget import MemoryBudget
 from gui.image_canvas import ImageCanvas
 from gui.control_panel import ControlPanel
 from gui.status_bar import StatusBar
 from gui.menu_bar import MenuBar
 from gui.top_toolbar import TopToolbar
+from gui.document_tabs import DocumentTabs
+from utils.background import BackgroundRunner
+from utils.constants import (
+    HISTORY_THUMBNAIL_SIZE,
+    MEMORY_BUDGET_MB,
+    SCRATCH_DIR,
+    SCRATCH_MIN_MB,
+    THUMBNAIL_CACHE_DIR,
+    THUMBNAIL_SIZE,
+)
+from utils.models import EncoderOptions, RegionPatch
+from utils.startup_timer import StartupTimer
 
 
 class ImageEditorGUI:
@@ -15,34 +30,107 @@ class ImageEditorGUI:
     
     """
 
-    def __init__(self, root):
+    def __init__(self, root, timer=None):
         
         """
         This is to initialize editor, UI layout, and core components.
         
-        Parameters: root (tkinter.Tk)
+        Parameters: root (tkinter.Tk), timer (StartupTimer | None), records how long each panel takes to build
         Returns: None
         
         """
         
-        self.processor = ImageProcessor()
-        self.history = HistoryManager()
-
-        MenuBar(root, self)
+        self.root = root
+        self.store = MappedStore(SCRATCH_DIR, SCRATCH_MIN_MB * 1024 * 1024)
+        self.budget = MemoryBudget(MEMORY_BUDGET_MB * 1024 * 1024)
+        self.documents = []
+        # Stands in while no document is open, so the editor always has a processor
+        self.document = Document(ImageProcessor(self.store))
+        self._clock = 0
+        self.thumbnails = None
+        self.refiner = BackgroundRunner(root)
+        self.saver = BackgroundRunner(root)
+        self.encoder_options = EncoderOptions()
+        self._preview_base = None
+        self._preview_last = None
+        self._previewing = False
+        self._refine_source = None
+        # Committed slider values still running on the full image, oldest first
+        self._pending_adjustments = []
+        self.histogram = None
+        self.history_panel = None
+        self._hovering = False
+
+        timer = timer or StartupTimer()
+
+        with timer.phase("menu bar"):
+            MenuBar(root, self)
 
         main = Frame(root)
         main.pack(fill="both", expand=True)
         
-        self.top_toolbar  = TopToolbar(main,self)
+        with timer.phase("toolbar and tabs"):
+            self.top_toolbar  = TopToolbar(main,self)
+            self.tabs = DocumentTabs(main, self)
 
-        self.canvas = ImageCanvas(main)
-        self.canvas.on_upload_click = self.open_file_dialog
+        with timer.phase("canvas"):
+            self.canvas = ImageCanvas(main)
+            self.canvas.on_upload_click = self.open_file_dialog
 
-        self.controls = ControlPanel(main, self)
-        self.status = StatusBar(root)
+        with timer.phase("control panel"):
+            self.controls = ControlPanel(main, self)
+            self.status = StatusBar(root)
 
         self.current_scale = 100
 
+    @property
+    def processor(self):
+        
+        """
+        This function gives the image processor of the active document.
+
+        Parameters: None
+        Returns: ImageProcessor
+        
+        """
+        return self.document.processor
+
+    @property
+    def history(self):
+        
+        """
+        This function gives the history of the active document.
+
+        Parameters: None
+        Returns: HistoryManager
+        
+        """
+        return self.document.history
+
+    @property
+    def current_scale(self):
+        
+        """
+        This function gives the zoom percentage of the active document.
+
+        Parameters: None
+        Returns: int
+        
+        """
+        return self.document.zoom
+
+    @current_scale.setter
+    def current_scale(self, value):
+        
+        """
+        This function sets the zoom percentage of the active document.
+
+        Parameters: value (int)
+        Returns: None
+        
+        """
+        self.document.zoom = value
+
     def open_file_dialog(self):
         
         """
@@ -59,29 +147,355 @@ class ImageEditorGUI:
     def load_image(self, path):
         
         """
-        This function loads an image, reset the history, and refresh the UI.
+        This function loads an image into a new document tab and shows it.
 
         Parameters: path (str)
         Returns: None
         
         """
-        self.processor.load(path)
-        self.history.clear()
-        self.current_scale = 100
-        self.canvas.set_zoom(100)
-        self.top_toolbar.set_zoom(100)
-        self.update_ui()
+        self.finish_adjustments()
+        self.add_document(Document.from_file(path, self.store))
         
-    def save_image(self, path):
+    def save_image(self, path, on_done=None):
         
         """
-        This function saves current image to disk.
+        This function saves current image to disk on a background thread.
+
+        The encoder works on a snapshot, so editing can go on while the file is written.
+
+        Parameters: path (str), on_done (callable | None), called after the file is written
+        Returns: None
+        
+        """
+        self.finish_adjustments()
+        snapshot = self.processor.snapshot()
+        name = os.path.basename(path)
+        self.status.update(f"Saving {name}… ({len(self.saver) + 1} in progress)")
+        self.saver.submit(snapshot.save, path, self.encoder_options,
+                          on_done=lambda _: self._on_saved(name, on_done),
+                          on_error=lambda e: self._on_save_failed(name, e))
+
+    def export_set(self, base, targets, on_done=None):
+        
+        """
+        This function writes the current image at several widths and formats on a background thread.
+
+        Parameters: base (str), path without extension, targets (list[ExportTarget]),
+                    on_done (callable | None), called with the written paths
+        Returns: None
+        
+        """
+        if not self.validate_image_available():
+            return
+        self.finish_adjustments()
+        snapshot = self.processor.snapshot()
+        name = f"{os.path.basename(base)} ({len(targets)} files)"
+        self.status.update(f"Exporting {name}… ({len(self.saver) + 1} in progress)")
+        self.saver.submit(snapshot.export_set, targets, base, self.encoder_options,
+                          on_done=lambda paths: self._on_saved(name, on_done and (lambda: on_done(paths))),
+                          on_error=lambda e: self._on_save_failed(name, e))
+
+    def save_project(self, path):
+        
+        """
+        This function saves the image, history and zoom to a project file in the background.
+
+        Parameters: path (str)
+        Returns: None
+        
+        """
+        if not self.validate_image_available():
+            return
+        from core.project_file import ProjectFile
+        self.finish_adjustments()
+        name = os.path.basename(path)
+        self.status.update(f"Saving {name}… ({len(self.saver) + 1} in progress)")
+        self.saver.submit(ProjectFile.save, path, self.processor.snapshot(),
+                          self.history.entries(), self.current_scale,
+                          on_done=lambda _: self._on_saved(name, None),
+                          on_error=lambda e: self._on_save_failed(name, e))
+
+    def load_project(self, path):
+        
+        """
+        This function opens a project file and restores its image, history and zoom.
 
         Parameters: path (str)
         Returns: None
         
         """
-        self.processor.save(path)
+        from core.project_file import ProjectFile
+        self.finish_adjustments()
+        processor, history, zoom = ProjectFile.load(path, self.store)
+        self.add_document(Document(processor, history, zoom, os.path.basename(path)))
+
+    def browse_folder(self, folder):
+        
+        """
+        This function opens a thumbnail browser for a folder; clicking a thumbnail opens the image.
+
+        Parameters: folder (str)
+        Returns: None
+        
+        """
+        # Secondary windows and their modules load on first use, keeping startup short
+        from core.thumbnail_cache import ThumbnailCache
+        from gui.folder_browser import FolderBrowser
+        if self.thumbnails is None:
+            self.thumbnails = ThumbnailCache(THUMBNAIL_CACHE_DIR, THUMBNAIL_SIZE)
+        FolderBrowser(self.root, self, folder, self.thumbnails)
+
+    def add_document(self, document):
+        
+        """
+        This function adds an open document as a new tab and switches to it.
+
+        Parameters: document (Document)
+        Returns: None
+        
+        """
+        self.documents.append(document)
+        self.switch_document(len(self.documents) - 1)
+
+    def switch_document(self, index):
+        
+        """
+        This function makes another document active.
+
+        The document left behind stays decoded, so switching back is instant;
+        enforce_budget() suspends the least recently used documents only when
+        the open images no longer fit the memory budget.
+
+        Parameters: index (int)
+        Returns: None
+        
+        """
+        self.finish_adjustments()
+        document = self.documents[index]
+        if document is not self.document:
+            document.activate()
+            self.document = document
+        self._clock += 1
+        document.last_used = self._clock
+        self.canvas.set_zoom(document.zoom)
+        self.top_toolbar.set_zoom(document.zoom)
+        self.tabs.refresh([d.name for d in self.documents], index)
+        self.update_ui()
+        self.enforce_budget()
+
+    def close_document(self, index):
+        
+        """
+        This function closes a document tab and shows a neighbouring one.
+
+        Parameters: index (int)
+        Returns: None
+        
+        """
+        self.finish_adjustments()
+        document = self.documents.pop(index)
+        if document is not self.document:
+            self.tabs.refresh([d.name for d in self.documents], self.documents.index(self.document))
+            return
+        if self.documents:
+            self.switch_document(min(index, len(self.documents) - 1))
+            return
+        self.document = Document(ImageProcessor(self.store))
+        self.tabs.refresh([], None)
+        self.canvas.update(None)
+        self._refresh_histogram()
+        self._refresh_timeline()
+        self.status.update("No image loaded")
+
+    def enforce_budget(self):
+        
+        """
+        This function keeps all open documents within the shared memory budget.
+
+        Parameters: None
+        Returns: None
+        
+        """
+        self.budget.enforce(self.documents, self.document)
+
+    def _on_saved(self, name, on_done):
+        
+        """
+        This function reports a finished background save.
+
+        Parameters: name (str), on_done (callable | None)
+        Returns: None
+        
+        """
+        self.status.update(f"Saved {name}" + (f" | {len(self.saver)} still saving" if self.saver else ""))
+        if on_done:
+            on_done()
+
+    def _on_save_failed(self, name, error):
+        
+        """
+        This function reports a failed background save.
+
+        Parameters: name (str), error (Exception)
+        Returns: None
+        
+        """
+        self.status.update(f"Saving {name} failed")
+        messagebox.showerror("Error", str(error))
+
+    def configure_export(self):
+        
+        """
+        This function opens the export settings dialog and keeps the chosen encoder settings.
+
+        Parameters: None
+        Returns: None
+        
+        """
+        from gui.export_settings_dialog import ExportSettingsDialog
+        dialog = ExportSettingsDialog(self.root, self.encoder_options)
+        if dialog.result:
+            self.encoder_options = dialog.result
+
+    def show_histogram(self):
+        
+        """
+        This function opens the histogram window, or brings it to the front if it is open.
+
+        Parameters: None
+        Returns: None
+        
+        """
+        from gui.histogram_panel import HistogramPanel
+        if self.histogram is not None and self.histogram.is_open:
+            self.histogram.window.lift()
+            return
+        self.histogram = HistogramPanel(self.root, self)
+        self._refresh_histogram()
+
+    def show_history(self):
+        
+        """
+        This function opens the history timeline window, or brings it to the front if it is open.
+
+        Parameters: None
+        Returns: None
+        
+        """
+        from gui.history_panel import HistoryPanel
+        if self.history_panel is not None and self.history_panel.is_open:
+            self.history_panel.window.lift()
+            return
+        self.history_panel = HistoryPanel(self.root, self)
+        self._refresh_timeline()
+
+    def _refresh_timeline(self):
+        
+        """
+        This function keeps a thumbnail of the current state and updates the history window if it is open.
+
+        A state gets its thumbnail the first time it is shown; stepping back to it later reuses it.
+
+        Parameters: None
+        Returns: None
+        
+        """
+        if self.processor._original is not None and self.history.thumbnail() is None:
+            w, h = self.processor.size
+            size = self.processor.size * min(1.0, HISTORY_THUMBNAIL_SIZE / max(w, h))
+            self.history.set_thumbnail(self.processor.preview_buffer(size))
+        if self.history_panel is None or not self.history_panel.is_open:
+            return
+        if self.processor._original is None:
+            self.history_panel.refresh(0, [])
+        else:
+            self.history_panel.refresh(*self.history.timeline())
+
+    def preview_history(self, position):
+        
+        """
+        This function shows the thumbnail of a history state on the canvas while it is hovered.
+
+        Parameters: position (int | None), timeline position, None ends the preview
+        Returns: None
+        
+        """
+        if position is None:
+            if self._hovering:
+                self._hovering = False
+                self.canvas.show_preview(None)
+            return
+        thumbnail = self.history.thumbnail(position)
+        # A slider preview on screen is left alone
+        if thumbnail is None or self._preview_base is not None:
+            return
+        self._hovering = True
+        self.canvas.show_preview(thumbnail)
+
+    def jump_to_history(self, position):
+        
+        """
+        This function makes a state of the history timeline current in one step.
+
+        Only region patches are drawn by their rectangles; once a whole state
+        was restored on the way the full image is drawn again.
+
+        Parameters: position (int), timeline position
+        Returns: None
+        
+        """
+        if not self.validate_image_available():
+            return
+        self.preview_history(None)
+        self.finish_adjustments()
+        moved = self.document.jump(position, self.current_scale)
+        if moved is None:
+            return
+        scale, rects = moved
+        if rects is not None and scale == self.current_scale:
+            # Only patches were passed, so only their rectangles changed
+            for rect in rects:
+                self.canvas.update_region(self.processor.pixels, rect)
+            self._refresh_histogram(edited=True)
+            self._refresh_timeline()
+            return
+        self.current_scale = scale
+        self.top_toolbar.set_zoom(scale)
+        self.canvas.set_zoom(scale)
+        self.update_ui()
+
+    def toggle_compare(self):
+        
+        """
+        This function turns the before/after split view on or off.
+
+        The original is shown left of the line and the current image right of
+        it, at the same zoom; dragging on the image moves the line.
+
+        Parameters: None
+        Returns: None
+        
+        """
+        if self.canvas.before_image is not None:
+            self.canvas.set_compare(None)
+        elif self.processor._original is not None:
+            self.canvas.set_compare(self.processor.original)
+
+    def _refresh_histogram(self, preview=None, edited=False):
+        
+        """
+        This function updates the histogram window, if it is open, for the image and any pending adjustments.
+
+        Parameters: preview (tuple | None), (name, value) of a slider being dragged,
+                    edited (bool), the pixels were changed in place
+        Returns: None
+        
+        """
+        if self.histogram is None or not self.histogram.is_open:
+            return
+        image = self.processor.pixels if self.processor._original is not None else None
+        adjustments = self._pending_adjustments + ([preview] if preview else [])
+        self.histogram.refresh(image, adjustments, edited)
 
     def update_ui(self):
         
@@ -92,9 +506,13 @@ class ImageEditorGUI:
         Returns: None
         
         """
-        img = self.processor.image
-        self.canvas.update(img)
-        h, w = img.shape[:2]
+        if self.canvas.before_image is not None:
+            # Each tab compares against its own original
+            self.canvas.set_compare(self.processor.original, render=False)
+        self.canvas.update(self.processor.pixels, self.processor.orientation)
+        self._refresh_histogram()
+        self._refresh_timeline()
+        w, h = self.processor.size
         self.status.update(f"Image Loaded | {w} x {h} | Zoom: {self.current_scale}%")
 
     def apply(self, func, *args):
@@ -107,9 +525,65 @@ class ImageEditorGUI:
         
         """
         # Polymorphism: apply() accepts any callable with different behaviors ✅
-        self.history.save(self.processor.image, self.current_scale)
+        self.finish_adjustments()
+        self.history.save(self.processor.state, self.current_scale)
         func(*args)
         self.update_ui()
+        self.enforce_budget()
+
+    def run_filter(self, name, *args):
+        
+        """
+        This function runs a registered filter, asking for any missing arguments.
+
+        Tileable filters run only on the selection when there is one, and only its pixels go in the history.
+
+        Parameters: name (str), *args (tuple)
+        Returns: None
+        
+        """
+        if not self.validate_image_available():
+            return
+        spec = self.processor.filters.get(name)
+        args = self._ask_params(spec, args)
+        if args is None:
+            return
+        region = self.canvas.selection
+        if region is None or not spec.regional:
+            self.apply(self.processor.apply_filter, name, *args)
+            return
+        self.finish_adjustments()
+        patch = self.processor.edit_region(region, name, *args)
+        self.history.save(patch, self.current_scale)
+        self.canvas.update_region(self.processor.pixels, patch.rect)
+        self._refresh_histogram(edited=True)
+        self._refresh_timeline()
+        self.enforce_budget()
+
+    def _ask_params(self, spec, args):
+        
+        """
+        This function prompts for the arguments of a filter that were not given and have no default.
+
+        Parameters: spec (Filter), args (tuple)
+        Returns: tuple | None, None if a prompt was cancelled
+        
+        """
+        args = list(args)
+        for param in spec.params[len(args):]:
+            if param.default is not None:
+                break
+            prompt = f"{param.label} ({param.low}–{param.high}):" if param.low is not None else f"{param.label}:"
+            if param.kind is int:
+                value = simpledialog.askinteger(spec.label, prompt, minvalue=param.low, maxvalue=param.high)
+            elif param.kind is float:
+                value = simpledialog.askfloat(spec.label, prompt, minvalue=param.low, maxvalue=param.high)
+            else:
+                value = simpledialog.askstring(spec.label, prompt)
+            if value is None:
+                return None
+            args.append(value)
+        return tuple(args)
 
     # delegates
     def grayscale(self): 
@@ -125,7 +599,7 @@ class ImageEditorGUI:
         if not self.validate_image_available():
             return
         
-        self.apply(self.processor.grayscale)
+        self.run_filter("grayscale")
 
     def edge(self): 
         
@@ -140,7 +614,7 @@ class ImageEditorGUI:
         if not self.validate_image_available():
             return
         
-        self.apply(self.processor.edge)
+        self.run_filter("edge")
         
     def brightness(self, v): 
         
@@ -155,7 +629,7 @@ class ImageEditorGUI:
         if not self.validate_image_available():
             return
         
-        self.apply(self.processor.brightness, v)
+        self.run_filter("brightness", v)
         
     def contrast(self, a):
         
@@ -170,7 +644,7 @@ class ImageEditorGUI:
         if not self.validate_image_available():
             return
         
-        self.apply(self.processor.contrast, a)
+        self.run_filter("contrast", a)
         
     def rotate(self, a): 
         
@@ -185,7 +659,7 @@ class ImageEditorGUI:
         if not self.validate_image_available():
             return
         
-        self.apply(self.processor.rotate, a)
+        self.run_filter("rotate", a)
         
     def flip(self, m): 
         
@@ -201,7 +675,7 @@ class ImageEditorGUI:
         if not self.validate_image_available():
             return
         
-        self.apply(self.processor.flip, m)
+        self.run_filter("flip", m)
 
     def resize(self, percent: int):
         
@@ -216,7 +690,8 @@ class ImageEditorGUI:
         if not self.validate_image_available():
             return
         
-        self.history.save(self.processor.image, self.current_scale)
+        self.finish_adjustments()
+        self.history.save(self.processor.state, self.current_scale)
         self.current_scale = percent        
         self.canvas.set_zoom(percent)         
         # Sync sliders
@@ -237,14 +712,13 @@ class ImageEditorGUI:
         if not self.validate_image_available():
             return
         
-        state = self.history.undo(self.processor.image, self.current_scale)
+        self.finish_adjustments()
+        entry = self.history.peek_undo()
+        if entry is None:
+            return
+        state = self.history.undo(self._step_away(entry), self.current_scale)
         if state:
-            image, scale = state
-            self.processor._current = image
-            self.current_scale = scale
-            self.top_toolbar.set_zoom(scale)
-            self.canvas.set_zoom(scale)
-            self.update_ui()
+            self._show_step(*state)
 
     def redo(self):
         
@@ -257,15 +731,54 @@ class ImageEditorGUI:
         """
         if not self.validate_image_available():
             return
-        state = self.history.redo(self.processor.image, self.current_scale)
+        self.finish_adjustments()
+        entry = self.history.peek_redo()
+        if entry is None:
+            return
+        state = self.history.redo(self._step_away(entry), self.current_scale)
         if state:
-            image, scale = state
-            self.processor._current = image
-            self.current_scale = scale
-            self.top_toolbar.set_zoom(scale)
-            self.canvas.set_zoom(scale)
-            self.update_ui()
+            self._show_step(*state)
             
+    def _show_step(self, image, scale):
+        
+        """
+        This function shows the image after an undo or redo step.
+
+        A region patch at the same zoom only redraws the area it covers.
+
+        Parameters: image (ImageState | RegionPatch), scale (int)
+        Returns: None
+        
+        """
+        if isinstance(image, RegionPatch):
+            if scale == self.current_scale:
+                self.canvas.update_region(self.processor.pixels, image.rect)
+                self._refresh_histogram(edited=True)
+                self._refresh_timeline()
+                return
+        else:
+            self.processor.restore(image)
+        self.current_scale = scale
+        self.top_toolbar.set_zoom(scale)
+        self.canvas.set_zoom(scale)
+        self.update_ui()
+
+    def _step_away(self, entry):
+        
+        """
+        This function gives what the history keeps of the current image when stepping to an entry.
+
+        A region patch is swapped in place and its replaced pixels are kept; any other entry keeps the whole state.
+
+        Parameters: entry (tuple), the (state, scale) entry being stepped to
+        Returns: ImageState | RegionPatch
+        
+        """
+        state, _ = entry
+        if isinstance(state, RegionPatch):
+            return self.processor.swap_region(state)
+        return self.processor.state
+
     def reset_image(self):
         
         """
@@ -277,6 +790,7 @@ class ImageEditorGUI:
         """
         if not self.validate_image_available():
             return
+        self.finish_adjustments()
         self.processor.reset()   
         self.history.clear()        
         self.current_scale = 100     
@@ -295,11 +809,7 @@ class ImageEditorGUI:
         
         """
         
-        if not self.validate_image_available():
-            return
-        value = simpledialog.askinteger("Blur", "Intensity (1–20):", minvalue=1, maxvalue=20)
-        if value:
-            self.apply(self.processor.blur, value)
+        self.run_filter("blur")
     
     def validate_image_available(self):
         
@@ -314,5 +824,121 @@ class ImageEditorGUI:
             messagebox.showinfo("No image", "Load an image first.")
             return False
         return True
+
+    def preview_adjustment(self, op, value):
         
+        """
+        This function shows an adjustment live on a display-sized copy while a slider is dragged.
+
+        Parameters: op (str), value (int | float)
+        Returns: None
         
+        """
+        if self.processor._original is None:
+            return
+        if self.controls.is_neutral(op, value):
+            if not self.refiner:
+                self._clear_preview()
+            return
+        if self._preview_base is None:
+            size = self.canvas.display_size(self.processor.size)
+            self._preview_base = self.processor.preview_buffer(size)
+        self._previewing = True
+        self._preview_last = self.processor.apply_to(self._preview_base, op, value)
+        self.canvas.show_preview(self._preview_last)
+        self._refresh_histogram((op, value))
+
+    def commit_adjustment(self, op, value):
+        
+        """
+        This function runs the released slider value on the full image in the background.
+
+        Only the final value is recorded in the history once the full-size result is ready.
+
+        Parameters: op (str), value (int | float)
+        Returns: None
+        
+        """
+        if self.processor._original is None or self.controls.is_neutral(op, value):
+            return
+        if not self.refiner:
+            # Adjustments commute with rotation and flipping, so they run on the stored pixels
+            self._refine_source = self.processor.pixels
+        # Later drags continue from the preview of this value until the full result lands
+        self._preview_base = self._preview_last
+        self._previewing = False
+        self._pending_adjustments.append((op, value))
+        self.refiner.submit(self._refine, op, value,
+                            on_done=self._on_refined,
+                            on_error=self._on_refine_failed)
+        self.controls.reset_sliders()
+
+    def finish_adjustments(self):
+        
+        """
+        This function waits for pending slider results so other edits see the latest image.
+
+        Parameters: None
+        Returns: None
+        
+        """
+        self.refiner.drain()
+        if self._preview_base is not None:
+            self._clear_preview()
+
+    def _refine(self, op, value):
+        
+        """
+        This function applies one committed adjustment to the full image on the worker thread.
+
+        Parameters: op (str), value (int | float)
+        Returns: numpy.ndarray
+        
+        """
+        image = self.processor.apply_to(self._refine_source, op, value)
+        self._refine_source = image
+        return image
+
+    def _on_refined(self, image):
+        
+        """
+        This function stores a finished full-size adjustment in the history and shows it.
+
+        Parameters: image (numpy.ndarray)
+        Returns: None
+        
+        """
+        self.history.save(self.processor.state, self.current_scale)
+        self.processor._current = image
+        self._pending_adjustments.pop(0)
+        if not self.refiner and not self._previewing:
+            self._clear_preview()
+        self.update_ui()
+        self.enforce_budget()
+
+    def _on_refine_failed(self, error):
+        
+        """
+        This function reports a committed adjustment that could not be applied to the full image.
+
+        Parameters: error (Exception)
+        Returns: None
+        
+        """
+        self._pending_adjustments.pop(0)
+        messagebox.showerror("Error", str(error))
+
+    def _clear_preview(self):
+        
+        """
+        This function drops the preview buffers and goes back to drawing the current image.
+
+        Parameters: None
+        Returns: None
+        
+        """
+        self._preview_base = None
+        self._preview_last = None
+        self._previewing = False
+        self.canvas.show_preview(None)
+        self._refresh_histogram()
@@ -0,0 +1,71 @@
+from tkinter import BooleanVar, Checkbutton, Label, Scale, HORIZONTAL, simpledialog
+from utils.models import EncoderOptions
+
+
+class ExportSettingsDialog(simpledialog.Dialog):
+
+    """
+    This class is a dialog that lets the user trade encoding speed against file size.
+
+    """
+
+    def __init__(self, parent, options: EncoderOptions):
+
+        """
+        This function opens the dialog with the given settings filled in.
+
+        Parameters: parent (tkinter.Widget), options (EncoderOptions)
+        Returns: None
+
+        """
+        self.options = options
+        super().__init__(parent, title="Export Settings")
+
+    def body(self, master):
+
+        """
+        This function builds the sliders and check box of the dialog.
+
+        Parameters: master (tkinter.Frame)
+        Returns: tkinter.Widget, the widget that gets focus first
+
+        """
+        self.png = self._add_scale(master, 0, "PNG compression (0 fast – 9 small)", 0, 9,
+                                   self.options.png_compression)
+        self.jpeg = self._add_scale(master, 1, "JPEG quality", 1, 100, self.options.jpeg_quality)
+        self.progressive = BooleanVar(value=self.options.jpeg_progressive)
+        Checkbutton(master, text="Progressive JPEG", variable=self.progressive)\
+            .grid(row=2, column=1, sticky="w")
+        self.webp = self._add_scale(master, 3, "WebP quality", 1, 100, self.options.webp_quality)
+        return self.png
+
+    def _add_scale(self, master, row, text, low, high, value):
+
+        """
+        This function adds one labeled slider row.
+
+        Parameters: master (tkinter.Frame), row (int), text (str), low (int), high (int), value (int)
+        Returns: tkinter.Scale
+
+        """
+        Label(master, text=text).grid(row=row, column=0, sticky="w", padx=5)
+        scale = Scale(master, from_=low, to=high, orient=HORIZONTAL, length=180)
+        scale.set(value)
+        scale.grid(row=row, column=1, padx=5)
+        return scale
+
+    def apply(self):
+
+        """
+        This function stores the chosen settings when the user presses OK.
+
+        Parameters: None
+        Returns: None
+
+        """
+        self.result = EncoderOptions(
+            png_compression=self.png.get(),
+            jpeg_quality=self.jpeg.get(),
+            jpeg_progressive=self.progressive.get(),
+            webp_quality=self.webp.get(),
+        )
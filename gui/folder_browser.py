@@ -0,0 +1,255 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from tkinter import Canvas, Scrollbar, Toplevel
+import cv2
+from core.thumbnail_cache import ThumbnailCache
+from utils.background import BackgroundRunner
+from utils.base_component import BaseComponent
+from utils.constants import DARK_BG, SUBTLE_TEXT, TEXT_FONT
+from utils.image_display import ImageDisplay
+
+
+class FolderBrowser(BaseComponent):
+
+    """
+    This class is a window showing a thumbnail grid of every image in a folder.
+
+    """
+
+    LABEL_HEIGHT = 24
+    PADDING = 10
+    PREFETCH = 8
+    PREFETCH_MS = 30
+
+    def __init__(self, root, controller, folder, cache: ThumbnailCache):
+
+        """
+        This function opens the browser window and starts loading the visible thumbnails.
+
+        Parameters: root (tkinter.Tk), controller (object), folder (str), cache (ThumbnailCache)
+        Returns: None
+
+        """
+        super().__init__(controller)
+        self.cache = cache
+        self.paths = ThumbnailCache.list_images(folder)
+        self.cell_w = cache.size + self.PADDING
+        self.cell_h = cache.size + self.LABEL_HEIGHT + self.PADDING
+        self.requested = set()
+        self.photos = {}
+        self._cursor = 0
+        self._after_id = None
+
+        self.window = Toplevel(root)
+        self.window.title(f"{folder} ({len(self.paths)} images)")
+        self.window.geometry("720x520")
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+        scrollbar = Scrollbar(self.window, orient="vertical", command=self._on_scrollbar)
+        scrollbar.pack(side="right", fill="y")
+        self.canvas = Canvas(self.window, bg=DARK_BG, highlightthickness=0,
+                             yscrollcommand=scrollbar.set)
+        self.canvas.pack(side="left", fill="both", expand=True)
+        self.canvas.bind("<Configure>", lambda e: self._layout())
+        self.canvas.bind("<MouseWheel>", self._on_wheel)
+
+        # Thumbnails are made in worker processes, decoding is CPU bound. Spawned,
+        # since forking the threaded Tk process can copy held locks into the workers
+        workers = max(1, (os.cpu_count() or 2) - 1)
+        executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        self.runner = BackgroundRunner(self.window, executor=executor)
+
+    def close(self):
+
+        """
+        This function stops the workers and closes the window.
+
+        Parameters: None
+        Returns: None
+
+        """
+        if self._after_id is not None:
+            self.window.after_cancel(self._after_id)
+        self.runner.shutdown()
+        self.window.destroy()
+
+    def _columns(self):
+
+        """
+        This function gives how many thumbnails fit in one row.
+
+        Parameters: None
+        Returns: int
+
+        """
+        return max(1, self.canvas.winfo_width() // self.cell_w)
+
+    def _cell_origin(self, index):
+
+        """
+        This function gives the top-left corner of a thumbnail cell.
+
+        Parameters: index (int)
+        Returns: tuple[int, int]
+
+        """
+        row, col = divmod(index, self._columns())
+        return col * self.cell_w + self.PADDING // 2, row * self.cell_h + self.PADDING // 2
+
+    def _layout(self):
+
+        """
+        This function draws every cell with its name and any thumbnail already loaded.
+
+        Parameters: None
+        Returns: None
+
+        """
+        self.canvas.delete("all")
+        rows = -(-len(self.paths) // self._columns())
+        self.canvas.config(scrollregion=(0, 0, self._columns() * self.cell_w, rows * self.cell_h))
+        for i, path in enumerate(self.paths):
+            x, y = self._cell_origin(i)
+            tag = f"cell{i}"
+            self.canvas.create_rectangle(x, y, x + self.cache.size, y + self.cache.size,
+                                         outline=SUBTLE_TEXT, tags=tag)
+            self.canvas.create_text(x + self.cache.size // 2, y + self.cache.size + self.LABEL_HEIGHT // 2,
+                                    text=os.path.basename(path)[:18], fill="white",
+                                    font=(TEXT_FONT, 8), tags=tag)
+            self.canvas.tag_bind(tag, "<Button-1>", lambda e, p=path: self.controller.load_image(p))
+            if i in self.photos:
+                self._draw(i)
+        self._load_visible()
+
+    def _on_scrollbar(self, *args):
+
+        """
+        This function scrolls the grid from the scrollbar and loads what came into view.
+
+        Parameters: *args (tuple), scrollbar command arguments
+        Returns: None
+
+        """
+        self.canvas.yview(*args)
+        self._load_visible()
+
+    def _on_wheel(self, event):
+
+        """
+        This function scrolls the grid with the mouse wheel and loads what came into view.
+
+        Parameters: event (tkinter.Event)
+        Returns: None
+
+        """
+        self.canvas.yview_scroll(int(-event.delta / 120) or (-1 if event.delta > 0 else 1), "units")
+        self._load_visible()
+
+    def _load_visible(self):
+
+        """
+        This function requests the thumbnails in view first, then a few of the rest.
+
+        Parameters: None
+        Returns: None
+
+        """
+        top = int(self.canvas.canvasy(0)) // self.cell_h
+        bottom = int(self.canvas.canvasy(self.canvas.winfo_height())) // self.cell_h + 1
+        columns = self._columns()
+        for i in range(top * columns, min(len(self.paths), bottom * columns)):
+            self._request(i)
+        self._prefetch()
+
+    def _prefetch(self):
+
+        """
+        This function loads or queues off-screen thumbnails a few at a time.
+
+        Keeping the queue short means newly visible thumbnails never wait
+        behind them. Cached thumbnails are read on the Tk thread, so they are
+        also limited per pass and the next pass runs later from after().
+
+        Parameters: None
+        Returns: None
+
+        """
+        if self._after_id is not None:
+            self.window.after_cancel(self._after_id)
+            self._after_id = None
+        loaded = 0
+        while self._cursor < len(self.paths):
+            if len(self.runner) >= self.PREFETCH or loaded >= self.PREFETCH:
+                break
+            if self._request(self._cursor) == "cached":
+                loaded += 1
+            self._cursor += 1
+        if loaded >= self.PREFETCH and self._cursor < len(self.paths):
+            # A full folder of cached thumbnails is read in small batches, so the window stays responsive
+            self._after_id = self.window.after(self.PREFETCH_MS, self._prefetch)
+
+    def _request(self, index):
+
+        """
+        This function shows a cached thumbnail or asks a worker to make it.
+
+        Parameters: index (int)
+        Returns: str | None, "cached" or "queued", None if nothing was done
+
+        """
+        if index in self.requested:
+            return None
+        self.requested.add(index)
+        path = self.paths[index]
+        try:
+            thumb = self.cache.load(path)
+            target = self.cache.cache_path(path)
+        except OSError:
+            return None
+        if thumb is not None:
+            self._show(index, thumb)
+            return "cached"
+        self.runner.submit(ThumbnailCache.generate, path, target, self.cache.size,
+                           on_done=lambda result, i=index: self._on_generated(i, result))
+        return "queued"
+
+    def _on_generated(self, index, target):
+
+        """
+        This function shows a thumbnail a worker just made and keeps the queue filled.
+
+        Parameters: index (int), target (str | None)
+        Returns: None
+
+        """
+        if target:
+            thumb = cv2.imread(target, cv2.IMREAD_UNCHANGED)
+            if thumb is not None:
+                self._show(index, thumb)
+        self._prefetch()
+
+    def _show(self, index, thumb):
+
+        """
+        This function keeps a thumbnail for the cell and draws it.
+
+        Parameters: index (int), thumb (numpy.ndarray)
+        Returns: None
+
+        """
+        self.photos[index] = ImageDisplay.cv_to_tk(thumb)
+        self._draw(index)
+
+    def _draw(self, index):
+
+        """
+        This function draws a loaded thumbnail centered in its cell.
+
+        Parameters: index (int)
+        Returns: None
+
+        """
+        x, y = self._cell_origin(index)
+        half = self.cache.size // 2
+        self.canvas.create_image(x + half, y + half, image=self.photos[index], tags=f"cell{index}")
@@ -0,0 +1,149 @@
+from tkinter import Canvas, Label, Toplevel
+import numpy as np
+from core.filters import FILTERS
+from core.histogram import HistogramCache
+from utils.base_component import BaseComponent
+from utils.constants import DARK_BG, SUBTLE_TEXT, TEXT_FONT
+
+
+class HistogramPanel(BaseComponent):
+
+    """
+    This class is a tool window showing the histogram and tone statistics of the current image.
+
+    """
+
+    WIDTH = 256
+    HEIGHT = 120
+    CHANNEL_COLORS = ("#4f8ff7", "#4caf50", "#f44336")
+
+    def __init__(self, root, controller):
+
+        """
+        This function opens the window.
+
+        Parameters: root (tkinter.Tk), controller (object)
+        Returns: None
+
+        """
+        super().__init__(controller)
+        self.cache = HistogramCache()
+        self._pending = None
+        self._after_id = None
+
+        self.window = Toplevel(root)
+        self.window.title("Histogram")
+        self.window.resizable(False, False)
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+        self.canvas = Canvas(self.window, width=self.WIDTH, height=self.HEIGHT, bg=DARK_BG, highlightthickness=0)
+        self.canvas.pack(padx=6, pady=(6, 2))
+        self.label = Label(self.window, text="", font=(TEXT_FONT, 9), justify="left", anchor="w")
+        self.label.pack(fill="x", padx=6, pady=(0, 6))
+
+    @property
+    def is_open(self):
+
+        """
+        This function tells if the window is still shown.
+
+        Parameters: None
+        Returns: bool
+
+        """
+        return self.window is not None
+
+    def close(self):
+
+        """
+        This function closes the window.
+
+        Parameters: None
+        Returns: None
+
+        """
+        if self._after_id is not None:
+            self.window.after_cancel(self._after_id)
+        self.window.destroy()
+        self.window = None
+
+    def refresh(self, image, adjustments=(), edited=False):
+
+        """
+        This function shows the histogram of an image after some pending point adjustments.
+
+        The drawing waits until Tk is idle, so an edit is on screen first, and
+        several calls in a row draw once. The image is sampled only the first
+        time it is seen; adjustments are followed through their lookup tables.
+
+        Parameters: image (numpy.ndarray | None), adjustments (list[tuple]), (name, value) pairs not yet in image,
+                    edited (bool), the image was changed in place since it was last shown
+        Returns: None
+
+        """
+        if not self.is_open:
+            return
+        if edited and image is not None:
+            self.cache.forget(image)
+        self._pending = (image, tuple(adjustments))
+        if self._after_id is None:
+            self._after_id = self.window.after_idle(self._draw_pending)
+
+    def _draw_pending(self):
+
+        """
+        This function draws the last requested histogram.
+
+        Parameters: None
+        Returns: None
+
+        """
+        self._after_id = None
+        image, adjustments = self._pending
+        self._pending = None
+        self.canvas.delete("all")
+        if image is None:
+            self.label.config(text="No image loaded")
+            return
+        histogram = self.cache.get(image)
+        lut = None
+        for name, value in adjustments:
+            spec = FILTERS.get(name)
+            if spec.lut is None:
+                continue
+            # Consecutive point ops compose into one table, so the counts are mapped once
+            step = spec.lut(value)
+            lut = step if lut is None else step[lut]
+        if lut is not None:
+            histogram = histogram.mapped(lut)
+        self._draw(histogram)
+
+    def _draw(self, histogram):
+
+        """
+        This function draws the value histogram filled and the channel histograms as lines.
+
+        Parameters: histogram (Histogram)
+        Returns: None
+
+        """
+        # The end bins hold every clipped pixel, so they would flatten the rest of the curve
+        peak = max(1.0, float(histogram.value[1:255].max()), float(histogram.channels[:, 1:255].max()))
+        scale = (self.HEIGHT - 4) / peak
+        x = np.arange(256) * (self.WIDTH - 1) / 255
+
+        def points(counts):
+            y = self.HEIGHT - np.minimum(counts * scale, self.HEIGHT)
+            return np.column_stack([x, y]).ravel().tolist()
+
+        self.canvas.create_polygon([0, self.HEIGHT] + points(histogram.value) + [self.WIDTH - 1, self.HEIGHT],
+                                   fill="#616161", outline="")
+        if len(histogram.channels) == 3:
+            for counts, color in zip(histogram.channels, self.CHANNEL_COLORS):
+                self.canvas.create_line(points(counts), fill=color)
+        self.canvas.create_line(points(histogram.value), fill=SUBTLE_TEXT)
+
+        stats = histogram.stats
+        names = ("B", "G", "R") if len(stats.mean) == 3 else ("Gray",)
+        means = "  ".join(f"{n} {m:.0f}±{s:.0f}" for n, m, s in zip(names, stats.mean, stats.std))
+        self.label.config(text=f"{means}\nShadows clipped {stats.shadows:.1%}  "
+                               f"Highlights clipped {stats.highlights:.1%}")
@@ -0,0 +1,147 @@
+from tkinter import Canvas, Scrollbar, Toplevel
+from utils.base_component import BaseComponent
+from utils.constants import DARK_BG, HISTORY_THUMBNAIL_SIZE, PRIMARY_COLOR, SUBTLE_TEXT, TEXT_FONT
+from utils.image_display import ImageDisplay
+
+
+class HistoryPanel(BaseComponent):
+
+    """
+    This class is a tool window showing a thumbnail of every state in the history timeline.
+
+    Clicking a state jumps to it, hovering shows its thumbnail on the canvas.
+
+    """
+
+    PADDING = 8
+    LABEL_WIDTH = 90
+
+    def __init__(self, root, controller):
+
+        """
+        This function opens the window.
+
+        Parameters: root (tkinter.Tk), controller (object)
+        Returns: None
+
+        """
+        super().__init__(controller)
+        self.row_h = HISTORY_THUMBNAIL_SIZE + self.PADDING
+        self.photos = {}
+        self._pending = None
+        self._after_id = None
+
+        self.window = Toplevel(root)
+        self.window.title("History")
+        self.window.geometry(f"{HISTORY_THUMBNAIL_SIZE + self.LABEL_WIDTH + 3 * self.PADDING + 16}x480")
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+        scrollbar = Scrollbar(self.window, orient="vertical")
+        scrollbar.pack(side="right", fill="y")
+        self.canvas = Canvas(self.window, bg=DARK_BG, highlightthickness=0, yscrollcommand=scrollbar.set)
+        self.canvas.pack(side="left", fill="both", expand=True)
+        scrollbar.config(command=self.canvas.yview)
+        self.canvas.bind("<MouseWheel>", self._on_wheel)
+
+    @property
+    def is_open(self):
+
+        """
+        This function tells if the window is still shown.
+
+        Parameters: None
+        Returns: bool
+
+        """
+        return self.window is not None
+
+    def close(self):
+
+        """
+        This function closes the window and ends any hover preview.
+
+        Parameters: None
+        Returns: None
+
+        """
+        if self._after_id is not None:
+            self.window.after_cancel(self._after_id)
+        self.controller.preview_history(None)
+        self.window.destroy()
+        self.window = None
+
+    def refresh(self, current, thumbnails):
+
+        """
+        This function shows the timeline once Tk is idle, so several changes in a row draw once.
+
+        Parameters: current (int), position of the current state,
+                    thumbnails (list[numpy.ndarray | None]), one per state, oldest first
+        Returns: None
+
+        """
+        if not self.is_open:
+            return
+        self._pending = (current, thumbnails)
+        if self._after_id is None:
+            self._after_id = self.window.after_idle(self._draw_pending)
+
+    def _draw_pending(self):
+
+        """
+        This function draws one row per state, reusing the Tk images of thumbnails already shown.
+
+        Parameters: None
+        Returns: None
+
+        """
+        self._after_id = None
+        current, thumbnails = self._pending
+        self._pending = None
+        # Thumbnails are kept by the history and never change, so their photos are keyed by identity
+        photos = {}
+        self.canvas.delete("all")
+        size = HISTORY_THUMBNAIL_SIZE
+        for position, thumbnail in enumerate(thumbnails):
+            x, y = self.PADDING, position * self.row_h + self.PADDING // 2
+            tag = f"state{position}"
+            if thumbnail is not None:
+                shown = self.photos.get(id(thumbnail))
+                if shown is None or shown[0] is not thumbnail:
+                    shown = (thumbnail, ImageDisplay.cv_to_tk(thumbnail))
+                photos[id(thumbnail)] = shown
+                h, w = thumbnail.shape[:2]
+                self.canvas.create_image(x + (size - w) // 2, y + (size - h) // 2, anchor="nw",
+                                         image=shown[1], tags=tag)
+            outline = PRIMARY_COLOR if position == current else SUBTLE_TEXT
+            self.canvas.create_rectangle(x, y, x + size, y + size, outline=outline,
+                                         width=2 if position == current else 1, tags=tag)
+            label = "Original" if position == 0 else f"Step {position}"
+            if position == current:
+                label += "\n(current)"
+            elif position > current:
+                label += "\n(undone)"
+            self.canvas.create_text(x + size + self.PADDING, y + size // 2, text=label, anchor="w",
+                                    fill="white" if position <= current else SUBTLE_TEXT,
+                                    font=(TEXT_FONT, 9), tags=tag)
+            self.canvas.tag_bind(tag, "<Button-1>", lambda e, p=position: self.controller.jump_to_history(p))
+            self.canvas.tag_bind(tag, "<Enter>", lambda e, p=position: self.controller.preview_history(p))
+            self.canvas.tag_bind(tag, "<Leave>", lambda e: self.controller.preview_history(None))
+        self.photos = photos
+        self.canvas.config(scrollregion=(0, 0, size + self.LABEL_WIDTH, len(thumbnails) * self.row_h))
+        # Keep the current state in view
+        top = current * self.row_h / max(1, len(thumbnails) * self.row_h)
+        first, last = self.canvas.yview()
+        if not first <= top < last - self.row_h / max(1, len(thumbnails) * self.row_h):
+            self.canvas.yview_moveto(top)
+
+    def _on_wheel(self, event):
+
+        """
+        This function scrolls the timeline with the mouse wheel.
+
+        Parameters: event (tkinter.Event)
+        Returns: None
+
+        """
+        self.canvas.yview_scroll(int(-event.delta / 120) or (-1 if event.delta > 0 else 1), "units")
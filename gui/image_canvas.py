@@ -1,7 +1,16 @@
+import math
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 import cv2
+import numpy as np
 from tkinter import Canvas
+from core.tile_cache import TileCache
 from utils.image_display import ImageDisplay
-from utils.constants import BORDER_COLOR, DARK_BG, PLACE_HOLDER_TEXT, PRIMARY_COLOR, SUBTLE_TEXT, TEXT_FONT
+from utils.models import Rect, Size
+from utils.orientation import Orientation
+from utils.constants import (
+    BORDER_COLOR, DARK_BG, DISPLAY_CACHE_MB, PLACE_HOLDER_TEXT, PRIMARY_COLOR, SUBTLE_TEXT, TEXT_FONT
+)
 
 
 class BaseCanvas:
@@ -26,15 +35,27 @@ class ImageCanvas(BaseCanvas):
     
     """
     This class is a Canvas responsible for displaying and scaling images.
+
+    The image is drawn as a grid of display tiles, like a map viewer. Tiles
+    are kept in an LRU cache per image version and display size, so panning
+    and going back to a zoom level mostly reuse them, and the tiles just
+    outside the view are rendered ahead on a background thread.
+
+    In compare mode the original is drawn left of a split line and the
+    current image right of it. Both come from their own cached tiles, so
+    moving the line only recombines the tiles it crosses.
     
     """
 
-    def __init__(self, parent):
+    TILE = 256
+    VERSIONS = 8
+
+    def __init__(self, parent, cache_bytes: int = DISPLAY_CACHE_MB * 1024 * 1024):
         
         """
         This initializes drawing canvas and bind the resize handling together.
 
-        Parameters: parent (tkinter.Widget)
+        Parameters: parent (tkinter.Widget), cache_bytes (int), memory limit of the tile cache
         Returns: None
         
         """
@@ -47,24 +68,252 @@ class ImageCanvas(BaseCanvas):
         )
         self.canvas.pack(side="left", fill="both", expand=True, padx=10, pady=10)
 
-        self.tk_image = None
         self.cv_image = None
+        self.preview_image = None
+        self.orientation = Orientation()
         self.on_upload_click = None
         self.zoom_percent = 100
+        self.selection = None
+        self.before_image = None
+        self.split = 0.5
+        self.tiles = TileCache(cache_bytes)
+        self._drag_start = None
+        self._pan_from = None
+        self._pan = (0, 0)
+        self._frame = None
+        self._placement = None
+        self._shown = {}
+        self._version = None
+        self._before_version = None
+        self._versions = []
+        self._next_version = 0
+        self._token = 0
+        self._dirty = []
+        self._flush_id = None
+        self._prefetcher = ThreadPoolExecutor(max_workers=1)
         self.canvas.bind("<Configure>", self._on_resize)
+        self.canvas.bind("<ButtonPress-1>", self._on_press)
+        self.canvas.bind("<B1-Motion>", self._on_drag)
+        self.canvas.bind("<ButtonRelease-1>", self._on_drag)
+        self.canvas.bind("<Button-3>", lambda e: self.clear_selection())
+        self.canvas.bind("<ButtonPress-2>", self._on_pan_start)
+        self.canvas.bind("<B2-Motion>", self._on_pan)
 
-    def update(self, image):
+    def update(self, image, orientation=None):
         
         """
         This function sets current image and triggers the re-render.
 
-        Parameters: image (numpy.ndarray)
+        The orientation is applied after downscaling, so rotating a large image costs only a preview-sized move.
+
+        Parameters: image (numpy.ndarray), orientation (Orientation | None)
         Returns: None
         
         """
+        orientation = orientation or Orientation()
+        if image is None or self.cv_image is None or image.shape[:2] != self.cv_image.shape[:2] \
+                or orientation != self.orientation:
+            # The selection is in displayed pixels, so it no longer fits a new image or orientation
+            self.selection = None
+        if image is None or self.cv_image is None or image.shape[:2] != self.cv_image.shape[:2]:
+            self._pan = (0, 0)
+        if image is not None and image is self.cv_image and orientation == self.orientation:
+            # The same array again means it was edited in place, so its tiles are stale
+            self._versions = [entry for entry in self._versions if entry[0]() is not image]
         self.cv_image = image
+        self.orientation = orientation
+        self._version = None if image is None else self._version_of(image, orientation)
+        if image is None:
+            self.before_image = None
+        if self.before_image is not None:
+            self._before_version = self._version_of(self.before_image, orientation)
         self._render()
 
+    def set_compare(self, image, render=True):
+        
+        """
+        This function shows an image, usually the original, left of a split line for comparison.
+
+        It is drawn with the current orientation and scaled to the same frame as the current image.
+
+        Parameters: image (numpy.ndarray | None), None leaves compare mode,
+                    render (bool), False when an update() follows anyway
+        Returns: None
+        
+        """
+        self.before_image = image
+        if not render:
+            return
+        if image is not None and self.cv_image is not None:
+            self._before_version = self._version_of(image, self.orientation)
+        if self.cv_image is not None:
+            self._render()
+
+    def move_split(self, split):
+        
+        """
+        This function moves the compare split line, redrawing only the tiles between its old and new place.
+
+        Parameters: split (float), 0 shows only the current image, 1 only the before image
+        Returns: None
+        
+        """
+        split = min(max(split, 0.0), 1.0)
+        old, self.split = self.split, split
+        if self._frame is None or self.before_image is None:
+            return
+        first, last = sorted((round(old * self._frame[0]), round(split * self._frame[0])))
+        columns = range(first // self.TILE, last // self.TILE + 1)
+        for key in [key for key in self._shown if key[0] in columns]:
+            self.canvas.delete(self._shown.pop(key)[0])
+        self._draw_tiles()
+        self._draw_selection()
+        self._draw_split()
+
+    def update_region(self, image, rect):
+        
+        """
+        This function sets current image when only a rectangle of it changed and redraws just that part.
+
+        Parameters: image (numpy.ndarray), rect (Rect), the changed stored pixels
+        Returns: None
+        
+        """
+        if self._frame is None or self.preview_image is not None or self.cv_image is None \
+                or image.shape[:2] != self.cv_image.shape[:2]:
+            self.update(image, self.orientation)
+            return
+        if image is not self.cv_image:
+            # A private copy of the image was made for the edit; its tiles start as the old ones
+            old, self._version = self._version, self._version_of(image, self.orientation)
+            for col, row in self._shown:
+                tile = self.tiles.get((old, *self._frame, col, row))
+                if tile is not None:
+                    self.tiles.put((self._version, *self._frame, col, row), tile.copy())
+            self.cv_image = image
+        self.mark_dirty(rect)
+
+    def mark_dirty(self, rect):
+        
+        """
+        This function remembers a changed rectangle and redraws every changed rectangle once Tk is idle.
+
+        Several tiles finishing close together are drawn in one pass.
+
+        Parameters: rect (Rect), in stored pixel coordinates
+        Returns: None
+        
+        """
+        # Tiles rendered ahead from the old pixels are turned away from now on
+        self._token += 1
+        self._dirty.append(rect)
+        if self._flush_id is None:
+            self._flush_id = self.canvas.after_idle(self._flush_dirty)
+
+    def _flush_dirty(self):
+        
+        """
+        This function redraws the rectangles marked dirty since the last pass.
+
+        Parameters: None
+        Returns: None
+        
+        """
+        self._flush_id = None
+        dirty, self._dirty = self._dirty, []
+        if self._frame is None or self.preview_image is not None or self.cv_image is None:
+            return
+        version, frame = self._version, self._frame
+        # Other zoom levels of this image are stale now
+        self.tiles.discard(lambda key: key[0] == version and key[1:3] != frame)
+        for rect in dirty:
+            self._redraw_region(rect)
+
+    def _redraw_region(self, rect):
+        
+        """
+        This function resamples one changed rectangle and writes it into the tiles it touches.
+
+        Cached tiles are patched in place and tiles on screen get the block copied into their PhotoImage.
+
+        Parameters: rect (Rect), in stored pixel coordinates
+        Returns: None
+        
+        """
+        img_h, img_w = self.cv_image.shape[:2]
+        shown = self.orientation.inverse().source_rect(rect, *self.orientation.shape(img_w, img_h))
+        _, _, scale = self._placement
+
+        # Screen pixels touching the rectangle, with a one pixel margin for the resampling filter
+        target = Rect.from_corners(math.floor(shown.x * scale) - 1, math.floor(shown.y * scale) - 1,
+                                   math.ceil((shown.x + shown.w) * scale) + 1,
+                                   math.ceil((shown.y + shown.h) * scale) + 1).clipped(*self._frame)
+        if target is None:
+            return
+        piece = self._resample(self.cv_image, self.orientation, scale, target)
+
+        for col in range(target.x // self.TILE, (target.x + target.w - 1) // self.TILE + 1):
+            for row in range(target.y // self.TILE, (target.y + target.h - 1) // self.TILE + 1):
+                tile_rect = self._tile_rect(col, row)
+                # The changed block in the tile's own coordinates
+                local = Rect(target.x - tile_rect.x, target.y - tile_rect.y,
+                             target.w, target.h).clipped(tile_rect.w, tile_rect.h)
+                rows, cols = Rect(tile_rect.x + local.x - target.x, tile_rect.y + local.y - target.y,
+                                  local.w, local.h).slices
+                block = piece[rows, cols]
+                key = (self._version, *self._frame, col, row)
+                cached = self.tiles.get(key)
+                if cached is not None:
+                    if cached.ndim == block.ndim:
+                        cached[local.slices] = block
+                    else:
+                        self.tiles.discard(lambda k: k == key)
+                if (col, row) in self._shown and self.before_image is not None:
+                    # Part of the tile may show the before image, so the whole tile is drawn again
+                    self.canvas.delete(self._shown.pop((col, row))[0])
+                elif (col, row) in self._shown:
+                    photo = ImageDisplay.cv_to_tk(block)
+                    # Tk copies the block into the tile's image, nothing else is uploaded again
+                    self.canvas.tk.call(str(self._shown[(col, row)][1]), "copy", str(photo),
+                                        "-to", local.x, local.y)
+        if self.before_image is not None:
+            self._draw_tiles()
+            self._draw_selection()
+            self._draw_split()
+
+    def show_preview(self, image):
+        
+        """
+        This function draws a small preview buffer in place of the current image.
+
+        Parameters: image (numpy.ndarray | None), None goes back to the current image
+        Returns: None
+        
+        """
+        self.preview_image = image
+        if self.cv_image is not None:
+            self._render()
+
+    def display_size(self, size):
+        
+        """
+        This function works out the on-screen size of an image for the current canvas and zoom.
+
+        Parameters: size (Size), the image size with its orientation applied
+        Returns: Size
+        
+        """
+        canvas_w = self.canvas.winfo_width()
+        canvas_h = self.canvas.winfo_height()
+        img_w, img_h = size
+    
+        # --- FIT TO SCREEN BASE SCALE ---
+        fit_scale = min(canvas_w / img_w, canvas_h / img_h)
+    
+        # --- APPLY ZOOM ---
+        zoom_scale = self.zoom_percent / 100
+        return Size(img_w, img_h) * (fit_scale * zoom_scale)
+
     def _on_resize(self, event):
         
         """
@@ -88,34 +337,399 @@ class ImageCanvas(BaseCanvas):
         """
         
         self.canvas.delete("all")
+        self._shown = {}
+        self._dirty = []
     
         if self.cv_image is None:
+            self._frame = self._placement = None
             self._render_placeholder()
             return
     
-        canvas_w = self.canvas.winfo_width()
-        canvas_h = self.canvas.winfo_height()
-    
         img_h, img_w = self.cv_image.shape[:2]
-    
-        # --- FIT TO SCREEN BASE SCALE ---
-        fit_scale = min(canvas_w / img_w, canvas_h / img_h)
-    
-        # --- APPLY ZOOM ---
-        zoom_scale = self.zoom_percent / 100
-        scale = fit_scale * zoom_scale
-    
-        new_w = max(1, int(img_w * scale))
-        new_h = max(1, int(img_h * scale))
-    
+        self._frame = tuple(self.display_size(Size(*self.orientation.shape(img_w, img_h))))
+        self._place()
+        self._draw_tiles()
+        self._draw_selection()
+        self._draw_split()
+
+    def _place(self):
+        
+        """
+        This function works out where the image sits on the canvas, centered or panned.
+
+        Parameters: None
+        Returns: None
+        
+        """
+        view = (self.canvas.winfo_width(), self.canvas.winfo_height())
+        origin, pan = [], []
+        for size, shown, offset in zip(view, self._frame, self._pan):
+            centered = (size - shown) // 2
+            if shown <= size:
+                offset = 0
+            else:
+                # Keep the image covering the canvas while panning
+                offset = min(max(centered + offset, size - shown), 0) - centered
+            origin.append(centered + offset)
+            pan.append(offset)
+        self._pan = tuple(pan)
+        img_h, img_w = self.cv_image.shape[:2]
+        self._placement = (origin[0], origin[1], self._frame[0] / self.orientation.shape(img_w, img_h)[0])
+
+    def pan(self, dx, dy):
+        
+        """
+        This function moves the image on the canvas, drawing only the tiles that come into view.
+
+        Parameters: dx (int), dy (int), distance in screen pixels
+        Returns: None
+        
+        """
+        if self._frame is None:
+            return
+        x, y, _ = self._placement
+        self._pan = (self._pan[0] + dx, self._pan[1] + dy)
+        self._place()
+        new_x, new_y, _ = self._placement
+        if (new_x, new_y) != (x, y):
+            self.canvas.move("tile", new_x - x, new_y - y)
+            self._draw_tiles()
+            self._draw_selection()
+            self._draw_split()
+
+    def _on_pan_start(self, event):
+        
+        """
+        This function starts panning where the middle button is pressed.
+
+        Parameters: event (tkinter.Event)
+        Returns: None
+        
+        """
+        self._pan_from = (event.x, event.y)
+
+    def _on_pan(self, event):
+        
+        """
+        This function pans the image while the middle button is dragged.
+
+        Parameters: event (tkinter.Event)
+        Returns: None
+        
+        """
+        if self._pan_from is None:
+            return
+        x, y = self._pan_from
+        self._pan_from = (event.x, event.y)
+        self.pan(event.x - x, event.y - y)
+
+    def _tile_rect(self, col, row):
+        
+        """
+        This function gives the screen pixels one tile covers, relative to the image corner.
+
+        Parameters: col (int), row (int)
+        Returns: Rect
+        
+        """
+        return Rect(col * self.TILE, row * self.TILE, self.TILE, self.TILE).clipped(*self._frame)
+
+    def _tiles_in(self, rect):
+        
+        """
+        This function lists the tiles touching a rectangle of the displayed image.
+
+        Parameters: rect (Rect | None)
+        Returns: list[tuple[int, int]]
+        
+        """
+        if rect is None:
+            return []
+        return [(col, row)
+                for row in range(rect.y // self.TILE, (rect.y + rect.h - 1) // self.TILE + 1)
+                for col in range(rect.x // self.TILE, (rect.x + rect.w - 1) // self.TILE + 1)]
+
+    def _draw_tiles(self):
+        
+        """
+        This function shows the tiles in view, drops the ones that left it and renders the next ones ahead.
+
+        Parameters: None
+        Returns: None
+        
+        """
+        x, y, _ = self._placement
+        view = Rect(-x, -y, self.canvas.winfo_width(), self.canvas.winfo_height()).clipped(*self._frame)
+        visible = self._tiles_in(view)
+        for key in set(self._shown) - set(visible):
+            self.canvas.delete(self._shown.pop(key)[0])
+        for col, row in visible:
+            if (col, row) in self._shown:
+                continue
+            photo = ImageDisplay.cv_to_tk(self._tile(col, row))
+            item = self.canvas.create_image(x + col * self.TILE, y + row * self.TILE,
+                                            anchor="nw", image=photo, tags="tile")
+            self._shown[(col, row)] = (item, photo)
+        if view is not None and self.preview_image is None:
+            ahead = [key for key in self._tiles_in(view.expanded(self.TILE).clipped(*self._frame))
+                     if key not in self._shown]
+            self._prefetch(ahead)
+
+    def _tile(self, col, row):
+        
+        """
+        This function gives the pixels of one tile from the cache, rendering it if needed.
+
+        A live preview changes on every slider move, so its tiles are not cached.
+        In compare mode a tile the split line crosses is put together from
+        the cached tiles of both images.
+
+        Parameters: col (int), row (int)
+        Returns: numpy.ndarray
+        
+        """
+        rect = self._tile_rect(col, row)
+        cut = round(self.split * self._frame[0]) - rect.x if self.before_image is not None else 0
+        if cut >= rect.w:
+            return self._cached_tile(self.before_image, self._before_version, col, row)
+        if self.preview_image is not None:
+            # A live preview is already oriented and close to display size, so this resize is cheap
+            scale = self._frame[0] / self.preview_image.shape[1]
+            tile = self._resample(self.preview_image, Orientation(), scale, rect)
+        else:
+            tile = self._cached_tile(self.cv_image, self._version, col, row)
+        if cut <= 0:
+            return tile
+        before = self._cached_tile(self.before_image, self._before_version, col, row)
+        if before.ndim != tile.ndim:
+            before, tile = (cv2.cvtColor(t, cv2.COLOR_GRAY2BGR) if t.ndim == 2 else t for t in (before, tile))
+        return np.concatenate((before[:, :cut], tile[:, cut:]), axis=1)
+
+    def _cached_tile(self, image, version, col, row):
+        
+        """
+        This function gives one tile of an image from the cache, rendering it at the current frame if needed.
+
+        Parameters: image (numpy.ndarray), version (int), col (int), row (int)
+        Returns: numpy.ndarray
+        
+        """
+        key = (version, *self._frame, col, row)
+        tile = self.tiles.get(key)
+        if tile is None:
+            img_h, img_w = image.shape[:2]
+            # The before image may differ in size, so each image gets its own scale to the frame
+            scale = self._frame[0] / self.orientation.shape(img_w, img_h)[0]
+            tile = self._resample(image, self.orientation, scale, self._tile_rect(col, row))
+            self.tiles.put(key, tile)
+        return tile
+
+    def _prefetch(self, tiles):
+        
+        """
+        This function renders tiles next to the view on the background thread.
+
+        A newer request or a changed image makes older requests stop.
+
+        Parameters: tiles (list[tuple[int, int]])
+        Returns: None
+        
+        """
+        self._token += 1
+        token, version, frame = self._token, self._version, self._frame
+        todo = [(col, row) for col, row in tiles if (version, *frame, col, row) not in self.tiles]
+        if not todo:
+            return
+        _, _, scale = self._placement
+        jobs = [((version, *frame, col, row), self._tile_rect(col, row)) for col, row in todo]
+        self._prefetcher.submit(self._render_ahead, token, self.cv_image, self.orientation, scale, jobs)
+
+    def _render_ahead(self, token, image, orientation, scale, jobs):
+        
+        """
+        This function renders tiles into the cache on the background thread.
+
+        Parameters: token (int), image (numpy.ndarray), orientation (Orientation), scale (float), jobs (list)
+        Returns: None
+        
+        """
+        for key, target in jobs:
+            if token != self._token:
+                return
+            tile = self._resample(image, orientation, scale, target)
+            self.tiles.put(key, tile, check=lambda: token == self._token)
+
+    @staticmethod
+    def _resample(image, orientation, scale, target):
+        
+        """
+        This function renders a rectangle of the displayed image at screen scale.
+
+        Only the image pixels under the rectangle, plus a small margin for the filter, are read;
+        they are oriented after downscaling.
+
+        Parameters: image (numpy.ndarray), orientation (Orientation), scale (float), target (Rect), screen pixels
+        Returns: numpy.ndarray
+        
+        """
+        img_h, img_w = image.shape[:2]
+        view_w, view_h = orientation.shape(img_w, img_h)
+        source = Rect.from_corners(math.floor(target.x / scale) - 1, math.floor(target.y / scale) - 1,
+                                   math.ceil((target.x + target.w) / scale) + 1,
+                                   math.ceil((target.y + target.h) / scale) + 1).clipped(view_w, view_h)
+        size = (max(1, round(source.w * scale)), max(1, round(source.h * scale)))
         interpolation = cv2.INTER_LINEAR if scale > 1 else cv2.INTER_AREA
-        resized = cv2.resize(self.cv_image, (new_w, new_h), interpolation=interpolation)
-    
-        self.tk_image = ImageDisplay.cv_to_tk(resized)
-    
-        x = (canvas_w - new_w) // 2
-        y = (canvas_h - new_h) // 2
-        self.canvas.create_image(x, y, anchor="nw", image=self.tk_image)
+        # Resized before it is oriented, so rotating and flipping copy only the screen-sized piece
+        piece = cv2.resize(image[orientation.source_rect(source, img_w, img_h).slices],
+                           orientation.inverse().shape(*size), interpolation=interpolation)
+        piece = orientation.apply(piece)
+
+        dx = max(0, round(target.x - source.x * scale))
+        dy = max(0, round(target.y - source.y * scale))
+        piece = piece[dy:dy + target.h, dx:dx + target.w]
+        if piece.shape[:2] != (target.h, target.w):
+            # Rounding at the image border can leave a pixel short
+            piece = cv2.resize(piece, (target.w, target.h), interpolation=cv2.INTER_NEAREST)
+        return piece
+
+    def _version_of(self, image, orientation):
+        
+        """
+        This function gives the cache version of an image, reusing it when undo brings the same pixels back.
+
+        Tiles of versions that are forgotten or whose pixels are gone are dropped.
+
+        Parameters: image (numpy.ndarray), orientation (Orientation)
+        Returns: int
+        
+        """
+        for i, (ref, seen, version) in enumerate(self._versions):
+            if ref() is image and seen == orientation:
+                # Most recently used first, so an image shown all along, like the compare original, is kept
+                self._versions.insert(0, self._versions.pop(i))
+                return version
+        self._next_version += 1
+        self._versions = [(weakref.ref(image), orientation, self._next_version)] + \
+            [entry for entry in self._versions[:self.VERSIONS - 1] if entry[0]() is not None]
+        keep = {version for _, _, version in self._versions}
+        self.tiles.discard(lambda key: key[0] not in keep)
+        return self._next_version
+
+    def clear_selection(self):
+        
+        """
+        This function removes the selection so edits apply to the whole image again.
+
+        Parameters: None
+        Returns: None
+        
+        """
+        self.selection = None
+        self._draw_selection()
+
+    def _to_image(self, event):
+        
+        """
+        This function converts a mouse position to displayed image pixel coordinates.
+
+        Parameters: event (tkinter.Event)
+        Returns: tuple[float, float]
+        
+        """
+        x, y, scale = self._placement
+        return (event.x - x) / scale, (event.y - y) / scale
+
+    def _on_press(self, event):
+        
+        """
+        This function starts a new selection where the mouse is pressed.
+
+        Parameters: event (tkinter.Event)
+        Returns: None
+        
+        """
+        if self.cv_image is None or self._placement is None:
+            return
+        if self.before_image is not None:
+            self._drag_split(event)
+            return
+        self._drag_start = self._to_image(event)
+
+    def _on_drag(self, event):
+        
+        """
+        This function grows the selection while dragging, a plain click clears it.
+
+        In compare mode dragging moves the split line instead.
+
+        Parameters: event (tkinter.Event)
+        Returns: None
+        
+        """
+        if self.before_image is not None and self._placement is not None:
+            self._drag_split(event)
+            return
+        if self._drag_start is None:
+            return
+        if str(event.type) == "ButtonRelease":
+            start, self._drag_start = self._drag_start, None
+        else:
+            start = self._drag_start
+        img_h, img_w = self.cv_image.shape[:2]
+        rect = Rect.from_corners(*start, *self._to_image(event))
+        self.selection = rect.clipped(*self.orientation.shape(img_w, img_h))
+        self._draw_selection()
+
+    def _draw_selection(self):
+        
+        """
+        This function draws the selection outline over the image.
+
+        Parameters: None
+        Returns: None
+        
+        """
+        self.canvas.delete("selection")
+        if self.selection is None or self._placement is None:
+            return
+        x, y, scale = self._placement
+        sel = self.selection
+        self.canvas.create_rectangle(x + sel.x * scale, y + sel.y * scale,
+                                     x + (sel.x + sel.w) * scale, y + (sel.y + sel.h) * scale,
+                                     outline=PRIMARY_COLOR, dash=(4, 2), width=2, tags="selection")
+
+    def _drag_split(self, event):
+        
+        """
+        This function moves the split line to the mouse.
+
+        Parameters: event (tkinter.Event)
+        Returns: None
+        
+        """
+        x, _, _ = self._placement
+        self.move_split((event.x - x) / self._frame[0])
+
+    def _draw_split(self):
+        
+        """
+        This function draws the compare split line and its labels over the image.
+
+        Parameters: None
+        Returns: None
+        
+        """
+        self.canvas.delete("split")
+        if self.before_image is None or self._placement is None:
+            return
+        x, y, _ = self._placement
+        line_x = x + round(self.split * self._frame[0])
+        top = max(y, 0)
+        self.canvas.create_line(line_x, top, line_x, y + self._frame[1], fill="white", width=2, tags="split")
+        self.canvas.create_text(line_x - 8, top + 12, text="Before", anchor="e", fill="white",
+                                font=(TEXT_FONT, 10), tags="split")
+        self.canvas.create_text(line_x + 8, top + 12, text="After", anchor="w", fill="white",
+                                font=(TEXT_FONT, 10), tags="split")
 
     def _render_placeholder(self):
         
@@ -165,4 +779,4 @@ class ImageCanvas(BaseCanvas):
         
         self.zoom_percent = percent
         if self.cv_image is not None:
-            self._render()
\ No newline at end of file
+            self._render()
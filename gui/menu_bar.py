@@ -1,5 +1,9 @@
-from tkinter import Menu, filedialog, messagebox
-from utils.constants import SUPPORTED_FORMATS, DEFAULT_SAVE_NAME
+import os
+from tkinter import Menu, filedialog, messagebox, simpledialog
+from utils.constants import (
+    SUPPORTED_FORMATS, DEFAULT_SAVE_NAME, EXPORT_SET_DEFAULT, PROJECT_EXTENSION, PROJECT_FORMATS
+)
+from utils.models import ExportTarget
 
 
 class MenuBar:
@@ -24,12 +28,24 @@ class MenuBar:
 
         file_menu = Menu(menubar, tearoff=0)
         file_menu.add_command(label="Open", command=self.open_file)
+        file_menu.add_command(label="Browse Folder", command=self.browse_folder)
         file_menu.add_command(label="Save", command=self.save)
         file_menu.add_command(label="Save As", command=self.save_as)
+        file_menu.add_command(label="Export Set", command=self.export_set)
+        file_menu.add_command(label="Export Settings", command=controller.configure_export)
+        file_menu.add_separator()
+        file_menu.add_command(label="Open Project", command=self.open_project)
+        file_menu.add_command(label="Save Project", command=self.save_project)
         file_menu.add_separator()
         file_menu.add_command(label="Exit", command=root.quit)
 
         menubar.add_cascade(label="File", menu=file_menu)
+
+        view_menu = Menu(menubar, tearoff=0)
+        view_menu.add_command(label="Histogram", command=controller.show_histogram)
+        view_menu.add_command(label="History", command=controller.show_history)
+        view_menu.add_command(label="Compare Before/After", command=controller.toggle_compare)
+        menubar.add_cascade(label="View", menu=view_menu)
         root.config(menu=menubar)
 
     def open_file(self):
@@ -49,10 +65,61 @@ class MenuBar:
             except Exception as e:
                 messagebox.showerror("Error", str(e))
 
+    def browse_folder(self):
+        
+        """
+        This function asks for a folder and shows thumbnails of its images.
+
+        Parameters: None
+        Returns: None
+        
+        """
+        
+        folder = filedialog.askdirectory()
+        if folder:
+            try:
+                self.controller.browse_folder(folder)
+            except Exception as e:
+                messagebox.showerror("Error", str(e))
+
+    def open_project(self):
+        
+        """
+        This function opens a saved editing session with its history.
+
+        Parameters: None
+        Returns: None
+        
+        """
+        
+        path = filedialog.askopenfilename(filetypes=PROJECT_FORMATS)
+        if path:
+            try:
+                self.controller.load_project(path)
+            except Exception as e:
+                messagebox.showerror("Error", str(e))
+
+    def save_project(self):
+        
+        """
+        This function saves the editing session with its history to a project file.
+
+        Parameters: None
+        Returns: None
+        
+        """
+        
+        path = filedialog.asksaveasfilename(defaultextension=PROJECT_EXTENSION, filetypes=PROJECT_FORMATS)
+        if path:
+            try:
+                self.controller.save_project(path)
+            except Exception as e:
+                messagebox.showerror("Error", str(e))
+
     def save(self):
         
         """
-        This function saves the image using the default filename.
+        This function saves the image using the default filename in the background.
 
         Parameters: None
         Returns: None
@@ -60,8 +127,9 @@ class MenuBar:
         """
         
         try:
-            self.controller.save_image(DEFAULT_SAVE_NAME)
-            messagebox.showinfo("Saved", "Image saved successfully.")
+            self.controller.save_image(
+                DEFAULT_SAVE_NAME,
+                on_done=lambda: messagebox.showinfo("Saved", "Image saved successfully."))
         except Exception as e:
             messagebox.showerror("Error", str(e))
 
@@ -81,3 +149,53 @@ class MenuBar:
                 self.controller.save_image(path)
             except Exception as e:
                 messagebox.showerror("Error", str(e))
+
+    def export_set(self):
+        
+        """
+        This function asks for export targets and a base file name, then writes every target.
+
+        Targets are typed as comma separated "width format [quality]" items, e.g. "1280 jpg 80, 640 webp".
+
+        Parameters: None
+        Returns: None
+        
+        """
+        
+        spec = simpledialog.askstring("Export Set", "Targets (width format [quality], ...):",
+                                      initialvalue=EXPORT_SET_DEFAULT)
+        if not spec:
+            return
+        try:
+            targets = self._parse_targets(spec)
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
+            return
+        path = filedialog.asksaveasfilename(title="Base name for the exported files")
+        if path:
+            try:
+                self.controller.export_set(
+                    os.path.splitext(path)[0], targets,
+                    on_done=lambda paths: messagebox.showinfo("Exported", f"{len(paths)} files written."))
+            except Exception as e:
+                messagebox.showerror("Error", str(e))
+
+    @staticmethod
+    def _parse_targets(spec):
+        
+        """
+        This function reads export targets from text like "1280 jpg 80, 640 webp".
+
+        Parameters: spec (str)
+        Returns: list[ExportTarget]
+        
+        """
+        
+        targets = []
+        for item in spec.split(","):
+            parts = item.split()
+            if not 2 <= len(parts) <= 3 or not all(p.isdigit() for p in parts[::2]):
+                raise ValueError(f"Invalid export target: {item.strip()!r}")
+            quality = int(parts[2]) if len(parts) == 3 else None
+            targets.append(ExportTarget(int(parts[0]), "." + parts[1].lower().lstrip("."), quality))
+        return targets
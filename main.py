@@ -1,23 +1,87 @@
-from tkinter import Tk
-from gui.editor_gui import ImageEditorGUI
-from utils.constants import WINDOW_TITLE, WINDOW_SIZE
+import importlib
+import sys
+import threading
+from tkinter import Tk, Label, messagebox
+from utils.constants import DARK_BG, SUBTLE_TEXT, TEXT_FONT, WINDOW_TITLE, WINDOW_SIZE
+from utils.startup_timer import StartupTimer
 
 """
 This file is an application entry point which initializes the main window and launches the Image Editor GUI.
 
 This script sets up the root Tkinter window by using predefined constants and it also creates the main GUI controller, and starts the event loop.
 
+The window is shown first, with a loading label, while OpenCV, NumPy, PIL and the
+editor modules are imported on a background thread. Run with --startup-timing to
+print how long each startup phase takes.
+
 """
 
+# Imported in this order so the timing report shows each heavy library on its own
+HEAVY_MODULES = ("numpy", "cv2", "PIL.ImageTk", "gui.editor_gui")
+POLL_MS = 15
+
+
+def import_editor(timer, result):
+
+    """
+    This function imports the heavy modules on the background thread.
+
+    Parameters: timer (StartupTimer), result (dict), receives the editor class or the error
+    Returns: None
+
+    """
+    try:
+        for name in HEAVY_MODULES:
+            with timer.phase(f"import {name}"):
+                module = importlib.import_module(name)
+        result["editor"] = module.ImageEditorGUI
+    except Exception as e:
+        result["error"] = e
+
+
+def build_when_ready(root, splash, loader, result, timer):
+
+    """
+    This function waits for the background imports without blocking Tk, then builds the editor.
+
+    Parameters: root (tkinter.Tk), splash (tkinter.Label), loader (threading.Thread), result (dict), timer (StartupTimer)
+    Returns: None
+
+    """
+    if loader.is_alive():
+        root.after(POLL_MS, build_when_ready, root, splash, loader, result, timer)
+        return
+    if "error" in result:
+        messagebox.showerror("Error", f"Failed to start: {result['error']}")
+        root.destroy()
+        return
+    splash.destroy()
+    with timer.phase("build editor UI"):
+        result["editor"](root, timer)
+    root.update_idletasks()
+    timer.mark("editor ready")
+    timer.report()
+
+
 if __name__ == "__main__":
-    
+
     """
     This function starts the application and run the Tkinter main event loop for the entire program to operate.
-    
+
     """
-    
-    root = Tk()
-    root.title(WINDOW_TITLE)
-    root.geometry(WINDOW_SIZE)
-    ImageEditorGUI(root)
+
+    timer = StartupTimer(enabled="--startup-timing" in sys.argv)
+    with timer.phase("create window"):
+        root = Tk()
+        root.title(WINDOW_TITLE)
+        root.geometry(WINDOW_SIZE)
+        splash = Label(root, text="Loading…", bg=DARK_BG, fg=SUBTLE_TEXT, font=(TEXT_FONT, 14))
+        splash.pack(fill="both", expand=True)
+        root.update()
+    timer.mark("first window shown")
+
+    result = {}
+    loader = threading.Thread(target=import_editor, args=(timer, result), daemon=True)
+    loader.start()
+    root.after(POLL_MS, build_when_ready, root, splash, loader, result, timer)
     root.mainloop()
@@ -0,0 +1,39 @@
+import argparse
+from core.image_service import ImageService
+
+"""
+This file is the entry point of the local image-processing service.
+
+It serves the editor's filters over HTTP on localhost, backed by a pool of worker processes,
+so other tools and CI load tests can use them without the GUI.
+
+Example:
+    python service.py --port 8765 --workers 4
+    curl --data-binary @in.jpg "http://127.0.0.1:8765/process?ops=%5B%5B%22blur%22,3%5D%5D" -o out.png
+    curl http://127.0.0.1:8765/metrics
+
+"""
+
+
+if __name__ == "__main__":
+
+    """
+    This function reads the command line and serves until interrupted.
+
+    """
+
+    parser = argparse.ArgumentParser(description="Local image-processing service.")
+    parser.add_argument("--host", default="127.0.0.1", help="loopback address to listen on")
+    parser.add_argument("--port", type=int, default=8765, help="port, 0 picks a free one")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes, one per CPU by default")
+    parser.add_argument("--max-queue", type=int, default=None, help="requests that may wait before 503 replies")
+    args = parser.parse_args()
+
+    service = ImageService(args.host, args.port, args.workers, args.max_queue)
+    print(f"Serving on {service.url} with {service.workers} workers", flush=True)
+    try:
+        service.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
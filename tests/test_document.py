@@ -0,0 +1,62 @@
+import numpy as np
+from core.document import Document
+from core.image_processor import ImageProcessor
+from utils.models import ImageState, Rect, RegionPatch
+from utils.orientation import Orientation
+
+
+def _document():
+    """
+    This function builds a document whose history is [region patch, whole state].
+
+    Returns:
+        tuple: The document and the pixels of positions 0, 1 and 2.
+    """
+    first = np.zeros((8, 8, 3), np.uint8)
+    processor = ImageProcessor.from_state(first, ImageState(first, Orientation()))
+    document = Document(processor)
+    # A region edit keeps the replaced pixels as a patch
+    patch = processor.swap_region(RegionPatch(Rect(2, 2, 3, 3), np.full((3, 3, 3), 50, np.uint8)))
+    document.history.save(patch, 100)
+    second = processor.pixels.copy()
+    # A whole-image edit keeps the whole state
+    document.history.save(processor.state, 100)
+    third = np.full((8, 8, 3), 200, np.uint8)
+    processor.restore(ImageState(third, Orientation(1)))
+    return document, first, second, third
+
+
+def test_jump_across_whole_state_and_patch():
+    document, first, second, third = _document()
+
+    scale, rects = document.jump(0, 100)
+
+    assert scale == 100
+    # A whole state was restored on the way, so the full image must be drawn again
+    assert rects is None
+    assert np.array_equal(document.processor.pixels, first)
+    assert document.processor.orientation == Orientation()
+    assert len(document.history) == 0
+
+
+def test_jump_back_and_forth_matches_every_state():
+    document, first, second, third = _document()
+
+    document.jump(0, 100)
+    document.jump(2, 100)
+    assert np.array_equal(document.processor.pixels, third)
+    assert document.processor.orientation == Orientation(1)
+
+    document.jump(1, 100)
+    assert np.array_equal(document.processor.pixels, second)
+
+
+def test_jump_over_patches_only_gives_rects():
+    document, first, second, third = _document()
+    document.jump(1, 100)
+
+    scale, rects = document.jump(0, 100)
+
+    assert rects == [Rect(2, 2, 3, 3)]
+    assert np.array_equal(document.processor.pixels, first)
+    assert document.jump(0, 100) is None
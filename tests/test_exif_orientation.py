@@ -0,0 +1,87 @@
+import struct
+from utils.exif_orientation import ExifOrientation
+
+# Stands in for the compressed image data, which is never parsed
+SCAN = b"\xff\xda\x00\x08scan\xff\xd9"
+APP0 = b"\xff\xe0\x00\x10JFIF\x00\x01\x01\x00\x00\x01\x00\x01\x00\x00"
+
+
+def _exif(order: str, entries: list) -> bytes:
+    """
+    This function builds an APP1 EXIF segment whose first IFD holds the given entries.
+
+    Parameters:
+        order (str): "<" for Intel (II) or ">" for Motorola (MM) byte order.
+        entries (list): (tag, type, value) for each IFD entry.
+
+    Returns:
+        bytes: The whole segment, marker included.
+    """
+    tiff = (b"II" if order == "<" else b"MM") + struct.pack(order + "HI", 42, 8)
+    ifd = struct.pack(order + "H", len(entries))
+    for tag, kind, value in entries:
+        ifd += struct.pack(order + "HHIHH", tag, kind, 1, value, 0)
+    payload = b"Exif\x00\x00" + tiff + ifd + struct.pack(order + "I", 0)
+    return b"\xff\xe1" + struct.pack(">H", len(payload) + 2) + payload
+
+
+def _jpeg(*segments: bytes) -> bytes:
+    """
+    This function joins marker segments into a JPEG file.
+
+    Parameters:
+        segments (bytes): The segments between the start of image and the scan.
+
+    Returns:
+        bytes: The file bytes.
+    """
+    return b"\xff\xd8" + b"".join(segments) + SCAN
+
+
+def test_no_exif_adds_a_segment():
+    data = _jpeg()
+
+    assert ExifOrientation.read(data) == 1
+    rewritten = ExifOrientation.rewrite(data, 6)
+    assert rewritten[2:4] == b"\xff\xe1"
+    assert rewritten.endswith(SCAN)
+    assert ExifOrientation.read(rewritten) == 6
+
+
+def test_new_segment_goes_after_app0():
+    data = _jpeg(APP0)
+
+    rewritten = ExifOrientation.rewrite(data, 3)
+
+    # JFIF expects its APP0 segment to stay first
+    assert rewritten.startswith(b"\xff\xd8" + APP0 + b"\xff\xe1")
+    assert ExifOrientation.read(rewritten) == 3
+
+
+def test_existing_tag_in_both_byte_orders():
+    for order in "<>":
+        data = _jpeg(APP0, _exif(order, [(0x010F, 3, 7), (ExifOrientation.TAG, ExifOrientation.SHORT, 6)]))
+
+        assert ExifOrientation.read(data) == 6
+        rewritten = ExifOrientation.rewrite(data, 8)
+        # Only the value is patched, so the size and the other entry are kept
+        assert len(rewritten) == len(data)
+        assert ExifOrientation.read(rewritten) == 8
+        assert ExifOrientation.rewrite(rewritten, 6) == data
+
+
+def test_exif_without_the_tag_is_not_patched():
+    data = _jpeg(_exif("<", [(0x010F, 3, 7)]))
+
+    assert ExifOrientation.read(data) == 1
+    assert ExifOrientation.rewrite(data, 6) is None
+
+
+def test_truncated_exif_is_not_patched():
+    full = _jpeg(_exif(">", [(ExifOrientation.TAG, ExifOrientation.SHORT, 6)]))
+    # Cut inside the TIFF header, the IFD count and the entry
+    for cut in (14, 20, 24, 30):
+        data = full[:cut]
+
+        assert ExifOrientation.read(data) == 1
+        assert ExifOrientation.rewrite(data, 3) is None
@@ -0,0 +1,115 @@
+from concurrent.futures import ThreadPoolExecutor
+
+
+class BackgroundRunner:
+    """
+    This class runs slow work on a worker thread and hands the results back on the Tk thread.
+    """
+
+    POLL_MS = 15
+
+    def __init__(self, root, workers: int = 1, executor=None):
+        """
+        This function creates the worker pool and remembers the Tk root used for polling.
+
+        Parameters:
+            root: The Tk widget whose event loop receives the results.
+            workers (int): Number of worker threads.
+            executor (concurrent.futures.Executor | None): Pool to use instead,
+                e.g. a process pool for work that holds the GIL.
+        """
+        self._root = root
+        self._executor = executor or ThreadPoolExecutor(max_workers=workers)
+        self._jobs = []
+        self._polling = False
+
+    def __len__(self) -> int:
+        """
+        This function gives the number of jobs whose results were not handed back yet.
+
+        Returns:
+            int: How many jobs are still pending.
+        """
+        return len(self._jobs)
+
+    def __repr__(self) -> str:
+        """
+        This function return a readable summary of the pending jobs.
+
+        Returns:
+            str: A string showing how many jobs are pending.
+        """
+        return f"BackgroundRunner(pending={len(self._jobs)})"
+
+    def submit(self, func, *args, on_done=None, on_error=None):
+        """
+        This function starts a job on the worker pool.
+
+        Results are handed back in submission order, so a job's callback never
+        runs before the callback of a job submitted earlier.
+
+        Parameters:
+            func (callable): The work to run off the Tk thread.
+            *args: Arguments passed to func.
+            on_done (callable | None): Called on the Tk thread with the result.
+            on_error (callable | None): Called on the Tk thread with the exception.
+
+        Returns:
+            concurrent.futures.Future: The future of the job.
+        """
+        future = self._executor.submit(func, *args)
+        self._jobs.append((future, on_done, on_error))
+        self._schedule()
+        return future
+
+    def drain(self):
+        """
+        This function waits for every pending job and runs its callback right away.
+        """
+        while self._jobs:
+            self._finish(*self._jobs.pop(0))
+
+    def shutdown(self):
+        """
+        This function drops pending jobs and stops the worker pool.
+        """
+        for future, _, _ in self._jobs:
+            future.cancel()
+        self._jobs.clear()
+        self._executor.shutdown(wait=False)
+
+    def _schedule(self):
+        """
+        This function arranges the next poll if one is not already planned.
+        """
+        if not self._polling:
+            self._polling = True
+            self._root.after(self.POLL_MS, self._poll)
+
+    def _poll(self):
+        """
+        This function hands back every finished job at the head of the queue.
+        """
+        self._polling = False
+        while self._jobs and self._jobs[0][0].done():
+            self._finish(*self._jobs.pop(0))
+        if self._jobs:
+            self._schedule()
+
+    def _finish(self, future, on_done, on_error):
+        """
+        This function delivers one job's result or error to its callback.
+
+        Parameters:
+            future (concurrent.futures.Future): The finished job.
+            on_done (callable | None): Result callback.
+            on_error (callable | None): Error callback.
+        """
+        try:
+            result = future.result()
+        except Exception as e:
+            if on_error:
+                on_error(e)
+            return
+        if on_done:
+            on_done(result)
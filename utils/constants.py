@@ -1,13 +1,39 @@
+import os
 
 WINDOW_TITLE = "Python Image Editor"
 WINDOW_SIZE = "1000x600"
 
 SUPPORTED_FORMATS = [
-    ("Image files", "*.png *.jpg *.jpeg *.bmp")
+    ("Image files", "*.png *.jpg *.jpeg *.bmp *.webp"),
+    ("Raw arrays (memory-mapped)", "*.npy")
 ]
 
 DEFAULT_SAVE_NAME = "edited_image.png"
 
+# Images of at least this size are kept in memory-mapped scratch files
+SCRATCH_MIN_MB = 512
+SCRATCH_DIR = None
+
+# Shared limit for the pixels and history of all open documents
+MEMORY_BUDGET_MB = 2048
+
+# Rendered display tiles kept for panning and switching zoom levels
+DISPLAY_CACHE_MB = 256
+
+THUMBNAIL_SIZE = 128
+THUMBNAIL_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".image_editor", "thumbnails")
+
+# Longest side of the state thumbnails in the history window
+HISTORY_THUMBNAIL_SIZE = 96
+
+# Targets offered by File > Export Set, as "width format [quality]" items
+EXPORT_SET_DEFAULT = "1920 jpg 85, 1280 jpg 80, 640 webp 75"
+
+PROJECT_EXTENSION = ".imgproj"
+PROJECT_FORMATS = [
+    ("Image editor project", "*.imgproj")
+]
+
 PLACE_HOLDER_TEXT = "Please upload an image\nClick here or use File → Open"
 
 TEXT_FONT = "Segoe UI"
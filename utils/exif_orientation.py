@@ -0,0 +1,122 @@
+import struct
+from collections.abc import Iterator
+
+
+class ExifOrientation:
+    """
+    This class reads and rewrites the EXIF orientation tag of JPEG files without decoding them.
+    """
+
+    TAG = 0x0112
+    SHORT = 3
+
+    @staticmethod
+    def _segments(data: bytes) -> Iterator[tuple[int, int, int]]:
+        """
+        This function walks the marker segments in front of the JPEG image data.
+
+        Parameters:
+            data (bytes): The bytes of a JPEG file.
+
+        Returns:
+            Iterator[tuple[int, int, int]]: (marker, start, end) for each segment,
+            where start is the offset of the 0xFF byte and end the offset after it.
+        """
+        pos = 2
+        while pos + 4 <= len(data) and data[pos] == 0xFF:
+            marker = data[pos + 1]
+            if marker == 0xDA:  # start of scan, image data follows
+                return
+            length = struct.unpack(">H", data[pos + 2:pos + 4])[0]
+            yield marker, pos, pos + 2 + length
+            pos += 2 + length
+
+    @classmethod
+    def _find_tag(cls, data: bytes) -> tuple[bool, int | None, str]:
+        """
+        This function finds the offset of the orientation value inside an EXIF segment.
+
+        A truncated or damaged EXIF block counts as one without the entry.
+
+        Parameters:
+            data (bytes): The bytes of a JPEG file.
+
+        Returns:
+            tuple[bool, int | None, str]: (has_exif, offset, byte_order), offset is
+            None if there is no orientation entry in the first IFD.
+        """
+        for marker, start, end in cls._segments(data):
+            if marker != 0xE1 or data[start + 4:start + 10] != b"Exif\x00\x00":
+                continue
+            # The segment length may point past the end of a cut file
+            end = min(end, len(data))
+            tiff = start + 10
+            order = "<" if data[tiff:tiff + 2] == b"II" else ">"
+            if tiff + 8 > end:
+                return True, None, order
+            ifd = tiff + struct.unpack(order + "I", data[tiff + 4:tiff + 8])[0]
+            if ifd + 2 > end:
+                return True, None, order
+            count = struct.unpack(order + "H", data[ifd:ifd + 2])[0]
+            for i in range(count):
+                entry = ifd + 2 + i * 12
+                if entry + 12 > end:
+                    break
+                tag, kind = struct.unpack(order + "HH", data[entry:entry + 4])
+                if tag == cls.TAG and kind == cls.SHORT:
+                    return True, entry + 8, order
+            return True, None, order
+        return False, None, ">"
+
+    @classmethod
+    def read(cls, data: bytes) -> int:
+        """
+        This function reads the EXIF orientation value of a JPEG.
+
+        Parameters:
+            data (bytes): The bytes of a JPEG file.
+
+        Returns:
+            int: The orientation value from 1 to 8, 1 when there is no tag.
+        """
+        _, offset, order = cls._find_tag(data)
+        if offset is None:
+            return 1
+        value = struct.unpack(order + "H", data[offset:offset + 2])[0]
+        return value if 1 <= value <= 8 else 1
+
+    @classmethod
+    def rewrite(cls, data: bytes, value: int) -> bytes | None:
+        """
+        This function returns a copy of a JPEG with a new orientation value.
+
+        The compressed image data is copied as is, so the result is lossless.
+        If the file has no EXIF block, a minimal one is added.
+
+        Parameters:
+            data (bytes): The bytes of a JPEG file.
+            value (int): The new orientation value from 1 to 8.
+
+        Returns:
+            bytes | None: The new file bytes, or None if the existing EXIF block
+            has no orientation entry that can be patched in place.
+        """
+        if data[:2] != b"\xff\xd8":
+            return None
+        has_exif, offset, order = cls._find_tag(data)
+        if offset is not None:
+            return data[:offset] + struct.pack(order + "H", value) + data[offset + 2:]
+        if has_exif:
+            return None
+
+        # Keep a JFIF APP0 segment first, as the JFIF format expects
+        insert = 2
+        for marker, start, end in cls._segments(data):
+            if marker == 0xE0:
+                insert = end
+            break
+        tiff = b"MM\x00\x2a\x00\x00\x00\x08"
+        ifd = struct.pack(">HHHIHHI", 1, cls.TAG, cls.SHORT, 1, value, 0, 0)
+        payload = b"Exif\x00\x00" + tiff + ifd
+        segment = b"\xff\xe1" + struct.pack(">H", len(payload) + 2) + payload
+        return data[:insert] + segment + data[insert:]
@@ -13,7 +13,7 @@ class ImageDisplay:
         This function converts an OpenCV image into a Tkinter compatible PhotoImage.
 
         Parameters:
-            image: An OpenCV image represented as a NumPy array (BGR format).
+            image: An OpenCV image represented as a NumPy array (BGR or single-channel gray).
 
         Returns:
             A Tkinter PhotoImage object if an image is provided,
@@ -22,6 +22,10 @@ class ImageDisplay:
         if image is None:
             return None
 
+        # Gray images go to PIL as "L" directly, no expansion to three channels
+        if image.ndim == 2 or image.shape[2] == 1:
+            return ImageTk.PhotoImage(Image.fromarray(image.reshape(image.shape[:2])))
+
         # Convert from OpenCV BGR format to RGB
         rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
 
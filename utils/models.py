@@ -1,5 +1,5 @@
 from __future__ import annotations
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 
 
 @dataclass(frozen=True)
@@ -44,3 +44,183 @@ class Size:
         """
         yield self.w
         yield self.h
+
+
+@dataclass(frozen=True)
+class ImageState:
+    """
+    This class represents one editor state: stored pixels plus their pending orientation.
+    """
+    pixels: object
+    orientation: object
+
+    def copy(self) -> "ImageState":
+        """
+        This function returns a state that can be kept in the history.
+
+        Edits always produce new arrays instead of writing into the old ones,
+        so the copy shares the pixels and costs nothing.
+        """
+        return ImageState(self.pixels, self.orientation)
+
+
+@dataclass(frozen=True)
+class EncoderOptions:
+    """
+    This class holds the encoder settings used when saving an image.
+    """
+    png_compression: int = 1
+    jpeg_quality: int = 95
+    jpeg_progressive: bool = False
+    webp_quality: int = 90
+
+    def __post_init__(self):
+        """
+        This class validate the encoder settings after object creation.
+        """
+        if not 0 <= self.png_compression <= 9:
+            raise ValueError("PNG compression must be between 0 and 9.")
+        if not 1 <= self.jpeg_quality <= 100 or not 1 <= self.webp_quality <= 100:
+            raise ValueError("Quality must be between 1 and 100.")
+
+
+@dataclass(frozen=True)
+class ExportTarget:
+    """
+    This class describes one file of an export set: a width, a format and an optional quality.
+    """
+    width: int
+    ext: str
+    quality: int | None = None
+
+    FORMATS = (".png", ".jpg", ".jpeg", ".webp", ".bmp")
+
+    def __post_init__(self):
+        """
+        This class validate the target after object creation.
+        """
+        if not isinstance(self.width, int) or self.width <= 0:
+            raise ValueError("Export width must be a positive integer.")
+        if self.ext not in self.FORMATS:
+            raise ValueError(f"Unsupported export format: {self.ext}")
+        if self.quality is not None and not 1 <= self.quality <= 100:
+            raise ValueError("Quality must be between 1 and 100.")
+
+    def path(self, base: str) -> str:
+        """
+        This function gives the file of this target next to a base path, e.g. photo_800w.jpg.
+        """
+        return f"{base}_{self.width}w{self.ext}"
+
+    def encoder_options(self, options: EncoderOptions) -> EncoderOptions:
+        """
+        This function gives the encoder settings for this target, with its quality if it has one.
+        """
+        if self.quality is None:
+            return options
+        return replace(options, jpeg_quality=self.quality, webp_quality=self.quality)
+
+
+@dataclass(frozen=True)
+class ProcessingStats:
+    """
+    This class reports how many frames were processed and how fast.
+    """
+    frames: int
+    seconds: float
+
+    @property
+    def fps(self) -> float:
+        """
+        This function gives the throughput in frames per second.
+        """
+        return self.frames / self.seconds if self.seconds > 0 else 0.0
+
+
+@dataclass(frozen=True)
+class ImageStats:
+    """
+    This class summarises the tones of an image.
+    """
+    mean: tuple
+    std: tuple
+    shadows: float
+    highlights: float
+
+
+@dataclass(frozen=True)
+class FileResult:
+    """
+    This class reports what happened to one file of a batch.
+    """
+    source: str
+    target: str | None = None
+    error: Exception | None = None
+
+    @property
+    def ok(self) -> bool:
+        """
+        This function tells if the file was processed and written.
+        """
+        return self.error is None
+
+
+@dataclass(frozen=True)
+class Rect:
+    """
+    This class represents an axis-aligned rectangle in pixel coordinates.
+    """
+    x: int
+    y: int
+    w: int
+    h: int
+
+    @classmethod
+    def from_corners(cls, x0: float, y0: float, x1: float, y1: float) -> "Rect":
+        """
+        This function creates a rectangle from two opposite corners in any order.
+        """
+        left, right = sorted((int(round(x0)), int(round(x1))))
+        top, bottom = sorted((int(round(y0)), int(round(y1))))
+        return cls(left, top, right - left, bottom - top)
+
+    @property
+    def slices(self) -> tuple[slice, slice]:
+        """
+        This function gives the (rows, columns) slices that cut the rectangle out of an array.
+        """
+        return slice(self.y, self.y + self.h), slice(self.x, self.x + self.w)
+
+    def expanded(self, margin: int) -> "Rect":
+        """
+        This function grows the rectangle by a margin on every side.
+        """
+        return Rect(self.x - margin, self.y - margin, self.w + 2 * margin, self.h + 2 * margin)
+
+    def clipped(self, w: int, h: int) -> "Rect | None":
+        """
+        This function cuts the rectangle to an image of the given size.
+
+        Returns:
+            The clipped rectangle, or None if nothing is left.
+        """
+        x0, y0 = max(0, self.x), max(0, self.y)
+        x1, y1 = min(w, self.x + self.w), min(h, self.y + self.h)
+        if x1 <= x0 or y1 <= y0:
+            return None
+        return Rect(x0, y0, x1 - x0, y1 - y0)
+
+
+@dataclass(frozen=True)
+class RegionPatch:
+    """
+    This class is a history entry that holds only the pixels of an edited rectangle.
+    """
+    rect: Rect
+    pixels: object
+
+    def copy(self) -> "RegionPatch":
+        """
+        This function returns the patch itself, since it is never changed.
+        """
+        return self
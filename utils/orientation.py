@@ -0,0 +1,202 @@
+from __future__ import annotations
+from dataclasses import dataclass
+import cv2
+
+
+@dataclass(frozen=True)
+class Orientation:
+    """
+    This class represents one of the 8 rotate/flip states of an image.
+
+    The image is first mirrored horizontally (if mirrored is True) and then
+    turned clockwise by turns quarter turns.
+    """
+    turns: int = 0
+    mirrored: bool = False
+
+    def __post_init__(self):
+        """
+        This function validate the number of quarter turns.
+        """
+        if self.turns not in (0, 1, 2, 3):
+            raise ValueError("Orientation turns must be 0, 1, 2 or 3.")
+
+    @property
+    def is_identity(self) -> bool:
+        """
+        This function checks if the orientation leaves the image unchanged.
+
+        Returns:
+            bool: True when there is nothing to apply.
+        """
+        return self.turns == 0 and not self.mirrored
+
+    @property
+    def swaps_axes(self) -> bool:
+        """
+        This function checks if width and height are exchanged.
+
+        Returns:
+            bool: True for 90 and 270 degree states.
+        """
+        return self.turns % 2 == 1
+
+    def rotated(self, angle: int) -> "Orientation":
+        """
+        This function adds a clockwise rotation.
+
+        Parameters:
+            angle: 90, 180 or 270.
+
+        Returns:
+            A new Orientation.
+        """
+        return Orientation((self.turns + angle // 90) % 4, self.mirrored)
+
+    def flipped(self, mode: str) -> "Orientation":
+        """
+        This function adds a horizontal or vertical flip.
+
+        A flip after a rotation equals the mirrored image turned the other way,
+        and a vertical flip is a horizontal flip followed by a half turn.
+
+        Parameters:
+            mode: "horizontal" or "vertical".
+
+        Returns:
+            A new Orientation.
+        """
+        half_turns = 0 if mode == "horizontal" else 2
+        return Orientation((half_turns - self.turns) % 4, not self.mirrored)
+
+    def then(self, other: "Orientation") -> "Orientation":
+        """
+        This function combines this orientation with another one applied after it.
+
+        Parameters:
+            other: The orientation applied second.
+
+        Returns:
+            A new Orientation.
+        """
+        result = self.flipped("horizontal") if other.mirrored else self
+        return result.rotated(other.turns * 90) if other.turns else result
+
+    def inverse(self) -> "Orientation":
+        """
+        This function gives the orientation that undoes this one.
+
+        Mirrored states undo themselves; plain turns are undone by turning back.
+
+        Returns:
+            A new Orientation.
+        """
+        if self.mirrored:
+            return self
+        return Orientation((-self.turns) % 4, False)
+
+    def source_rect(self, rect, w: int, h: int):
+        """
+        This function maps a rectangle on the oriented image back to the stored pixels.
+
+        Parameters:
+            rect: Rect in oriented image coordinates.
+            w: Width of the stored pixels.
+            h: Height of the stored pixels.
+
+        Returns:
+            The matching Rect in stored pixel coordinates.
+        """
+        cw, ch = self.shape(w, h)
+        points = [(rect.x, rect.y), (rect.x + rect.w, rect.y + rect.h)]
+        for _ in range(self.turns):
+            # Undo one clockwise quarter turn
+            points = [(y, cw - x) for x, y in points]
+            cw, ch = ch, cw
+        if self.mirrored:
+            points = [(cw - x, y) for x, y in points]
+        (x0, y0), (x1, y1) = points
+        return type(rect).from_corners(x0, y0, x1, y1)
+
+    def to_exif(self) -> int:
+        """
+        This function gives the matching EXIF orientation value.
+
+        Returns:
+            A value from 1 to 8.
+        """
+        return _EXIF_VALUES[(self.turns, self.mirrored)]
+
+    @classmethod
+    def from_exif(cls, value: int) -> "Orientation":
+        """
+        This function creates an orientation from an EXIF orientation value.
+
+        Parameters:
+            value: A value from 1 to 8; anything else means no change.
+
+        Returns:
+            A new Orientation.
+        """
+        for (turns, mirrored), exif in _EXIF_VALUES.items():
+            if exif == value:
+                return cls(turns, mirrored)
+        return cls()
+
+    def shape(self, w: int, h: int) -> tuple[int, int]:
+        """
+        This function gives the width and height after the orientation is applied.
+
+        Parameters:
+            w: Width of the stored pixels.
+            h: Height of the stored pixels.
+
+        Returns:
+            The oriented (width, height).
+        """
+        return (h, w) if self.swaps_axes else (w, h)
+
+    def apply(self, image, dst=None):
+        """
+        This function moves the pixels of an image into this orientation.
+
+        Every state is done with at most two OpenCV calls.
+
+        Parameters:
+            image: An OpenCV image as a NumPy array.
+            dst: Optional array of the oriented shape to write into.
+
+        Returns:
+            The oriented image (the same object for the identity).
+        """
+        if not self.mirrored:
+            if self.turns == 0:
+                return image
+            return cv2.rotate(image, _ROTATE_CODES[self.turns], dst=dst)
+        if self.turns == 0:
+            return cv2.flip(image, 1, dst=dst)
+        if self.turns == 2:
+            return cv2.flip(image, 0, dst=dst)
+        out = cv2.transpose(image, dst=dst)
+        if self.turns == 3:
+            return out
+        return cv2.flip(out, -1, dst=out)
+
+
+_ROTATE_CODES = {
+    1: cv2.ROTATE_90_CLOCKWISE,
+    2: cv2.ROTATE_180,
+    3: cv2.ROTATE_90_COUNTERCLOCKWISE,
+}
+
+# EXIF orientation values describe how to turn the stored pixels for display
+_EXIF_VALUES = {
+    (0, False): 1,
+    (0, True): 2,
+    (2, False): 3,
+    (2, True): 4,
+    (3, True): 5,
+    (1, False): 6,
+    (1, True): 7,
+    (3, False): 8,
+}
@@ -0,0 +1,92 @@
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+
+class StartupTimer:
+    """
+    This class records how long each phase of application startup takes.
+
+    Phases may be recorded from the background import thread as well as the
+    Tk thread. When disabled every call does nothing.
+    """
+
+    def __init__(self, enabled: bool = False):
+        """
+        This function starts the clock.
+
+        Parameters:
+            enabled (bool): Record and report phases; False makes the timer a no-op.
+        """
+        self.enabled = enabled
+        self.start = time.perf_counter()
+        self._phases = []
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        """
+        This function return a readable summary of the timer.
+
+        Returns:
+            str: A string showing how many phases were recorded.
+        """
+        return f"StartupTimer(enabled={self.enabled}, phases={len(self._phases)})"
+
+    def mark(self, name: str):
+        """
+        This function records a point in time, measured from the start.
+
+        Parameters:
+            name (str): What has just happened.
+        """
+        if self.enabled:
+            self._record(name, None, time.perf_counter())
+
+    @contextmanager
+    def phase(self, name: str):
+        """
+        This function records how long the code inside the with block takes.
+
+        Parameters:
+            name (str): Name of the phase.
+        """
+        if not self.enabled:
+            yield
+            return
+        begin = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._record(name, begin, time.perf_counter())
+
+    def _record(self, name: str, begin: float | None, end: float):
+        """
+        This function keeps one measurement.
+
+        Parameters:
+            name (str): Name of the mark or phase.
+            begin (float | None): Start of a phase, None for a mark.
+            end (float): When it ended.
+        """
+        thread = "main" if threading.current_thread() is threading.main_thread() else "background"
+        with self._lock:
+            self._phases.append((name, begin, end, thread))
+
+    def report(self, stream=None):
+        """
+        This function prints every mark and phase in the order they ended.
+
+        Parameters:
+            stream (file | None): Where to write, stderr if None.
+        """
+        if not self.enabled:
+            return
+        stream = stream or sys.stderr
+        with self._lock:
+            phases = sorted(self._phases, key=lambda p: p[2])
+        print("Startup timing (ms since start):", file=stream)
+        for name, begin, end, thread in phases:
+            at = (end - self.start) * 1000
+            took = f"{(end - begin) * 1000:8.1f} ms" if begin is not None else " " * 11
+            print(f"  {at:8.1f}  {took}  [{thread:>10}]  {name}", file=stream)